@@ -0,0 +1,87 @@
+"""
+Time the Hegarty-Craver et al. (2018) artifact identification of
+`SQA.Cardio.identify_artifacts()` from a thousand to a million beats.
+
+The time per beat should stay flat as the number of beats grows. The
+original list-based screen is timed up to `--loop-beats` beats for
+comparison, and its artifacts are checked against the vectorized ones.
+
+Usage
+-----
+    PYTHONPATH=. python benchmarks/bench_hegarty.py [--fs 250]
+        [--loop-beats 100000]
+"""
+import argparse
+import time
+import numpy as np
+from heartview.SQA import Cardio
+
+N_BEATS = (1_000, 10_000, 100_000, 1_000_000)
+
+
+def hegarty_loop(beats_ix, fs, prev_n = 6):
+    """The list-based screen of the Hegarty-Craver et al. (2018) method in
+    HeartView 2.0.1, returning the artifactual beats."""
+    ibis = (np.diff(beats_ix) / fs) * 1000
+    beats = beats_ix[1:]
+    artifact_beats = []
+    valid_beats = [beats_ix[0]]
+    successive_diff = np.abs(np.diff(ibis))
+    min_diff_ix = np.convolve(
+        successive_diff, np.ones(6) / 6, mode = 'valid').argmin()
+    first_ibi = ibis[min_diff_ix:min_diff_ix + 6].mean()
+    for n in range(len(ibis)):
+        if n < prev_n:
+            if n == 0:
+                ibi_estimate = first_ibi
+            else:
+                ibi_estimate = np.median(np.insert(ibis[:n], 0, first_ibi))
+        else:
+            ibi_estimate = np.median(ibis[n - prev_n:n])
+        if (26 / 32) * ibi_estimate <= ibis[n] <= (44 / 32) * ibi_estimate:
+            valid_beats.append(beats[n])
+        else:
+            artifact_beats.append(beats[n])
+    return np.array(artifact_beats)
+
+
+def simulate(fs, n_beats, seed = 0):
+    """Simulate beat indices with 5% missed and 5% extra beats."""
+    rng = np.random.default_rng(seed)
+    ibis = rng.normal(0.8, 0.05, n_beats) * fs
+    ibis[rng.choice(n_beats, n_beats // 20, replace = False)] *= 2
+    ibis[rng.choice(n_beats, n_beats // 20, replace = False)] *= 0.4
+    return np.unique(np.cumsum(np.round(ibis).astype(np.int64)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.split('\n')[1])
+    parser.add_argument('--fs', type = int, default = 250)
+    parser.add_argument('--loop-beats', type = int, default = 100_000)
+    args = parser.parse_args()
+
+    sqa = Cardio(args.fs)
+    header = f'{"beats":>11}{"vectorized s":>15}{"us/beat":>10}' \
+             f'{"loop s":>10}{"speedup":>10}{"match":>8}'
+    print(header)
+    print('-' * len(header))
+    for n_beats in N_BEATS:
+        beats = simulate(args.fs, n_beats)
+        start = time.perf_counter()
+        artifacts = sqa.identify_artifacts(beats, 'hegarty')
+        vectorized = time.perf_counter() - start
+        row = f'{len(beats):>11,}{vectorized:>15.3f}' \
+              f'{vectorized / len(beats) * 1e6:>10.2f}'
+        if n_beats <= args.loop_beats:
+            start = time.perf_counter()
+            expected = hegarty_loop(beats, args.fs)
+            loop = time.perf_counter() - start
+            match = np.array_equal(artifacts, expected)
+            row += f'{loop:>10.2f}{loop / vectorized:>9.0f}x{match!s:>8}'
+        else:
+            row += f'{"-":>10}{"-":>10}{"-":>8}'
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
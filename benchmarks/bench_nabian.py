@@ -0,0 +1,79 @@
+"""
+Time the vectorized Nabian et al. (2018) R peak detector against the
+per-sample loop it replaced, on ECG signals from one minute to 24 hours.
+
+The loop is only timed up to `--loop-minutes` of signal, since it is slow
+on long recordings; its beats are also checked against those of the
+vectorized detector.
+
+Usage
+-----
+    PYTHONPATH=. python benchmarks/bench_nabian.py [--fs 250]
+        [--loop-minutes 60]
+"""
+import argparse
+import time
+import numpy as np
+from heartview.ECG import BeatDetectors
+
+DURATIONS = (1, 10, 60, 6 * 60, 24 * 60)
+
+
+def nabian_loop(signal, fs):
+    """The per-sample loop of `BeatDetectors.nabian()` in HeartView 2.0.1."""
+    window_size = int(0.4 * fs)
+    peaks = np.zeros(len(signal))
+    for i in range(1 + window_size, len(signal) - window_size):
+        ecg_window = signal[i - window_size: i + window_size]
+        rpeak = np.argmax(ecg_window)
+        if i == (i - window_size - 1 + rpeak):
+            peaks[i] = 1
+    ecg_beats = np.where(peaks == 1)[0]
+    _, unique_ix = np.unique(ecg_beats, return_index = True)
+    return ecg_beats[sorted(unique_ix)]
+
+
+def simulate(fs, minutes, seed = 0):
+    """Simulate an ECG signal by tiling one minute of Gaussian QRS-T
+    complexes with irregular beat intervals and white noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(60 * fs) / fs
+    beat_times = np.cumsum(rng.uniform(0.6, 1.1, size = 100))
+    beat_times = beat_times[beat_times < 59]
+    minute = 0.05 * rng.standard_normal(len(t))
+    for bt in beat_times:
+        minute += np.exp(-((t - bt) / 0.012) ** 2) \
+            + 0.25 * np.exp(-((t - bt - 0.25) / 0.05) ** 2)
+    return np.tile(minute, int(np.ceil(minutes)))[:int(fs * 60 * minutes)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.split('\n')[1])
+    parser.add_argument('--fs', type = int, default = 250)
+    parser.add_argument('--loop-minutes', type = float, default = 60)
+    args = parser.parse_args()
+
+    detector = BeatDetectors(args.fs)
+    header = f'{"duration":>10}{"samples":>13}{"vectorized s":>15}' \
+             f'{"loop s":>10}{"speedup":>10}{"match":>8}'
+    print(header)
+    print('-' * len(header))
+    for minutes in DURATIONS:
+        signal = simulate(args.fs, minutes)
+        start = time.perf_counter()
+        beats = detector.nabian(signal)
+        vectorized = time.perf_counter() - start
+        row = f'{minutes:>8g} m{len(signal):>13,}{vectorized:>15.3f}'
+        if minutes <= args.loop_minutes:
+            start = time.perf_counter()
+            expected = nabian_loop(signal, args.fs)
+            loop = time.perf_counter() - start
+            match = np.array_equal(beats, expected)
+            row += f'{loop:>10.2f}{loop / vectorized:>9.0f}x{match!s:>8}'
+        else:
+            row += f'{"-":>10}{"-":>10}{"-":>8}'
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
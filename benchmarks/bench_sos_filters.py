@@ -0,0 +1,106 @@
+"""
+Compare the transfer-function `(b, a)` and second-order-sections (SOS)
+forms of the IIR filters used by HeartView.
+
+For each sampling rate, every filter is designed in both forms, applied
+to the same simulated signal (ten minutes long by default) with
+`filtfilt()` and `sosfiltfilt()`, and timed. The maximum deviation of
+the `(b, a)` output from the SOS output is reported relative to the peak
+SOS output, or as 'non-finite' where the `(b, a)` form is numerically
+unstable.
+
+Usage
+-----
+    python benchmarks/bench_sos_filters.py [--minutes 10] [--repeats 5]
+"""
+import argparse
+import timeit
+import numpy as np
+from scipy.signal import butter, cheby1, cheby2, ellip, filtfilt, iirnotch, \
+    sosfiltfilt, tf2sos
+
+SAMPLING_RATES = (250, 500, 1024, 2000)
+
+# (name, design type, cutoffs in Hz, order, btype, design keyword arguments)
+FILTERS = [
+    ('ECG baseline_wander', 'butter', 0.05, 2, 'high', {}),
+    ('ECG muscle_noise', 'butter', (30, 100), 2, 'bandstop', {}),
+    ('ECG powerline_interference', 'notch', 60, None, None, {'q': 30}),
+    ('ECG filter_signal', 'ellip', (1, 15), 2, 'band',
+     {'rp': 0.15, 'rs': 80}),
+    ('ECG _bandpass_filter', 'butter', (0.5, 15), 2, 'band', {}),
+    ('ECG _elliptic_bandpass_filter', 'ellip', (0.5, 50), 2, 'band',
+     {'rp': 0.5, 'rs': 40}),
+    ('ECG _cheby1_filter', 'cheby1', (6, 18), 4, 'bandpass', {'rp': 1}),
+    ('PPG baseline_wander', 'butter', 0.5, 2, 'high', {}),
+    ('PPG filter_signal', 'cheby2', (0.5, 10), 4, 'bandpass', {'rs': 20}),
+    ('PPG _bandpass_filter', 'butter', (0.5, 8), 2, 'band', {}),
+]
+
+
+def design(fs, ftype, cutoffs, order, btype, kwargs, output):
+    """Design a filter as `(b, a)` coefficients or second-order sections."""
+    wn = np.atleast_1d(cutoffs) / (0.5 * fs)
+    wn = wn[0] if len(wn) == 1 else wn
+    if ftype == 'notch':
+        ba = iirnotch(wn, kwargs['q'])
+        return ba if output == 'ba' else tf2sos(*ba)
+    if ftype == 'butter':
+        return butter(order, wn, btype = btype, output = output)
+    if ftype == 'cheby1':
+        return cheby1(order, kwargs['rp'], wn, btype = btype,
+                      output = output)
+    if ftype == 'cheby2':
+        return cheby2(order, kwargs['rs'], wn, btype = btype,
+                      output = output)
+    return ellip(order, kwargs['rp'], kwargs['rs'], wn, btype = btype,
+                 output = output)
+
+
+def simulate(fs, minutes, seed = 0):
+    """Simulate a signal with a cardiac rhythm, baseline wander, powerline
+    interference, and white noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(fs * 60 * minutes)) / fs
+    return np.sin(2 * np.pi * 1.2 * t) ** 15 \
+        + 0.3 * np.sin(2 * np.pi * 0.1 * t) \
+        + 0.1 * np.sin(2 * np.pi * 60 * t) \
+        + 0.05 * rng.standard_normal(len(t))
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.split('\n')[1])
+    parser.add_argument('--minutes', type = float, default = 10)
+    parser.add_argument('--repeats', type = int, default = 5)
+    args = parser.parse_args()
+
+    header = f'{"filter":<31}{"fs":>6}{"(b, a) ms":>11}{"SOS ms":>9}' \
+             f'{"max rel. dev.":>15}'
+    print(header)
+    print('-' * len(header))
+    for fs in SAMPLING_RATES:
+        signal = simulate(fs, args.minutes)
+        for name, ftype, cutoffs, order, btype, kwargs in FILTERS:
+            b, a = design(fs, ftype, cutoffs, order, btype, kwargs, 'ba')
+            sos = design(fs, ftype, cutoffs, order, btype, kwargs, 'sos')
+            ba_out = filtfilt(b, a, signal)
+            sos_out = sosfiltfilt(sos, signal)
+            if np.all(np.isfinite(ba_out)):
+                deviation = np.max(np.abs(ba_out - sos_out)) \
+                    / np.max(np.abs(sos_out))
+                deviation = f'{deviation:.2e}'
+            else:
+                deviation = 'non-finite'
+            ba_time = min(timeit.repeat(
+                lambda: filtfilt(b, a, signal), number = 1,
+                repeat = args.repeats)) * 1000
+            sos_time = min(timeit.repeat(
+                lambda: sosfiltfilt(sos, signal), number = 1,
+                repeat = args.repeats)) * 1000
+            print(f'{name:<31}{fs:>6}{ba_time:>11.1f}{sos_time:>9.1f}'
+                  f'{deviation:>15}')
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+from typing import Dict, List, Literal, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from tqdm import tqdm
+import os
+from .ECG import Filters as ECGFilters
+from .ECG import BeatDetectors as ECGBeatDetectors
+from .PPG import Filters as PPGFilters
+from .PPG import BeatDetectors as PPGBeatDetectors
+from .SQA import Cardio
+import pandas as pd
+import numpy as np
+
+# ========================= Batch Recording Pipeline =========================
+def process_recordings(
+    recordings: List[dict],
+    seg_size: int = 60,
+    min_hr: Union[int, float] = 40,
+    ecg_detector: Literal['manikandan', 'engzee', 'nabian',
+                          'pantompkins'] = 'manikandan',
+    ppg_detector: Literal['erma', 'adaptive_threshold'] = 'erma',
+    artifact_method: Literal['hegarty', 'cbd', 'both'] = 'cbd',
+    snr_method: Literal['banded', 'residual', 'both', 'all'] = 'both',
+    powerline_freq: Literal[50, 60] = 60,
+    n_jobs: Optional[int] = None,
+    show_progress: bool = True
+) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """
+    Run the full pre-processing and signal quality assessment pipeline on
+    multiple ECG or PPG recordings in parallel worker processes.
+
+    Each recording is filtered, its beats are detected, artifactual beats
+    are identified, and its SQA metrics and signal-to-noise ratios are
+    computed per segment.
+
+    Parameters
+    ----------
+    recordings : list of dict
+        The recordings to process. Each dictionary must contain the keys
+        'id' (a unique name), 'signal' (an array-like raw signal), 'fs'
+        (the sampling rate), and 'signal_type' ('ECG' or 'PPG'), and may
+        contain 'timestamps' (an array-like of per-sample timestamps).
+    seg_size : int, optional
+        The segment size in seconds; by default, 60.
+    min_hr : int, float, optional
+        The minimum acceptable heart rate against which the number of
+        beats in the last partial segment will be compared; by default, 40.
+    ecg_detector : str, optional
+        The name of the `ECG.BeatDetectors` method used for ECG recordings;
+        by default, 'manikandan'.
+    ppg_detector : str, optional
+        The name of the `PPG.BeatDetectors` method used for PPG recordings;
+        by default, 'erma'.
+    artifact_method : {'hegarty', 'cbd', 'both'}, optional
+        The artifact identification method; by default, 'cbd'.
+    snr_method : {'banded', 'residual', 'both', 'all'}, optional
+        The method used to compute signal-to-noise ratios, as in
+        `SQA.Cardio.compute_snr()`; by default, 'both'.
+    powerline_freq : {50, 60}, optional
+        The powerline interference frequency; by default, 60.
+    n_jobs : int, optional
+        The number of worker processes; by default, None, which uses all
+        available CPU cores, as does -1. If 1, recordings are processed
+        sequentially in the current process.
+    show_progress : bool, optional
+        Whether to display a progress bar while the function runs; by
+        default, True.
+
+    Returns
+    -------
+    metrics : pandas.DataFrame
+        A DataFrame with the SQA metrics and SNR of each segment of all
+        successfully processed recordings, identified by a 'Recording'
+        column.
+    errors : dict
+        A dictionary mapping the IDs of recordings that failed to process
+        to their error messages.
+
+    Notes
+    -----
+    Errors raised while processing one recording do not interrupt the
+    others, nor do failures of the worker processes themselves (e.g., a
+    worker killed for running out of memory), which are reported in
+    `errors` for every recording they affect. On platforms that start
+    worker processes by spawning (e.g., Windows and macOS), this function
+    must be called under an `if __name__ == '__main__':` guard.
+
+    Examples
+    --------
+    >>> from heartview import process_recordings
+    >>> recordings = [
+    ...     {'id': 'P01', 'signal': ecg['ECG'], 'fs': 1024,
+    ...      'signal_type': 'ECG', 'timestamps': ecg['Timestamp']},
+    ...     {'id': 'P02', 'signal': ppg['BVP'], 'fs': 64,
+    ...      'signal_type': 'PPG'}]
+    >>> metrics, errors = process_recordings(recordings, n_jobs = 4)
+    """
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs is not None and n_jobs < 1:
+        raise ValueError('The `n_jobs` parameter must be a positive '
+                         'integer or -1.')
+    ids = [recording.get('id', n) for n, recording in enumerate(recordings)]
+    if len(set(ids)) != len(ids):
+        raise ValueError('Each recording must have a unique \'id\'.')
+    options = {
+        'seg_size': seg_size,
+        'min_hr': min_hr,
+        'ecg_detector': ecg_detector,
+        'ppg_detector': ppg_detector,
+        'artifact_method': artifact_method,
+        'snr_method': snr_method,
+        'powerline_freq': powerline_freq
+    }
+
+    if n_jobs == 1:
+        results = [_process_recording(recording, options)
+                   for recording in tqdm(recordings,
+                                         disable = not show_progress)]
+    else:
+        with ProcessPoolExecutor(max_workers = n_jobs) as executor:
+            futures = [executor.submit(_process_recording, recording, options)
+                       for recording in recordings]
+            results = []
+            for future in tqdm(futures, disable = not show_progress):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # The worker process died (e.g., BrokenProcessPool) or
+                    # the recording or its result could not be transferred
+                    results.append((None, f'{type(e).__name__}: {e}'))
+
+    all_metrics = []
+    errors = {}
+    for rec_id, (metrics, error) in zip(ids, results):
+        if error is not None:
+            errors[rec_id] = error
+        else:
+            metrics.insert(0, 'Recording', rec_id)
+            all_metrics.append(metrics)
+    if all_metrics:
+        metrics = pd.concat(all_metrics, ignore_index = True)
+    else:
+        metrics = pd.DataFrame(columns = ['Recording', 'Segment'])
+    return metrics, errors
+
+def _process_recording(
+    recording: dict,
+    options: dict
+) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """Run the pipeline on one recording in a worker process, returning
+    its SQA metrics or the error message if processing failed."""
+    try:
+        signal = np.asarray(recording['signal'], dtype = float)
+        fs = int(recording['fs'])
+        signal_type = recording['signal_type']
+        seg_size = options['seg_size']
+
+        # Filter the signal and detect beats
+        if signal_type == 'ECG':
+            filtered = ECGFilters(fs, options['powerline_freq']).filter_signal(
+                signal)
+            detector = getattr(ECGBeatDetectors(fs), options['ecg_detector'])
+        elif signal_type == 'PPG':
+            filtered = PPGFilters(fs).filter_signal(signal)
+            detector = getattr(PPGBeatDetectors(fs), options['ppg_detector'])
+        else:
+            raise ValueError('The \'signal_type\' of a recording must be '
+                             '\'ECG\' or \'PPG\'.')
+        beats_ix = detector(filtered)
+
+        # Assess signal quality
+        sqa = Cardio(fs)
+        artifacts_ix = sqa.identify_artifacts(
+            beats_ix, method = options['artifact_method'])
+        data = pd.DataFrame({'Signal': filtered})
+        ts_col = None
+        if recording.get('timestamps') is not None:
+            data['Timestamp'] = np.asarray(recording['timestamps'])
+            ts_col = 'Timestamp'
+        metrics = sqa.compute_metrics(
+            data, beats_ix, artifacts_ix, ts_col = ts_col,
+            seg_size = seg_size, min_hr = options['min_hr'],
+            show_progress = False)
+        snr = sqa.compute_snr(
+            signal, filtered, seg_size = seg_size,
+            powerline_freq = options['powerline_freq'],
+            signal_type = signal_type, method = options['snr_method'])
+        metrics = metrics.merge(snr, on = 'Segment', how = 'left')
+        return metrics, None
+    except Exception as e:
+        return None, f'{type(e).__name__}: {e}'
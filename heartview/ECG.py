@@ -1,9 +1,16 @@
-from typing import Literal, Union
-from scipy.signal import butter, cheby1, ellip, filtfilt, find_peaks, \
-    hilbert, iirnotch, lfilter, sosfiltfilt
-from scipy.ndimage import uniform_filter1d
-import pandas as pd
+from typing import Iterable, Iterator, Literal, Optional, Union
+from collections import deque
+from functools import partial
+from scipy.signal import find_peaks, hilbert, lfilter, sosfilt, sosfilt_zi, \
+    sosfiltfilt
+from ._filtering import design_sos, filter_channels, sosfiltfilt_stream
+from scipy.ndimage import maximum_filter1d, uniform_filter1d
+from numpy.lib.stride_tricks import sliding_window_view
 import numpy as np
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # ============================== ECG Filters =================================
 class Filters:
@@ -48,7 +55,9 @@ class Filters:
         self, 
         signal: Union[np.ndarray, list], 
         cutoff: float = 0.05, 
-        order: float = 2
+        order: float = 2,
+        axis: int = -1,
+        n_jobs: Optional[int] = None
     ) -> np.ndarray:
         """
         Apply a high-pass filter to remove baseline wander from ECG data.
@@ -63,19 +72,25 @@ class Filters:
         order : int, optional
             The filter order, i.e., the number of samples required to
             produce the desired filtered output; by default, 2.
+        axis : int, optional
+            The axis of `signal` along which to filter, e.g., -1 for
+            multi-channel data with shape `(n_channels, n_samples)`; by
+            default, -1.
+        n_jobs : int, optional
+            The number of threads across which blocks of channels are
+            filtered; by default, None, which filters the blocks
+            sequentially. If -1, all available CPU cores are used. Each
+            block holds at most 2 ** 20 samples unless a single channel is
+            longer (see `max_elements` in `_filtering.filter_channels()`).
 
         Returns
         -------
         filtered : array_like
             An array containing the filtered signal data.
         """
-        nyquist = 0.5 * self.fs
-        highcut = cutoff / nyquist
-        b, a = butter(order,
-                      highcut,
-                      btype = 'high',
-                      analog = False)
-        filtered = filtfilt(b, a, signal)
+        sos = design_sos(self.fs, 'butter', cutoff, order, btype = 'high')
+        filtered = filter_channels(
+            partial(sosfiltfilt, sos), signal, axis, n_jobs)
         return filtered
 
     def muscle_noise(
@@ -83,7 +98,9 @@ class Filters:
         signal: Union[np.ndarray, list], 
         lowcut: float = 30, 
         highcut: float = 100, 
-        order: int = 2
+        order: int = 2,
+        axis: int = -1,
+        n_jobs: Optional[int] = None
     ) -> np.ndarray:
         """
         Apply a bandstop filter to remove muscle (EMG) noise from ECG data.
@@ -101,6 +118,16 @@ class Filters:
         order : int, optional
             The filter order, i.e., the number of samples required to
             produce the desired filtered output; by default, 2.
+        axis : int, optional
+            The axis of `signal` along which to filter, e.g., -1 for
+            multi-channel data with shape `(n_channels, n_samples)`; by
+            default, -1.
+        n_jobs : int, optional
+            The number of threads across which blocks of channels are
+            filtered; by default, None, which filters the blocks
+            sequentially. If -1, all available CPU cores are used. Each
+            block holds at most 2 ** 20 samples unless a single channel is
+            longer (see `max_elements` in `_filtering.filter_channels()`).
 
         Returns
         -------
@@ -111,20 +138,18 @@ class Filters:
             raise ValueError('Invalid cutoff frequencies: `lowcut` must be > 0 ' 
                              'and < `highcut`, and `highcut` must be < Nyquist '
                              'frequency.')
-        nyquist = 0.5 * self.fs
-        low = lowcut / nyquist
-        high = highcut / nyquist
-        sos = butter(order, [low, high],
-                     btype = 'bandstop',
-                     analog = False,
-                     output = 'sos')
-        filtered = sosfiltfilt(sos, signal)
+        sos = design_sos(self.fs, 'butter', (lowcut, highcut), order,
+                         btype = 'bandstop')
+        filtered = filter_channels(
+            partial(sosfiltfilt, sos), signal, axis, n_jobs)
         return filtered
 
     def powerline_interference(
         self, 
         signal: Union[np.ndarray, list], 
-        q: float = 30
+        q: float = 30,
+        axis: int = -1,
+        n_jobs: Optional[int] = None
     ) -> np.ndarray:
         """
         Filter out powerline interference at a specified frequency.
@@ -137,15 +162,25 @@ class Filters:
             The quality factor, i.e., how narrow or wide the stopband is
             for a notch filter (by default, 30). A higher quality factor
             indicates a narrower bandpass.
+        axis : int, optional
+            The axis of `signal` along which to filter, e.g., -1 for
+            multi-channel data with shape `(n_channels, n_samples)`; by
+            default, -1.
+        n_jobs : int, optional
+            The number of threads across which blocks of channels are
+            filtered; by default, None, which filters the blocks
+            sequentially. If -1, all available CPU cores are used. Each
+            block holds at most 2 ** 20 samples unless a single channel is
+            longer (see `max_elements` in `_filtering.filter_channels()`).
 
         Returns
         -------
         filtered : array_like
             An array containing the filtered signal data.
         """
-        w0 = 2 * np.pi * self.pl_freq / self.fs
-        b, a = iirnotch(w0, q)
-        filtered = filtfilt(b, a, signal)
+        sos = design_sos(self.fs, 'notch', self.pl_freq, q = q)
+        filtered = filter_channels(
+            partial(sosfiltfilt, sos), signal, axis, n_jobs)
         return filtered
 
     def filter_signal(
@@ -155,7 +190,9 @@ class Filters:
         highcut: float = 15, 
         rs: float = 0.15,
         rp: float = 80, 
-        order: int = 2
+        order: int = 2,
+        axis: int = -1,
+        n_jobs: Optional[int] = None
     ) -> np.ndarray:
         """
         Filter out artifact from ECG data due to powerline interference,
@@ -178,6 +215,16 @@ class Filters:
             The maximum passband ripple in dB; by default, 80.0 dB.
         order : int, optional
             The order of the filter, controlling its sharpness; by default, 2.
+        axis : int, optional
+            The axis of `signal` along which to filter, e.g., -1 for
+            multi-channel data with shape `(n_channels, n_samples)`; by
+            default, -1.
+        n_jobs : int, optional
+            The number of threads across which blocks of channels are
+            filtered; by default, None, which filters the blocks
+            sequentially. If -1, all available CPU cores are used. Each
+            block holds at most 2 ** 20 samples unless a single channel is
+            longer (see `max_elements` in `_filtering.filter_channels()`).
 
         Returns
         -------
@@ -193,13 +240,78 @@ class Filters:
             raise ValueError('Invalid cutoff frequencies: `lowcut` must be > 0 ' 
                              'and < `highcut`, and `highcut` must be < Nyquist '
                              'frequency.')
-        nyq = 0.5 * self.fs
-        low = lowcut / nyq
-        high = highcut / nyq
-        b, a = ellip(order, rs, rp, [low, high], btype = 'band')
-        filtered = filtfilt(b, a, signal)
+        # `rs` and `rp` are passed positionally to `ellip()` in this order
+        sos = design_sos(self.fs, 'ellip', (lowcut, highcut), order,
+                         btype = 'band', rp = rs, rs = rp)
+        filtered = filter_channels(
+            partial(sosfiltfilt, sos), signal, axis, n_jobs)
         return filtered
 
+    def filter_stream(
+        self, 
+        chunks: Iterable[Union[np.ndarray, list]], 
+        lowcut: float = 1, 
+        highcut: float = 15, 
+        rs: float = 0.15,
+        rp: float = 80, 
+        order: int = 2,
+        overlap: Optional[float] = None
+    ) -> Iterator[np.ndarray]:
+        """
+        Filter a stream of ECG data chunks with the elliptic bandpass filter
+        of `filter_signal()`, using constant memory.
+
+        Parameters
+        ----------
+        chunks : iterable of array-like
+            An iterable yielding consecutive chunks of the ECG data, e.g.,
+            columns of CSV chunks or slices of a memory-mapped array.
+        lowcut : float, optional
+            The lower cutoff frequency of the bandpass filter; by default, 
+            1.0 Hz.
+        highcut : float, optional
+            The upper cutoff frequency of the bandpass filter; by default, 
+            15.0 Hz.
+        rs : float, optional
+            The minimum stopband attenuation in dB; by default, 0.15 dB.
+        rp : float, optional
+            The maximum passband ripple in dB; by default, 80.0 dB.
+        order : int, optional
+            The order of the filter, controlling its sharpness; by default, 2.
+        overlap : float, optional
+            The look-ahead duration, in seconds, used to settle the backward
+            filter pass between chunks; by default, the decay time of the
+            filter's impulse response.
+
+        Yields
+        ------
+        np.ndarray
+            Consecutive chunks of the filtered ECG signal. The chunk sizes
+            may differ from those of the input.
+
+        Raises
+        ------
+        ValueError
+            If `lowcut` or `highcut` is outside the valid range.
+
+        Notes
+        -----
+        The filter state is carried across chunks and the zero-phase
+        backward pass is computed by overlap-and-discard, so the
+        concatenated output matches `filter_signal()` within numerical
+        tolerance.
+        """
+        if lowcut <= 0 or highcut >= self.fs / 2 or lowcut >= highcut:
+            raise ValueError('Invalid cutoff frequencies: `lowcut` must be > 0 ' 
+                             'and < `highcut`, and `highcut` must be < Nyquist '
+                             'frequency.')
+        # `rs` and `rp` are passed positionally to `ellip()` in this order
+        sos = design_sos(self.fs, 'ellip', (lowcut, highcut), order,
+                         btype = 'band', rp = rs, rs = rp)
+        if overlap is not None:
+            overlap = int(overlap * self.fs)
+        return sosfiltfilt_stream(sos, chunks, overlap)
+
 # ======================= ECG Beat Detection Methods =========================
 class BeatDetectors:
     """
@@ -258,6 +370,11 @@ class BeatDetectors:
         ecg_beats : array-like
             An array containing the indices of detected R peaks.
 
+        Notes
+        -----
+        The threshold and detection state machine is compiled with Numba
+        when it is installed; otherwise, it runs in pure Python.
+
         References
         ----------
         Engelse, W. A. H., & Zeelenberg, C. (1979). A single scan algorithm
@@ -273,14 +390,14 @@ class BeatDetectors:
 
         if not self.preprocessed:
             # Pre-process data using built-in filters
-            signal = Filters.filter_signal(signal, self.fs)
+            signal = Filters(self.fs).filter_signal(signal)
         else:
             pass
+        signal = np.asarray(signal, dtype = float)
 
         # Differentiate the input signal
         diff = np.zeros(len(signal))
-        for i in range(4, len(diff)):
-            diff[i] = signal[i] - signal[i - 4]
+        diff[4:] = signal[4:] - signal[:-4]
 
         # Apply low-pass filter to the differentiated signal
         ci = [1, 4, 6, 4, 1]               # coefficients
@@ -290,106 +407,27 @@ class BeatDetectors:
         low_pass[: int(0.2 * self.fs)] = 0
 
         # Define threshold parameters
+        ms10 = int(0.01 * self.fs)
         ms200 = int(0.2 * self.fs)
         ms1200 = int(1.2 * self.fs)
         ms160 = int(0.16 * self.fs)
         neg_threshold = int(0.01 * self.fs)
-
-        # Initialize variables for threshold calculation
-        M = 0
-        M_list = []
-        neg_m = []
-        MM = []
         M_slope = np.linspace(1.0, 0.6, ms1200 - ms200)
 
-        # Initialize lists for detected QRS complexes and R-peaks
-        QRS = []
-        ecg_beats = []
-
-        # Initialize variables for peak detection
-        counter = 0  # counter for tracking negative peaks
-        thi_list = []  # list of indices where threshold is initially crossed
-        thi = False  # if threshold is initially crossed
-        thf_list = []  # list of indices where threshold is finally crossed
-        thf = False  # if threshold is finallay crossed
-        newM5 = False  # if new M5 value is calculated
-
-        # Compensate for potential delay in peak detection
-        engzee_fake_delay = 0
-
-        # Loop through the low-pass filtered signal for peak detection
-        for i in range(len(low_pass)):
-
-            # Calculate threshold 'M' based on current QRS complex
-            if i < 5 * self.fs:
-                M = 0.6 * np.max(low_pass[: i + 1])
-                MM.append(M)
-                if len(MM) > 5:
-                    MM.pop(0)
-            elif QRS and i < QRS[-1] + ms200:
-                newM5 = 0.6 * np.max(low_pass[QRS[-1]: i])
-                if newM5 > 1.5 * MM[-1]:
-                    newM5 = 1.1 * MM[-1]
-            elif newM5 and QRS and i == QRS[-1] + ms200:
-                MM.append(newM5)
-                if len(MM) > 5:
-                    MM.pop(0)
-                M = np.mean(MM)
-            elif QRS and i > QRS[-1] + ms200 and i < QRS[-1] + ms1200:
-                M = np.mean(MM) * M_slope[i - (QRS[-1] + ms200)]
-            elif QRS and i > QRS[-1] + ms1200:
-                M = 0.6 * np.mean(MM)
-            M_list.append(M)
-            neg_m.append(-M)
-
-            # Detect QRS complexes
-            if not QRS and low_pass[i] > M:
-                QRS.append(i)
-                thi_list.append(i)
-                thi = True
-            elif QRS and i > QRS[-1] + ms200 and low_pass[i] > M:
-                QRS.append(i)
-                thi_list.append(i)
-                thi = True
-
-            # Check for negative threshold crossing within defined window
-            if thi and i < thi_list[-1] + ms160:
-                if low_pass[i] < -M and low_pass[i - 1] > -M:
-                    thf = True
-                if thf and low_pass[i] < -M:
-                    thf_list.append(i)
-                    counter += 1
-                elif low_pass[i] > -M and thf:
-                    counter = 0
-                    thi = False
-                    thf = False
-            elif thi and i > thi_list[-1] + ms160:
-                counter = 0
-                thi = False
-                thf = False
-
-            # Check if the number of negative threshold crossings exceeds
-            # the threshold
-            if counter > neg_threshold:
-
-                # Extract the unfiltered section around the detected peak
-                unfiltered_section = signal[
-                                     thi_list[-1] - int(0.01 * self.fs): i]
-
-                # Detect R-peaks and append to the list
-                ecg_beats.append(
-                    engzee_fake_delay + np.argmax(unfiltered_section) +
-                    thi_list[-1] - int(0.01 * self.fs))
-                counter = 0
-                thi = False
-                thf = False
+        # Run the threshold and detection state machine, compiled with
+        # Numba if it is available
+        if _engzee_core_jit is not None:
+            ecg_beats = _engzee_core_jit(
+                low_pass, signal, 5 * self.fs, ms10, ms160, ms200, ms1200,
+                neg_threshold, M_slope)
+        else:
+            ecg_beats = _engzee_core(
+                low_pass.tolist(), signal.tolist(), 5 * self.fs, ms10, ms160,
+                ms200, ms1200, neg_threshold, M_slope.tolist())
 
         # Remove the first detection as it requires QRS complex amplitude
         # for the threshold
-        ecg_beats.pop(0)
-
-        # Convert list of beats to numpy array and return
-        ecg_beats = np.array(ecg_beats, dtype = 'int')
+        ecg_beats = np.array(ecg_beats[1:], dtype = 'int')
 
         ecg_beats = self.__remove_dupes(ecg_beats)
         return ecg_beats
@@ -437,24 +475,27 @@ class BeatDetectors:
             
             window_len = int(fs * window)
             window_step = int(fs * step)
-            signal_beats = pd.DataFrame({'signal': signal})
-            signal_beats.loc[beats_ix, 'beat'] = 1
-            
-            for n in range(0, len(signal_beats), window_step):
-                w = signal_beats[n:(n + window_len)]
-                if not w.beat.sum() >= 2:
-                    pass
-                else:
-                    s = w['signal']
-                    beats = w[w.beat == 1].index.values
-                    if len(beats) == 2:
-                        thresh = (s[beats].min() + s[beats].max()) * 0.5
-                    if len(beats) > 2:
-                        thresh = (s[beats].median() + s[beats].max()) * 0.5
-                    reject = s[beats][s[beats] < thresh].index
-                    signal_beats.loc[reject, 'beat'] = np.nan
-            passing_beats = signal_beats[signal_beats.beat == 1].index.values
-            return np.array(passing_beats, dtype = np.int64)
+            beats = np.unique(np.asarray(beats_ix, dtype = np.int64))
+            amplitudes = np.asarray(signal)[beats]
+            passing = np.ones(len(beats), dtype = bool)
+
+            # Get the bounds of the beats in each sliding window and visit
+            # only the windows that contain at least two beats
+            starts = np.arange(0, len(signal), window_step)
+            lows = np.searchsorted(beats, starts)
+            highs = np.searchsorted(beats, starts + window_len)
+            visit = (highs - lows) >= 2
+            for lo, hi in zip(lows[visit], highs[visit]):
+                w_passing = passing[lo:hi]
+                if w_passing.sum() >= 2:
+                    w_amplitudes = amplitudes[lo:hi]
+                    s = w_amplitudes[w_passing]
+                    if len(s) == 2:
+                        thresh = (s.min() + s.max()) * 0.5
+                    else:
+                        thresh = (np.median(s) + s.max()) * 0.5
+                    w_passing &= ~(w_amplitudes < thresh)
+            return beats[passing]
 
         if not self.preprocessed:
             signal = self._cheby1_filter(signal)
@@ -500,26 +541,12 @@ class BeatDetectors:
         zn_ma_s = zn - zn_ma
 
         # Look for zero-crossings: https://stackoverflow.com/a/28766902/6205282
-        idx = np.argwhere(np.diff(np.sign(zn_ma_s)) > 0).flatten().tolist()
+        idx = np.argwhere(np.diff(np.sign(zn_ma_s)) > 0).flatten()
 
-        # Prepare a container for windows
-        idx_search = []
-        ecg_beats = np.empty(0, dtype = int)
+        # Search for the R peak in a window around each zero-crossing
         search_window_half = round(self.fs * .12)
-        for n in idx:
-            lows = np.arange(n - search_window_half, n)
-            highs = np.arange(n + 1, (n + search_window_half + 1))
-            if highs[-1] >= len(signal):
-                highs = np.delete(
-                    highs, np.arange(
-                        np.where(highs == len(signal))[0], len(highs)))
-            ecg_window = np.concatenate((lows, [n], highs))
-            idx_search.append(ecg_window)
-            ecg_window_wave = signal[ecg_window]
-            peak_loc = ecg_window[
-                np.where(ecg_window_wave == np.max(ecg_window_wave))[0]]
-            if peak_loc.item() > 0:
-                ecg_beats = np.append(ecg_beats, peak_loc)
+        peak_loc = self._localize_peaks(signal, idx, search_window_half)
+        ecg_beats = peak_loc[peak_loc > 0]
 
         ecg_beats = self.__remove_dupes(ecg_beats)
         
@@ -558,14 +585,22 @@ class BeatDetectors:
         else:
             pass
 
+        signal = np.asarray(signal, dtype = float)
         window_size = int(0.4 * self.fs)
-        peaks = np.zeros(len(signal))
-        for i in range(1 + window_size, len(signal) - window_size):
-            ecg_window = signal[i - window_size: i + window_size]
-            rpeak = np.argmax(ecg_window)
-            if i == (i - window_size - 1 + rpeak):
-                peaks[i] = 1
-        ecg_beats = np.where(peaks == 1)[0]
+        n = len(signal)
+        start, stop = 1 + window_size, n - window_size
+        if window_size < 2 or stop <= start:
+            return np.empty(0, dtype = np.int64)
+
+        # A beat is marked at sample i when the sample following it is the
+        # first maximum of the window `signal[i - window_size: i + window_size]`
+        window_max = maximum_filter1d(signal, 2 * window_size)[start:stop]
+        lead = (window_size + 1) // 2 - window_size
+        lead_max = maximum_filter1d(signal, window_size + 1)[
+            (start + lead):(stop + lead)]
+        candidate = signal[(start + 1):(stop + 1)]
+        is_peak = (candidate == window_max) & (candidate > lead_max)
+        ecg_beats = start + np.flatnonzero(is_peak)
         ecg_beats = self.__remove_dupes(ecg_beats)
         return ecg_beats
 
@@ -696,6 +731,25 @@ class BeatDetectors:
                 padded_signal, np.ones(window_len) / window_len, mode = 'valid')
         return ma
 
+    def _localize_peaks(
+        self,
+        signal: np.ndarray,
+        idx: np.ndarray,
+        half_window: int
+    ) -> np.ndarray:
+        """Locate the maximum of `signal` in a window of `half_window`
+        samples on each side of every index in `idx`, using a strided view of
+        all windows over a padded signal. As in the original per-beat search,
+        windows wrap around the start and are clipped at the end of the
+        signal, so that peaks found before the start have negative indices."""
+        idx = np.asarray(idx, dtype = np.int64)
+        padded = np.concatenate((
+            signal[len(signal) - half_window:],
+            np.asarray(signal, dtype = float),
+            np.full(half_window, -np.inf)))
+        windows = sliding_window_view(padded, 2 * half_window + 1)[idx]
+        return idx - half_window + np.argmax(windows, axis = 1)
+
     def _butter_bandpass_filter(
         self, 
         signal: Union[np.ndarray, list], 
@@ -717,11 +771,9 @@ class BeatDetectors:
                 # Based on https://github.com/berndporr/py-ecg-detectors/
                 lowcut = 8
                 highcut = 16
-        nyquist = 0.5 * self.fs
-        low = lowcut / nyquist
-        high = highcut / nyquist
-        b, a = butter(N = 2, Wn = [low, high], btype = 'band')
-        preprocessed = filtfilt(b, a, signal)
+        sos = design_sos(self.fs, 'butter', (lowcut, highcut), 2,
+                         btype = 'band')
+        preprocessed = sosfiltfilt(sos, signal)
         return preprocessed
 
     def _elliptic_bandpass_filter(
@@ -733,13 +785,11 @@ class BeatDetectors:
         including the lower and upper cutoff frequencies (`Wn`), passband
         ripple (`rp`), stopband attenuation (`rs`), and order (`N`) of the
         filter, are provided as default values according to the algorithm."""
-        nyq = 0.5 * self.fs
         lowcut = 0.5
         highcut = 50
-        low = lowcut / nyq
-        high = highcut / nyq
-        b, a = ellip(N = 2, rs = 0.5, rp = 40, Wn = [low, high], btype = 'band')
-        preprocessed = filtfilt(b, a, signal)
+        sos = design_sos(self.fs, 'ellip', (lowcut, highcut), 2,
+                         btype = 'band', rp = 0.5, rs = 40)
+        preprocessed = sosfiltfilt(sos, signal)
         return preprocessed
 
     def _cheby1_filter(
@@ -751,13 +801,11 @@ class BeatDetectors:
         All parameters, including the lower and upper cutoff frequencies
         (`Wn`), passband ripple (`rp`), and order (`N`), of the filter are
         provided as default values according to the algorithm."""
-        nyquist = 0.5 * self.fs
         lowcut = 6
         highcut = 18
-        low = lowcut / nyquist
-        high = highcut / nyquist
-        b, a = cheby1(N = 4, rp = 1, Wn = [low, high], btype = 'bandpass')
-        preprocessed = filtfilt(b, a, signal)
+        sos = design_sos(self.fs, 'cheby1', (lowcut, highcut), 4,
+                         btype = 'bandpass', rp = 1)
+        preprocessed = sosfiltfilt(sos, signal)
         return preprocessed
 
     def __remove_dupes(
@@ -768,4 +816,367 @@ class BeatDetectors:
         ecg_beats = np.array(ecg_beats)
         unique_values, unique_ix = np.unique(ecg_beats, return_index = True)
         dupe_removed = ecg_beats[sorted(unique_ix)]
-        return dupe_removed
\ No newline at end of file
+        return dupe_removed
+
+# ======================= Online ECG Beat Detection ==========================
+class OnlinePanTompkins:
+    """
+    A real-time implementation of the Pan & Tompkins (1985) QRS detection
+    algorithm that accepts consecutive blocks of ECG samples and emits the
+    indices of detected beats as soon as they are confirmed.
+
+    Parameters/Attributes
+    ---------------------
+    fs : int
+        The sampling rate of the ECG signal.
+    preprocessed : bool, optional
+        Whether the ECG signal is preprocessed or not; by default, True.
+
+    Notes
+    -----
+    The differentiator, the 150 ms moving-window integrator, the running
+    signal and noise peak estimates (SPKI and NPKI), the last ten beats
+    used for the RR-interval average, and the noise peaks available to the
+    search-back are all carried between calls to `push()`. Noise peaks
+    that the search-back can no longer pick (those followed, at least the
+    minimum missed IBI distance later, by a higher noise peak) are
+    dropped, so that the state stays small while no beats are detected.
+
+    Each beat is emitted once two samples past its index have been pushed,
+    since the differentiator and the peak test each need one sample of
+    look-ahead. A beat recovered by the search-back is emitted together
+    with the beat whose late arrival (more than 1.66 times the average of
+    the previous eight RR intervals) triggered the search.
+
+    For preprocessed signals, the concatenated output of `push()` matches
+    `BeatDetectors.pantompkins()` on the whole signal. For raw signals,
+    the bandpass filter of the algorithm is applied causally, as in the
+    original real-time design, rather than with the zero-phase filter of
+    `BeatDetectors.pantompkins()`, so the detected beats lag by the group
+    delay of the filter.
+
+    Examples
+    --------
+    >>> from heartview import OnlinePanTompkins
+    >>> detector = OnlinePanTompkins(fs = 500)
+    >>> for block in ecg_stream:
+    ...     new_beats = detector.push(block)
+
+    References
+    ----------
+    Pan, S. J., & Tompkins, W. J. (1985). A real-time QRS detection
+    algorithm. IEEE Transactions on Biomedical Engineering, 32(3), 230-236.
+    """
+
+    __slots__ = ('fs', 'preprocessed', 'window_size', 'blank_len',
+                 'min_peak_dist', 'min_missed_dist', 'spki', 'npki',
+                 'last_peak', '_sos', '_zi', '_n', '_last_sample',
+                 '_squared_tail', '_mwa_tail', '_recent_beats',
+                 '_noise_peaks', '_noise_values', '_n_settled')
+
+    def __init__(
+        self,
+        fs: int,
+        preprocessed: bool = True
+    ) -> None:
+        """
+        Initialize the OnlinePanTompkins object.
+
+        Parameters
+        ----------
+        fs : int
+            The sampling rate of the ECG signal.
+        preprocessed : bool, optional
+            Whether the ECG signal is preprocessed or not; by default, True.
+        """
+        if not isinstance(preprocessed, bool):
+            raise ValueError(
+                'The `preprocessed` attribute must be True or False.')
+        self.fs = fs
+        self.preprocessed = preprocessed
+        self.window_size = int(0.15 * fs)
+        self.blank_len = int(0.2 * fs)
+        self.min_peak_dist = int(0.3 * fs)
+        self.min_missed_dist = int(0.25 * fs)
+
+        # Running estimates of the signal and noise peaks
+        self.spki = 0.0
+        self.npki = 0.0
+        self.last_peak = 0
+
+        self._sos = None if preprocessed else design_sos(
+            fs, 'butter', (0.5, 15), 2, btype = 'band')
+        self._zi = None                     # bandpass filter state
+        self._n = 0                         # number of differentiated samples
+        self._last_sample = None            # last sample, for differencing
+        self._squared_tail = np.empty(0)    # last squared differences
+        self._mwa_tail = np.empty(0)        # last two integrated samples
+        self._recent_beats = deque(maxlen = 10)
+        self._noise_peaks = []              # noise peaks since the last beat
+        self._noise_values = []
+        self._n_settled = 0                 # number of settled noise peaks
+
+    def push(
+        self,
+        samples: Union[np.ndarray, list]
+    ) -> np.ndarray:
+        """
+        Add a block of ECG samples and get the beats confirmed by it.
+
+        Parameters
+        ----------
+        samples : array-like
+            An array containing the next consecutive samples of the ECG
+            signal.
+
+        Returns
+        -------
+        ecg_beats : array-like
+            An array containing the indices of newly detected beats,
+            counted from the first sample pushed.
+        """
+        x = np.asarray(samples, dtype = float).ravel()
+        if x.size == 0:
+            return np.empty(0, dtype = np.int64)
+        if self._sos is not None:
+            if self._zi is None:
+                self._zi = sosfilt_zi(self._sos) * x[0]
+            x, self._zi = sosfilt(self._sos, x, zi = self._zi)
+
+        # Compute and square the differentiated signal
+        if self._last_sample is None:
+            diff = np.diff(x)
+        else:
+            diff = np.diff(x, prepend = self._last_sample)
+        self._last_sample = x[-1]
+        squared = diff * diff
+
+        # Integrate the signal over a trailing window of 150 ms in size
+        w = self.window_size
+        buffer = np.concatenate((self._squared_tail, squared))
+        cumsum = np.concatenate(([0.0], np.cumsum(buffer)))
+        ends = np.arange(len(self._squared_tail) + 1, len(buffer) + 1)
+        mwa = (cumsum[ends] - cumsum[np.maximum(ends - w, 0)]) / w
+        mwa[(self._n + np.arange(len(squared))) < self.blank_len] = 0
+        self._squared_tail = buffer[max(len(buffer) - w + 1, 0):]
+
+        # Find strict local maxima, keeping the last two integrated samples
+        # to test peaks at the block boundary
+        mwa = np.concatenate((self._mwa_tail, mwa))
+        offset = self._n - len(self._mwa_tail)
+        peaks = np.flatnonzero(
+            (mwa[1:-1] > mwa[:-2]) & (mwa[1:-1] > mwa[2:])) + 1
+        self._mwa_tail = mwa[-2:]
+        self._n += len(squared)
+
+        ecg_beats = []
+        for peak, peak_value in zip(peaks + offset, mwa[peaks]):
+            ecg_beats.extend(self._classify_peak(int(peak), peak_value))
+        return np.array(ecg_beats, dtype = np.int64)
+
+    def _classify_peak(
+        self,
+        peak: int,
+        peak_value: float
+    ) -> list:
+        """Classify a peak of the integrated signal as a beat or as noise,
+        update the thresholds, and return any beats detected."""
+
+        # Update the first threshold value
+        threshold_I1 = self.npki + 0.25 * (self.spki - self.npki)
+        if peak_value <= threshold_I1 or \
+                peak <= self.last_peak + self.min_peak_dist:
+            self.npki = 0.125 * peak_value + 0.875 * self.npki
+            self._add_noise_peak(peak, peak_value)
+            return []
+
+        ecg_beats = [peak]
+        recent_beats = self._recent_beats
+        recent_beats.append(peak)
+
+        # "Missed" IBI threshold is based on the previous eight IBIs
+        if len(recent_beats) > 9:
+            IBI_avg = (recent_beats[-2] - recent_beats[-10]) // 8
+            IBI_missed = int(1.66 * IBI_avg)
+            if (peak - self.last_peak) > IBI_missed:
+                missed_peaks = np.array(self._noise_peaks, dtype = np.int64)
+                missed_values = np.array(self._noise_values, dtype = float)
+
+                # Check the missed IBIs against the minimum missed IBI
+                # distance and the peak amplitudes against the second
+                # threshold
+                threshold_I2 = 0.5 * threshold_I1
+                min_dist = self.min_missed_dist
+                valid = (missed_peaks > self.last_peak + min_dist) & \
+                    (missed_peaks < peak - min_dist) & \
+                    (missed_values > threshold_I2)
+                if valid.any():
+                    missed_peak = int(missed_peaks[valid][
+                        np.argmax(missed_values[valid])])
+                    recent_beats[-1] = missed_peak
+                    recent_beats.append(peak)
+                    ecg_beats = [missed_peak, peak]
+
+        self.last_peak = peak
+        self._noise_peaks = []
+        self._noise_values = []
+        self._n_settled = 0
+        self.spki = 0.125 * peak_value + 0.875 * self.spki
+        return ecg_beats
+
+    def _add_noise_peak(
+        self,
+        peak: int,
+        peak_value: float
+    ) -> None:
+        """Add a noise peak for the search-back, dropping earlier noise
+        peaks that the search-back can no longer pick."""
+        noise_peaks = self._noise_peaks
+        noise_values = self._noise_values
+
+        # Any beat found from now on lies after this peak, so the noise
+        # peaks at least `min_missed_dist` before it are settled: they lie
+        # far enough before the next beat to be valid candidates. A noise
+        # peak followed by a settled peak with a higher value is never
+        # picked, since the later peak is valid whenever it is
+        settled = self._n_settled
+        while settled < len(noise_peaks) and \
+                noise_peaks[settled] <= peak - self.min_missed_dist:
+            keep = settled
+            while keep > 0 and noise_values[keep - 1] < noise_values[settled]:
+                keep -= 1
+            del noise_peaks[keep:settled]
+            del noise_values[keep:settled]
+            settled = keep + 1
+        self._n_settled = settled
+        noise_peaks.append(peak)
+        noise_values.append(peak_value)
+
+# ========================= Beat Detection Engines ===========================
+def _engzee_core(
+    low_pass: Union[np.ndarray, list],
+    signal: Union[np.ndarray, list],
+    warmup: int,
+    ms10: int,
+    ms160: int,
+    ms200: int,
+    ms1200: int,
+    neg_threshold: int,
+    M_slope: Union[np.ndarray, list]
+) -> np.ndarray:
+    """The threshold and detection state machine of the Engelse and
+    Zeelenberg (1979) algorithm, as modified by Lourenço et al. (2011).
+    This function runs in pure Python on lists or is compiled by Numba for
+    arrays, and returns all detected R peaks, including the first one."""
+    n = len(low_pass)
+    ecg_beats = np.empty(n // max(ms200, 1) + 2, dtype = np.int64)
+    n_beats = 0
+
+    # Keep the last five threshold values in a small FIFO
+    MM = np.zeros(5)
+    n_MM = 0
+
+    M = 0.0
+    newM5 = 0.0             # 0 until a new M5 value is calculated
+    warmup_max = -np.inf    # running maximum over the warm-up period
+    qrs = -1                # index of the last QRS complex
+    qrs_max = -np.inf       # running maximum since the last QRS complex
+    qrs_scan = 0            # next index to include in `qrs_max`
+    counter = 0             # counter for tracking negative peaks
+    thi = False             # if threshold is initially crossed
+    thi_last = 0            # index where threshold was last initially crossed
+    thf = False             # if threshold is finally crossed
+
+    for i in range(n):
+
+        # Calculate threshold 'M' based on current QRS complex
+        if i < warmup:
+            if low_pass[i] > warmup_max:
+                warmup_max = low_pass[i]
+            M = 0.6 * warmup_max
+            if n_MM == 5:
+                for k in range(4):
+                    MM[k] = MM[k + 1]
+                n_MM = 4
+            MM[n_MM] = M
+            n_MM += 1
+        elif qrs >= 0 and i < qrs + ms200:
+            while qrs_scan < i:
+                if low_pass[qrs_scan] > qrs_max:
+                    qrs_max = low_pass[qrs_scan]
+                qrs_scan += 1
+            newM5 = 0.6 * qrs_max
+            if newM5 > 1.5 * MM[n_MM - 1]:
+                newM5 = 1.1 * MM[n_MM - 1]
+        elif newM5 != 0 and qrs >= 0 and i == qrs + ms200:
+            if n_MM == 5:
+                for k in range(4):
+                    MM[k] = MM[k + 1]
+                n_MM = 4
+            MM[n_MM] = newM5
+            n_MM += 1
+            M = _fifo_mean(MM, n_MM)
+        elif qrs >= 0 and i > qrs + ms200 and i < qrs + ms1200:
+            M = _fifo_mean(MM, n_MM) * M_slope[i - (qrs + ms200)]
+        elif qrs >= 0 and i > qrs + ms1200:
+            M = 0.6 * _fifo_mean(MM, n_MM)
+
+        # Detect QRS complexes
+        if low_pass[i] > M and (qrs < 0 or i > qrs + ms200):
+            qrs = i
+            qrs_max = -np.inf
+            qrs_scan = i
+            thi_last = i
+            thi = True
+
+        # Check for negative threshold crossing within defined window
+        if thi and i < thi_last + ms160:
+            prev = low_pass[i - 1] if i > 0 else low_pass[n - 1]
+            if low_pass[i] < -M and prev > -M:
+                thf = True
+            if thf and low_pass[i] < -M:
+                counter += 1
+            elif low_pass[i] > -M and thf:
+                counter = 0
+                thi = False
+                thf = False
+        elif thi and i > thi_last + ms160:
+            counter = 0
+            thi = False
+            thf = False
+
+        # Check if the number of negative threshold crossings exceeds
+        # the threshold
+        if counter > neg_threshold:
+
+            # Locate the R peak in the unfiltered section around the
+            # detected QRS complex
+            start = thi_last - ms10
+            peak = start
+            for k in range(start + 1, i):
+                if signal[k] > signal[peak]:
+                    peak = k
+            ecg_beats[n_beats] = peak
+            n_beats += 1
+            counter = 0
+            thi = False
+            thf = False
+
+    return ecg_beats[:n_beats]
+
+def _fifo_mean(
+    values: np.ndarray,
+    n: int
+) -> float:
+    """Compute the mean of the first `n` values of a FIFO array, summing
+    them in order."""
+    total = 0.0
+    for k in range(n):
+        total += values[k]
+    return total / n
+
+if njit is not None:
+    _fifo_mean = njit(cache = True)(_fifo_mean)
+    _engzee_core_jit = njit(cache = True)(_engzee_core)
+else:
+    _engzee_core_jit = None
@@ -1,6 +1,10 @@
-from typing import Union
-from scipy.signal import butter, cheby2, filtfilt, find_peaks
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Union
+from functools import partial
+from scipy.signal import find_peaks, peak_prominences, sosfilt, sosfilt_zi, \
+    sosfiltfilt
 from scipy.ndimage import uniform_filter1d
+from ._filtering import design_sos, filter_channels, moving_average, \
+    moving_average_stream, sosfiltfilt_stream
 import numpy as np
 
 # ============================== PPG Filters =================================
@@ -31,7 +35,9 @@ class Filters:
         self, 
         signal: Union[np.ndarray, list], 
         cutoff: float = 0.5, 
-        order: int = 2
+        order: int = 2,
+        axis: int = -1,
+        n_jobs: Optional[int] = None
     ) -> np.ndarray:
         """
         Apply a high-pass filter to remove baseline wander from PPG data.
@@ -46,17 +52,27 @@ class Filters:
         order : int, optional
             The filter order, i.e., the number of samples required to
             produce the desired filtered output; by default, 2.
+        axis : int, optional
+            The axis of `signal` along which to filter, e.g., -1 for
+            multi-channel data with shape `(n_channels, n_samples)`; by
+            default, -1.
+        n_jobs : int, optional
+            The number of threads across which blocks of channels are
+            filtered; by default, None, which filters the blocks
+            sequentially. If -1, all available CPU cores are used. Each
+            block holds at most 2 ** 20 samples unless a single channel is
+            longer (see `max_elements` in `_filtering.filter_channels()`).
         """
-        nyquist = 0.5 * self.fs
-        highcut = cutoff / nyquist
-        b, a = butter(order, highcut, btype = 'high', analog = False)
-        filtered = filtfilt(b, a, signal)
+        sos = design_sos(self.fs, 'butter', cutoff, order, btype = 'high')
+        filtered = filter_channels(
+            partial(sosfiltfilt, sos), signal, axis, n_jobs)
         return filtered
 
     def moving_average(
         self, 
         signal: Union[np.ndarray, list], 
-        window_len: int
+        window_len: int,
+        axis: int = -1
     ) -> np.ndarray:
         """
         Smooth a PPG signal using a moving average filter.
@@ -67,14 +83,17 @@ class Filters:
             An array containing the input PPG signal to be filtered.
         window_len : int
             The size of the moving average window, in seconds.
+        axis : int, optional
+            The axis of `signal` along which to filter, e.g., -1 for
+            multi-channel data with shape `(n_channels, n_samples)`; by
+            default, -1.
 
         Returns
         -------
         filtered : Union[np.ndarray, list]
             An array containing the filtered PPG signal.
         """
-        kernel = np.ones(window_len) / window_len
-        filtered = np.convolve(signal, kernel, mode = 'same')
+        filtered = moving_average(signal, window_len, axis)
         return filtered
 
     def filter_signal(
@@ -83,7 +102,9 @@ class Filters:
         lowcut: float = 0.5, 
         highcut: float = 10, 
         order: int = 4, 
-        window_len: int = 0.5
+        window_len: int = 0.5,
+        axis: int = -1,
+        n_jobs: Optional[int] = None
     ) -> np.ndarray:
         """
         Filter out baseline drift, motion artifact, and powerline
@@ -108,6 +129,16 @@ class Filters:
         window_len : int, optional
             The size of the moving average window, in seconds. If `None`, no
             moving average filter is applied.
+        axis : int, optional
+            The axis of `signal` along which to filter, e.g., -1 for
+            multi-channel data with shape `(n_channels, n_samples)`; by
+            default, -1.
+        n_jobs : int, optional
+            The number of threads across which blocks of channels are
+            filtered; by default, None, which filters the blocks
+            sequentially. If -1, all available CPU cores are used. Each
+            block holds at most 2 ** 20 samples unless a single channel is
+            longer (see `max_elements` in `_filtering.filter_channels()`).
 
         Returns
         -------
@@ -119,13 +150,79 @@ class Filters:
         Liang, Y., Elgendi, M., Chen, Z., et al. (2018). An optimal filter for
         short photoplethysmogram signals. Scientific Data, 5, 180076.
         """
-        nyquist = 0.5 * self.fs
-        low = lowcut / nyquist
-        high = highcut / nyquist
-        b, a = cheby2(order, 20, Wn = [low, high], btype = 'bandpass')
-        filtered = filtfilt(b, a, signal)
+        sos = design_sos(self.fs, 'cheby2', (lowcut, highcut), order,
+                         btype = 'bandpass', rs = 20)
+
+        def filter_and_smooth(
+            signal: np.ndarray,
+            axis: int
+        ) -> np.ndarray:
+            """Apply the bandpass and moving average filters along `axis`."""
+            filtered = sosfiltfilt(sos, signal, axis = axis)
+            if window_len is not None:
+                filtered = self.moving_average(
+                    filtered, int(self.fs * window_len), axis)
+            return filtered
+
+        filtered = filter_channels(filter_and_smooth, signal, axis, n_jobs)
+        return filtered
+
+    def filter_stream(
+        self, 
+        chunks: Iterable[Union[np.ndarray, list]], 
+        lowcut: float = 0.5, 
+        highcut: float = 10, 
+        order: int = 4, 
+        window_len: int = 0.5,
+        overlap: Optional[float] = None
+    ) -> Iterator[np.ndarray]:
+        """
+        Filter a stream of PPG data chunks with the Chebyshev Type II and
+        moving average filters of `filter_signal()`, using constant memory.
+
+        Parameters
+        ----------
+        chunks : iterable of array-like
+            An iterable yielding consecutive chunks of the PPG data, e.g.,
+            columns of CSV chunks or slices of a memory-mapped array.
+        lowcut : int, float
+            The cut-off frequency at which frequencies below this value in the
+            signal are attenuated; by default, 0.5 Hz.
+        highcut : int, float
+            The cut-off frequency at which frequencies above this value in the
+            signal are attenuated; by default, 10 Hz.
+        order : int
+            The filter order, i.e., the number of samples required to
+            produce the desired filtered output; by default, 4.
+        window_len : int, optional
+            The size of the moving average window, in seconds. If `None`, no
+            moving average filter is applied.
+        overlap : float, optional
+            The look-ahead duration, in seconds, used to settle the backward
+            filter pass between chunks; by default, the decay time of the
+            filter's impulse response.
+
+        Yields
+        ------
+        filtered : array-like
+            Consecutive chunks of the filtered PPG data. The chunk sizes may
+            differ from those of the input.
+
+        Notes
+        -----
+        The filter state is carried across chunks and the zero-phase
+        backward pass is computed by overlap-and-discard, so the
+        concatenated output matches `filter_signal()` within numerical
+        tolerance.
+        """
+        sos = design_sos(self.fs, 'cheby2', (lowcut, highcut), order,
+                         btype = 'bandpass', rs = 20)
+        if overlap is not None:
+            overlap = int(overlap * self.fs)
+        filtered = sosfiltfilt_stream(sos, chunks, overlap)
         if window_len is not None:
-            filtered = self.moving_average(filtered, int(self.fs * window_len))
+            filtered = moving_average_stream(
+                filtered, int(self.fs * window_len))
         return filtered
 
 # ======================= PPG Beat Detection Methods =========================
@@ -179,8 +276,8 @@ class BeatDetectors:
     def adaptive_threshold(
         self, 
         signal: Union[np.ndarray, list], 
-        ma_perc: float = 20
-    ) -> np.ndarray:
+        ma_perc: Union[float, Sequence[float]] = 20
+    ) -> Union[np.ndarray, Dict[float, np.ndarray]]:
         """
         Extract beat locations from PPG data with the adaptive thresholding
         algorithm by van Gent al. (2018).
@@ -189,20 +286,28 @@ class BeatDetectors:
         ----------
         signal : array-like
             An array containing the PPG signal.
-        ma_perc : float, optional
+        ma_perc : float or sequence of float, optional
             The percentage with which to raise the moving average, used for
-            fitting detection solutions to the data; by default, 20.
+            fitting detection solutions to the data; by default, 20. If a
+            sequence is given, beats are detected for each percentage while
+            the moving average is computed only once.
 
         Returns
         -------
-        ppg_beats : array-like
-            An array containing indices of PPG pulse onsets.
+        ppg_beats : array-like or dict
+            An array containing indices of PPG pulse onsets. If `ma_perc` is
+            a sequence, a dictionary mapping each percentage to its array
+            of beat indices is returned instead.
 
         Notes
         -----
         The original source code can be found in the HeartPy package at:
         https://github.com/paulvangentcom/heartrate_analysis_python.
 
+        Evaluating several `ma_perc` values at once supports fitting the
+        best threshold, as HeartPy does, without recomputing the moving
+        average.
+
         References
         ----------
         Van Gent, P., Farah, H., Van Nes, N., & Van Arem, B. (2019). HeartPy:
@@ -216,25 +321,13 @@ class BeatDetectors:
         else:
             pass
 
-        ma = self._moving_average(signal)
-        rmean = np.array(ma)
-        mn = np.mean(rmean / 100) * ma_perc
-        ma = rmean + mn
-
-        peaksx = np.where((signal > ma))[0]
-        peaksy = signal[peaksx]
-        peakedges = np.concatenate((np.array([0]),
-                                    (np.where(np.diff(peaksx) > 1)[0]),
-                                    np.array([len(peaksx)])))
-        ppg_beats = []
-        for i in range(0, len(peakedges) - 1):
-            try:
-                y_values = peaksy[peakedges[i]:peakedges[i + 1]].tolist()
-                ppg_beats.append(
-                    peaksx[peakedges[i] + y_values.index(max(y_values))])
-            except:
-                pass
-        ppg_beats = np.array(ppg_beats, dtype = np.int64)
+        signal = np.asarray(signal)
+        rmean = np.array(self._moving_average(signal))
+        rmean_perc = np.mean(rmean / 100)
+        if np.ndim(ma_perc) == 0:
+            return self._threshold_peaks(signal, rmean + rmean_perc * ma_perc)
+        ppg_beats = {perc: self._threshold_peaks(
+            signal, rmean + rmean_perc * perc) for perc in ma_perc}
         return ppg_beats
 
     def erma(
@@ -308,24 +401,61 @@ class BeatDetectors:
         min_len = int(np.rint(W1 * self.fs))
         min_delay = int(np.rint(refractory * self.fs))
 
-        # Identify systolic peaks within waves
-        ppg_beats = [0]
-        for beg, end in zip(beg_waves, end_waves):
-            len_wave = end - beg
-            # If the PPG wave is wider than the minimum duration
-            if len_wave >= min_len:
-                data = signal_copy[beg:end]
-                local_max, props = find_peaks(data, prominence = (None, None))
-                if local_max.size > 0:
-                    peak = beg + local_max[np.argmax(props['prominences'])]
-                    # If the IBI is greater than the refractory period
-                    if peak - ppg_beats[-1] > min_delay:
-                        ppg_beats.append(peak)
-
-        ppg_beats.pop(0)
+        # Keep the PPG waves that are wider than the minimum duration
+        n_waves = min(len(beg_waves), len(end_waves))
+        beg_waves, end_waves = beg_waves[:n_waves], end_waves[:n_waves]
+        wide = (end_waves - beg_waves) >= min_len
+        beg_waves, end_waves = beg_waves[wide], end_waves[wide]
+
+        # Find the local maxima and their prominences within all waves at
+        # once, bounding each wave (i.e., `signal[beg:end]`) with samples
+        # that no peak can exceed
+        marks = np.zeros(len(signal_copy) + 1, dtype = np.int64)
+        marks[beg_waves] += 1
+        marks[end_waves] -= 1
+        in_wave = np.cumsum(marks[:-1]) > 0
+        bounded = np.where(in_wave, signal_copy, np.inf)
+        local_max, _ = find_peaks(bounded)
+        local_max = local_max[in_wave[local_max]]
+        if local_max.size == 0:
+            return np.empty(0, dtype = np.int64)
+        prominences = peak_prominences(bounded, local_max)[0]
+
+        # Identify the most prominent systolic peak within each wave
+        wave = np.searchsorted(beg_waves, local_max, side = 'right')
+        starts = np.flatnonzero(np.diff(wave, prepend = -1) > 0)
+        peaks = local_max[_group_argmax(prominences, starts)]
+
+        # Keep peaks separated by more than the refractory period
+        ppg_beats = []
+        last_beat = 0
+        for peak in peaks.tolist():
+            if peak - last_beat > min_delay:
+                ppg_beats.append(peak)
+                last_beat = peak
         ppg_beats = np.array(ppg_beats, dtype = np.int64)
         return ppg_beats
 
+    def _threshold_peaks(
+        self,
+        signal: np.ndarray,
+        ma: np.ndarray
+    ) -> np.ndarray:
+        """Locate the maximum of each group of samples above the raised
+        moving average `ma` in the van Gent et al. (2019) algorithm. As in
+        HeartPy, each group after the first spans from the last sample of
+        the previous run to the second-last sample of its own run."""
+        peaksx = np.flatnonzero(signal > ma)
+        peaksy = signal[peaksx]
+        peakedges = np.concatenate(([0], np.flatnonzero(np.diff(peaksx) > 1),
+                                    [len(peaksx)]))
+        starts = peakedges[:-1]
+        starts = starts[starts < peakedges[1:]]
+        if len(starts) == 0:
+            return np.empty(0, dtype = np.int64)
+        ppg_beats = peaksx[_group_argmax(peaksy, starts)].astype(np.int64)
+        return ppg_beats
+
     def _bandpass_filter(
         self, 
         signal: Union[np.ndarray, list], 
@@ -337,11 +467,9 @@ class BeatDetectors:
         a PPG signal in the pre-processing procedure of the Elgendi et al.
         (2013) beat detection algorithm. All filter parameters are set as
         default values according to algorithm."""
-        nyquist_freq = 0.5 * self.fs
-        low = lowcut / nyquist_freq
-        high = highcut / nyquist_freq
-        b, a = butter(order, [low, high], btype = 'band', analog = False)
-        filtered = filtfilt(b, a, signal)
+        sos = design_sos(self.fs, 'butter', (lowcut, highcut), order,
+                         btype = 'band')
+        filtered = sosfiltfilt(sos, signal)
         return filtered
 
     def _moving_average(
@@ -354,4 +482,271 @@ class BeatDetectors:
         length is set by default to 0.75 according to the algorithm."""
         ma = uniform_filter1d(np.asarray(signal, dtype = 'float'),
                               size = int(window_len * self.fs))
-        return ma
\ No newline at end of file
+        return ma
+
+def _group_argmax(
+    values: np.ndarray,
+    starts: np.ndarray
+) -> np.ndarray:
+    """Get the index of the first maximum of each group of consecutive
+    `values`, where the groups begin at the sorted, unique `starts`."""
+    group_max = np.maximum.reduceat(values, starts)
+    group = np.repeat(np.arange(len(starts)),
+                      np.diff(np.append(starts, len(values))))
+    is_max = np.flatnonzero(values == group_max[group])
+    return is_max[np.concatenate(([True], np.diff(group[is_max]) > 0))]
+
+# ======================= Online PPG Beat Detection ==========================
+class OnlineERMA:
+    """
+    A streaming implementation of the Elgendi et al. (2013) PPG beat
+    detection algorithm using event-related moving averages, which accepts
+    consecutive chunks of PPG samples and emits systolic peaks as each
+    wave closes.
+
+    Parameters/Attributes
+    ---------------------
+    fs : int
+        The sampling rate of the PPG signal.
+    W1 : float, optional
+        The window size for peak detection in seconds; by default 111 ms.
+    W2 : float, optional
+        The window size for beat detection in seconds; by default, 667 ms.
+    offset : float, optional
+        Offset duration adjustment; by default, 20 ms.
+    refractory : float, optional
+        Refractory period to avoid double detection of the same beat
+        (i.e., the minimum delay between consecutive systolic peaks); by
+        default, 300 ms.
+    mean_squared : float, optional
+        A fixed mean of the clipped and squared signal from which the
+        threshold offset is computed; by default, None, which uses the
+        running mean of all samples up to the current one.
+    preprocessed : bool, optional
+        Whether the PPG signal is preprocessed or not; by default, True.
+
+    Notes
+    -----
+    The running sums of both moving averages, the running mean of the
+    squared signal, the open wave, and the last systolic peak are carried
+    between calls to `push()`, so the refractory period is respected
+    across chunk boundaries. Memory use is bounded by the longest wave.
+
+    The centered moving averages need `(W2 * fs - 1) // 2` samples of
+    look-ahead, so a wave is closed, and its systolic peak emitted, once
+    that many samples past its end have been pushed. Call `flush()` at the
+    end of the stream to evaluate the last samples.
+
+    `BeatDetectors.erma()` offsets its threshold by the mean of the whole
+    squared signal. If that mean is given in `mean_squared`, the
+    concatenated output of `push()` and `flush()` matches
+    `BeatDetectors.erma()` on preprocessed signals. For raw signals, the
+    bandpass filter of the algorithm is applied causally.
+
+    Examples
+    --------
+    >>> from heartview import OnlineERMA
+    >>> detector = OnlineERMA(fs = 64)
+    >>> for chunk in ppg_stream:
+    ...     new_beats = detector.push(chunk)
+    >>> new_beats = detector.flush()
+
+    References
+    ----------
+    Elgendi, M., Norton, I., Brearley, M., Abbott, D., & Schuurmans, D.
+    (2013). Systolic peak detection in acceleration photoplethysmograms
+    measured from emergency responders in tropical conditions. PLoS ONE,
+    8(10), e76585.
+    """
+
+    __slots__ = ('fs', 'offset', 'mean_squared', 'preprocessed',
+                 'ma_kernel_peak', 'ma_kernel_beat', 'min_len', 'min_delay',
+                 'last_beat', '_sos', '_zi', '_n', '_next', '_squared',
+                 '_squared_total', '_signal', '_signal_start', '_in_wave',
+                 '_wave_beg')
+
+    def __init__(
+        self,
+        fs: int,
+        W1: float = 0.111,
+        W2: float = 0.667,
+        offset: float = 0.02,
+        refractory: float = 0.3,
+        mean_squared: Optional[float] = None,
+        preprocessed: bool = True
+    ) -> None:
+        """
+        Initialize the OnlineERMA object.
+
+        Parameters
+        ----------
+        fs : int
+            The sampling rate of the PPG signal.
+        W1 : float, optional
+            The window size for peak detection in seconds; by default 111 ms.
+        W2 : float, optional
+            The window size for beat detection in seconds; by default, 667 ms.
+        offset : float, optional
+            Offset duration adjustment; by default, 20 ms.
+        refractory : float, optional
+            Refractory period to avoid double detection of the same beat;
+            by default, 300 ms.
+        mean_squared : float, optional
+            A fixed mean of the clipped and squared signal from which the
+            threshold offset is computed; by default, None.
+        preprocessed : bool, optional
+            Whether the PPG signal is preprocessed or not; by default, True.
+        """
+        if not isinstance(preprocessed, bool):
+            raise ValueError(
+                'The `preprocessed` attribute must be True or False.')
+        self.fs = fs
+        self.offset = offset
+        self.mean_squared = mean_squared
+        self.preprocessed = preprocessed
+        self.ma_kernel_peak = int(np.rint(W1 * fs))
+        self.ma_kernel_beat = int(np.rint(W2 * fs))
+        self.min_len = int(np.rint(W1 * fs))
+        self.min_delay = int(np.rint(refractory * fs))
+        self.last_beat = 0
+
+        self._sos = None if preprocessed else design_sos(
+            fs, 'butter', (0.5, 8), 2, btype = 'band')
+        self._zi = None                 # bandpass filter state
+        self._n = 0                     # number of samples pushed
+        self._next = 0                  # next sample to evaluate
+
+        # Squared samples from `_next` minus the larger half window, padded
+        # with zeros before the start of the signal
+        half = max(self.ma_kernel_peak, self.ma_kernel_beat) // 2
+        self._squared = np.zeros(half)
+        self._squared_total = 0.0       # sum of squared samples evaluated
+        self._signal = np.empty(0)      # samples from `_signal_start`
+        self._signal_start = 0
+        self._in_wave = None            # whether the last sample was in a wave
+        self._wave_beg = None           # beginning of the open wave
+
+    def push(
+        self,
+        samples: Union[np.ndarray, list]
+    ) -> np.ndarray:
+        """
+        Add a chunk of PPG samples and get the systolic peaks of the waves
+        closed by it.
+
+        Parameters
+        ----------
+        samples : array-like
+            An array containing the next consecutive samples of the PPG
+            signal.
+
+        Returns
+        -------
+        ppg_beats : array-like
+            An array containing the indices of new systolic peaks, counted
+            from the first sample pushed.
+        """
+        x = np.asarray(samples, dtype = float).ravel()
+        if x.size == 0:
+            return np.empty(0, dtype = np.int64)
+        if self._sos is not None:
+            if self._zi is None:
+                self._zi = sosfilt_zi(self._sos) * x[0]
+            x, self._zi = sosfilt(self._sos, x, zi = self._zi)
+        self._n += len(x)
+        self._signal = np.concatenate((self._signal, x))
+        self._squared = np.concatenate(
+            (self._squared, np.maximum(x, 0) ** 2))
+        lookahead = (max(self.ma_kernel_peak, self.ma_kernel_beat) - 1) // 2
+        return self._evaluate(self._n - lookahead)
+
+    def flush(self) -> np.ndarray:
+        """
+        Evaluate the last samples of the stream, padding the moving
+        averages with zeros as `BeatDetectors.erma()` does.
+
+        Returns
+        -------
+        ppg_beats : array-like
+            An array containing the indices of the remaining systolic
+            peaks.
+        """
+        lookahead = (max(self.ma_kernel_peak, self.ma_kernel_beat) - 1) // 2
+        self._squared = np.concatenate((self._squared, np.zeros(lookahead)))
+        return self._evaluate(self._n)
+
+    def _evaluate(self, stop: int) -> np.ndarray:
+        """Compare the moving averages with the threshold for samples up to
+        `stop`, and find the systolic peaks of any waves that close."""
+        n_eval = stop - self._next
+        if n_eval <= 0:
+            return np.empty(0, dtype = np.int64)
+        half = max(self.ma_kernel_peak, self.ma_kernel_beat) // 2
+
+        # Calculate the moving averages centered on each evaluated sample
+        ma = []
+        for kernel_len in (self.ma_kernel_peak, self.ma_kernel_beat):
+            kernel = np.ones(kernel_len) / kernel_len
+            window = self._squared[(half - kernel_len // 2):]
+            ma.append(np.convolve(
+                window[:(n_eval + kernel_len - 1)], kernel, mode = 'valid'))
+        ma_peak, ma_beat = ma
+
+        # Calculate threshold values
+        squared = self._squared[half:(half + n_eval)]
+        if self.mean_squared is None:
+            cumsum = self._squared_total + np.cumsum(squared)
+            mean_squared = cumsum / np.arange(
+                self._next + 1, self._next + n_eval + 1)
+        else:
+            mean_squared = self.mean_squared
+        self._squared_total += squared.sum()
+        thr1 = ma_beat + self.offset * mean_squared
+
+        # Identify the starts and ends of PPG waves
+        waves = ma_peak > thr1
+        if self._in_wave is None:
+            prev = waves[:-1]
+            changes = np.flatnonzero(waves[1:] != prev) + 1
+        else:
+            prev = np.concatenate(([self._in_wave], waves[:-1]))
+            changes = np.flatnonzero(waves != prev)
+        ppg_beats = []
+        for i in changes:
+            if waves[i]:
+                self._wave_beg = self._next + i - 1
+            elif self._wave_beg is not None:
+                peak = self._find_systolic_peak(
+                    self._wave_beg, self._next + i - 1)
+                if peak is not None:
+                    ppg_beats.append(peak)
+                self._wave_beg = None
+        self._in_wave = bool(waves[-1])
+        self._next = stop
+
+        # Drop samples that are no longer needed
+        self._squared = self._squared[n_eval:]
+        keep = self._next - 1 if self._wave_beg is None else self._wave_beg
+        keep = max(keep, self._signal_start)
+        self._signal = self._signal[(keep - self._signal_start):]
+        self._signal_start = keep
+        return np.array(ppg_beats, dtype = np.int64)
+
+    def _find_systolic_peak(
+        self,
+        beg: int,
+        end: int
+    ) -> Optional[int]:
+        """Find the most prominent peak of a closed wave, if the wave is
+        long enough and the peak lies beyond the refractory period."""
+        if end - beg < self.min_len:
+            return None
+        data = self._signal[(beg - self._signal_start):(end - self._signal_start)]
+        local_max, props = find_peaks(data, prominence = (None, None))
+        if local_max.size == 0:
+            return None
+        peak = beg + int(local_max[np.argmax(props['prominences'])])
+        if peak - self.last_beat <= self.min_delay:
+            return None
+        self.last_beat = peak
+        return peak
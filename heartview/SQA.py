@@ -1,11 +1,15 @@
 from typing import List, Literal, Tuple, Optional, Union
-from tqdm import tqdm
+from collections import deque
 from math import ceil, floor
 from scipy.interpolate import interp1d
-from scipy.signal import welch
+from scipy.signal import spectrogram, welch
+from scipy.fft import rfftfreq
+from numpy.lib.stride_tricks import sliding_window_view
+import warnings
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
+from .Store import Recording, TimeAxis
 
 # ============================== CARDIOVASCULAR ==============================
 class Cardio:
@@ -35,7 +39,7 @@ class Cardio:
 
     def compute_metrics(
         self, 
-        data: pd.DataFrame, 
+        data: Union[pd.DataFrame, Recording], 
         beats_ix: Union[np.ndarray, list], 
         artifacts_ix: Union[np.ndarray, list], 
         ts_col: Optional[str] = None,
@@ -43,7 +47,8 @@ class Cardio:
         min_hr: Union[float, int] = 40, 
         rolling_window: Optional[int] = None,
         rolling_step: int = 15, 
-        show_progress: bool = True
+        show_progress: bool = True,
+        time_axis: Optional[TimeAxis] = None
     ) -> pd.DataFrame:
         """
         Compute all SQA metrics for cardiovascular data by segment or
@@ -53,8 +58,9 @@ class Cardio:
 
         Parameters
         ----------
-        data : pandas.DataFrame
-            A DataFrame containing pre-processed ECG or PPG data.
+        data : pandas.DataFrame, Store.Recording
+            A DataFrame or recording containing pre-processed ECG or PPG
+            data.
         beats_ix : array-like
             An array containing the indices of detected beats.
         artifacts_ix : array-like
@@ -74,8 +80,13 @@ class Cardio:
         rolling_step : int, optional
             The step size, in seconds, of the sliding windows; by default, 15.
         show_progress : bool, optional
-            Whether to display a progress bar while the function runs; by
-            default, True.
+            Retained for backward compatibility; the metrics are now computed
+            in vectorized passes, so no progress bar is displayed.
+        time_axis : Store.TimeAxis, optional
+            A time axis from which the output timestamps are computed
+            instead of from the `ts_col` column; by default, None. If `data`
+            is a `Store.Recording` and `ts_col` is given, the recording's
+            time axis is used.
 
         Returns
         -------
@@ -97,91 +108,18 @@ class Cardio:
         ...                                 ts_col = 'Timestamp', \
         ...                                 seg_size = 60, min_hr = 40)
         """
-        df = data.copy()
-        df.index = df.index.astype(int)
-        df.loc[beats_ix, 'Beat'] = 1
-
+        time_axis = self._resolve_time_axis(data, ts_col, time_axis)
+        data = self._as_frame(data)
         if rolling_window is not None:
-            metrics = pd.DataFrame()
-            if ts_col is not None:
-                seconds = self.get_seconds(data, beats_ix, ts_col,
-                                           show_progress = show_progress)
-                s = 1
-                for n in tqdm(range(0, len(seconds), rolling_step),
-                              disable = not show_progress):
-        
-                    # Get missing beats
-                    window_missing = seconds.iloc[n:(n + rolling_window)]
-                    # n_expected = window_missing['Mean HR'].median() * (seg_size / 60)
-                    raw_expected = window_missing['Mean HR'].rolling(
-                        window = seg_size + 1, min_periods = 1, center = True).median()
-                    n_expected = raw_expected.median() * (seg_size / 60)
-                    n_detected = window_missing['N Beats'].sum()
-                    n_missing = (n_expected - n_detected) \
-                        if n_expected > n_detected else 0
-                    perc_missing = (n_missing / n_expected) * 100
-                    ts = window_missing['Timestamp'].iloc[0]
-        
-                    # Summarize artifactual beats
-                    artifacts = self.get_artifacts(
-                        df, beats_ix, artifacts_ix, seg_size = 1,
-                        ts_col = ts_col)
-                    window_artifact = artifacts.iloc[n:(n + rolling_window)]
-                    n_artifact = window_artifact['N Artifact'].sum()
-                    perc_artifact = round((n_artifact / n_detected) * 100, 2)
-        
-                    # Output summary
-                    metrics = pd.concat([metrics, pd.DataFrame.from_records([{
-                        'Moving Window': s,
-                        'Timestamp': ts,
-                        'N Expected': int(n_expected),
-                        'N Detected': int(n_detected),
-                        'N Missing': int(n_missing),
-                        '% Missing': round(perc_missing, 2),
-                        'N Artifact': int(n_artifact),
-                        '% Artifact': round(perc_artifact, 2)
-                    }])], ignore_index = True).reset_index(drop = True)
-                    s += 1
-            else:
-                seconds = self.get_seconds(data, beats_ix,
-                                           show_progress = show_progress)
-                s = 1
-                for n in tqdm(range(0, len(seconds), rolling_step),
-                              disable = not show_progress):
-
-                    # Get missing beats
-                    window_missing = seconds.iloc[n:(n + rolling_window)]
-                    raw_expected = window_missing['Mean HR'].rolling(
-                        window = seg_size + 1, min_periods = 1, center = True).median()
-                    n_expected = raw_expected.median() * (seg_size / 60)
-                    # n_expected = window_missing['Mean HR'].median() * (seg_size / 60)
-                    n_detected = window_missing['N Beats'].sum()
-                    n_missing = (n_expected - n_detected) \
-                        if n_expected > n_detected else 0
-                    perc_missing = (n_missing / n_expected) * 100
-
-                    # Get artifactual beats
-                    artifacts = self.get_artifacts(
-                        df, beats_ix, artifacts_ix, seg_size = 1)
-                    window_artifact = artifacts.iloc[n:(n + rolling_window)]
-                    n_artifact = window_artifact['N Artifact'].sum()
-                    perc_artifact = (n_artifact / n_detected) * 100
-
-                    # Output summary
-                    metrics = pd.concat([metrics, pd.DataFrame.from_records([{
-                        'Moving Window': s,
-                        'N Expected': int(n_expected),
-                        'N Detected': int(n_detected),
-                        'N Missing': int(n_missing),
-                        '% Missing': round(perc_missing, 2),
-                        'N Artifact': int(n_artifact),
-                        '% Artifact': round(perc_artifact, 2)
-                    }])], ignore_index = True).reset_index(drop = True)
-                    s += 1
+            metrics = self._get_rolling_metrics(
+                data, beats_ix, artifacts_ix, ts_col = ts_col,
+                seg_size = seg_size, rolling_window = rolling_window,
+                rolling_step = rolling_step, time_axis = time_axis)
 
             # Handle last partial rolling window of data
-            last_seg_len = len(seconds) % rolling_window
+            last_seg_len = ceil(len(data) / self.fs) % rolling_window
             if last_seg_len > 0:
+                last_row = metrics.index[-1]
                 last_detected = metrics['N Detected'].iloc[-1]
                 last_expected_ratio = min_hr / metrics['N Expected'].iloc[:-1].median()
                 last_expected = last_expected_ratio * last_seg_len
@@ -191,26 +129,27 @@ class Cardio:
                 else:
                     last_perc_missing = 0
                     last_n_missing = 0
-                metrics['N Expected'].iloc[-1] = int(round(last_expected))
-                metrics['N Missing'].iloc[-1] = int(round(last_n_missing))
-                metrics['% Missing'].iloc[-1] = round(last_perc_missing, 2)
+                metrics.loc[last_row, 'N Expected'] = int(round(last_expected))
+                metrics.loc[last_row, 'N Missing'] = int(round(last_n_missing))
+                metrics.loc[last_row, '% Missing'] = round(last_perc_missing, 2)
 
         else:
-            if ts_col is not None:
+            if ts_col is not None or time_axis is not None:
                 missing = self.get_missing(
-                    df, beats_ix, seg_size, min_hr = min_hr, ts_col = ts_col,
-                    show_progress = show_progress)
+                    data, beats_ix, seg_size, min_hr = min_hr, ts_col = ts_col,
+                    show_progress = show_progress, time_axis = time_axis)
                 artifacts = self.get_artifacts(
-                    df, beats_ix, artifacts_ix, seg_size, ts_col)
+                    data, beats_ix, artifacts_ix, seg_size, ts_col,
+                    time_axis = time_axis)
                 metrics = pd.merge(missing, artifacts,
                                    on = ['Segment', 'Timestamp'])
                 metrics['Invalid'] = metrics['N Detected'].apply(
                     lambda n: 1 if n < int(min_hr * (seg_size/60)) or n > 220 else np.nan)
             else:
                 missing = self.get_missing(
-                    df, beats_ix, seg_size, show_progress = show_progress)
+                    data, beats_ix, seg_size, show_progress = show_progress)
                 artifacts = self.get_artifacts(
-                    df, beats_ix, artifacts_ix, seg_size)
+                    data, beats_ix, artifacts_ix, seg_size)
                 metrics = pd.merge(missing, artifacts, on = ['Segment'])
 
         metrics['Invalid'] = metrics['N Detected'].apply(
@@ -218,21 +157,88 @@ class Cardio:
 
         return metrics
 
+    def compute_metrics_from_beats(
+        self,
+        n_samples: int,
+        beats_ix: Union[np.ndarray, list],
+        artifacts_ix: Union[np.ndarray, list],
+        seg_size: int = 60,
+        min_hr: Union[float, int] = 40,
+        rolling_window: Optional[int] = None,
+        rolling_step: int = 15,
+        time_axis: Optional[TimeAxis] = None
+    ) -> pd.DataFrame:
+        """
+        Compute all SQA metrics by segment or moving window from the beat
+        and artifact indices of a recording alone, without its signal data.
+
+        Parameters
+        ----------
+        n_samples : int
+            The number of samples in the recording.
+        beats_ix : array-like
+            An array containing the sample indices of detected beats.
+        artifacts_ix : array-like
+            An array containing the sample indices of artifactual beats.
+        seg_size : int
+            The segment size in seconds; by default, 60.
+        min_hr : int, float
+            The minimum acceptable heart rate against which the number of
+            beats in the last partial segment will be compared; by default, 40.
+        rolling_window : int, optional
+            The size, in seconds, of the sliding window across which to
+            compute the SQA metrics; by default, None.
+        rolling_step : int, optional
+            The step size, in seconds, of the sliding windows; by default, 15.
+        time_axis : Store.TimeAxis, optional
+            A time axis from which the timestamps of the output are computed;
+            by default, None. If given, the output will contain a timestamps
+            column.
+
+        Returns
+        -------
+        metrics : pandas.DataFrame
+            A DataFrame with all computed SQA metrics per segment, identical
+            to the output of `SQA.Cardio.compute_metrics()`.
+
+        Notes
+        -----
+        Beats and artifacts are counted per segment and per second from
+        their indices, so memory use scales with the number of beats and
+        segments rather than with the length of the signal.
+
+        Examples
+        --------
+        >>> from heartview.pipeline import SQA
+        >>> sqa = SQA.Cardio(fs = 1000)
+        >>> artifacts_ix = sqa.identify_artifacts(beats_ix, method = 'both')
+        >>> cardio_qa = sqa.compute_metrics_from_beats(
+        ...     len(ecg), beats_ix, artifacts_ix, seg_size = 60, min_hr = 40)
+        """
+        data = pd.DataFrame(index = pd.RangeIndex(int(n_samples)))
+        return self.compute_metrics(
+            data, beats_ix, artifacts_ix, seg_size = seg_size,
+            min_hr = min_hr, rolling_window = rolling_window,
+            rolling_step = rolling_step, show_progress = False,
+            time_axis = time_axis)
+
     def get_artifacts(
         self, 
-        data: pd.DataFrame, 
+        data: Union[pd.DataFrame, Recording], 
         beats_ix: Union[np.ndarray, list], 
         artifacts_ix: Union[np.ndarray, list],
         seg_size: int = 60, 
-        ts_col: Optional[str] = None
+        ts_col: Optional[str] = None,
+        time_axis: Optional[TimeAxis] = None
     ) -> pd.DataFrame:
         """
         Summarize the number and proportion of artifactual beats per segment.
 
         Parameters
         ----------
-        data : pandas.DataFrame
-            A DataFrame containing the pre-processed ECG or PPG data.
+        data : pandas.DataFrame, Store.Recording
+            A DataFrame or recording containing the pre-processed ECG or
+            PPG data.
         beats_ix : array-like
             An array containing the indices of detected beats.
         artifacts_ix : array-like
@@ -244,6 +250,11 @@ class Cardio:
             The name of the column containing timestamps; by default, None.
             If a string value is given, the output will contain a timestamps
             column.
+        time_axis : Store.TimeAxis, optional
+            A time axis from which the output timestamps are computed
+            instead of from the `ts_col` column; by default, None. If `data`
+            is a `Store.Recording` and `ts_col` is given, the recording's
+            time axis is used.
 
         Returns
         -------
@@ -256,21 +267,24 @@ class Cardio:
         SQA.Cardio.identify_artifacts :
             Identify artifactual beats using both or either of the methods.
         """
-        df = data.copy()
-        df.loc[beats_ix, 'Beat'] = 1
-        df.loc[artifacts_ix, 'Artifact'] = 1
+        time_axis = self._resolve_time_axis(data, ts_col, time_axis)
+        data = self._as_frame(data)
+        beats = self._get_beat_positions(data, beats_ix)
+        artifacts = self._get_beat_positions(data, artifacts_ix)
 
-        n_seg = ceil(len(df) / (self.fs * seg_size))
+        # Count beats and artifacts per segment from their indices alone
+        seg_len = self.fs * seg_size
+        n_seg = ceil(len(data) / seg_len)
         segments = pd.Series(np.arange(1, n_seg + 1))
-        n_detected = df.groupby(
-            df.index // (self.fs * seg_size))['Beat'].sum()
-        n_artifact = df.groupby(
-            df.index // (self.fs * seg_size))['Artifact'].sum()
-        perc_artifact = (n_artifact / n_detected) * 100
-
-        if ts_col is not None:
-            timestamps = df.groupby(
-                df.index // (self.fs * seg_size)).first()[ts_col]
+        n_detected = pd.Series(np.bincount(beats // seg_len, minlength = n_seg))
+        n_artifact = pd.Series(
+            np.bincount(artifacts // seg_len, minlength = n_seg))
+        with np.errstate(invalid = 'ignore', divide = 'ignore'):
+            perc_artifact = (n_artifact / n_detected) * 100
+
+        if ts_col is not None or time_axis is not None:
+            timestamps = self._get_timestamps(
+                data, ts_col, time_axis, np.arange(n_seg) * seg_len)
             artifacts = pd.concat([
                 segments,
                 timestamps,
@@ -365,12 +379,10 @@ class Cardio:
             prev_n: int = 6
         ) -> np.ndarray:
             """Identify locations of artifactual beats in cardiovascular data
-            based on the approach by Hegarty-Craver et al. (2018)."""
+            based on the approach by Hegarty-Craver et al. (2018). Return
+            boolean masks of valid and artifactual beats in `beats_ix`."""
 
             ibis = (np.diff(beats_ix) / self.fs) * 1000
-            beats = beats_ix[1:]  # drop the first beat
-            artifact_beats = []
-            valid_beats = [beats_ix[0]]  # assume first beat is valid
 
             # Set the initial IBI to compare against
             if initial_hr == 'auto':
@@ -381,32 +393,32 @@ class Cardio:
             else:
                 first_ibi = 60000 / initial_hr
 
-            for n in range(len(ibis)):
-                current_ibi = ibis[n]
-                current_beat = beats[n]
-
-                # Check against an estimate of the first N IBIs
-                if n < prev_n:
-                    if n == 0:
-                        ibi_estimate = first_ibi
-                    else:
-                        next_five = np.insert(ibis[:n], 0, first_ibi)
-                        ibi_estimate = np.median(next_five)
-
-                # Check against an estimate of the preceding N IBIs
+            # Check the first N IBIs against an estimate that includes the
+            # initial IBI
+            ibi_estimate = np.empty(len(ibis))
+            for n in range(min(prev_n, len(ibis))):
+                if n == 0:
+                    ibi_estimate[n] = first_ibi
                 else:
-                    ibi_estimate = np.median(ibis[n - (prev_n):n])
+                    next_five = np.insert(ibis[:n], 0, first_ibi)
+                    ibi_estimate[n] = np.median(next_five)
 
-                # Set the acceptable/valid range of IBIs
-                low = (26 / 32) * ibi_estimate
-                high = (44 / 32) * ibi_estimate
+            # Check against a rolling median of the preceding N IBIs
+            if len(ibis) > prev_n:
+                windows = sliding_window_view(ibis[:-1], prev_n)
+                chunk = max(1, 2 ** 20 // max(prev_n, 1))
+                for c in range(0, len(windows), chunk):
+                    ibi_estimate[(prev_n + c):(prev_n + c + chunk)] = \
+                        np.median(windows[c:(c + chunk)], axis = 1)
 
-                if low <= current_ibi <= high:
-                    valid_beats.append(current_beat)
-                else:
-                    artifact_beats.append(current_beat)
+            # Set the acceptable/valid range of IBIs
+            low = (26 / 32) * ibi_estimate
+            high = (44 / 32) * ibi_estimate
+            valid = (low <= ibis) & (ibis <= high)
 
-            return np.array(valid_beats), np.array(artifact_beats)
+            # Assume the first beat is valid
+            valid = np.insert(valid, 0, True)
+            return valid, ~valid
 
         def identify_artifacts_cbd(
             beats_ix: Union[np.ndarray, list], 
@@ -417,75 +429,69 @@ class Cardio:
              the criterion beat difference test by Berntson et al. (1990)."""
 
             # Derive IBIs from beat indices
+            beats_ix = np.asarray(beats_ix)
             ibis = ((np.ediff1d(beats_ix)) / self.fs) * 1000
 
             # Compute consecutive absolute differences across IBIs
             ibi_diffs = np.abs(np.ediff1d(ibis))
-
-            # Initialize an array to store "bad" IBIs
-            ibi_bad = np.zeros(shape = len(ibis))
-            artifact_beats = []
-
-            if len(ibi_diffs) < neighbors:
-                neighbors = len(ibis)
-
-            for ii in range(len(ibi_diffs)):
-
-                # If there are not enough neighbors in the beginning
-                if ii < int(neighbors / 2) + 1:
-                    select = np.concatenate(
-                        (ibi_diffs[:ii], ibi_diffs[(ii + 1):(neighbors + 1)]))
-                    select_ibi = np.concatenate(
-                        (ibis[:ii], ibis[(ii + 1):(neighbors + 1)]))
-
-                # If there are not enough neighbors at the end
-                elif (len(ibi_diffs) - ii) < (int(neighbors / 2) + 1) and (
-                        len(ibi_diffs) - ii) > 1:
-                    select = np.concatenate(
-                        (ibi_diffs[-(neighbors - 1):ii], ibi_diffs[ii + 1:]))
-                    select_ibi = np.concatenate(
-                        (ibis[-(neighbors - 1):ii], ibis[ii + 1:]))
-
-                # If there is only one neighbor left to check against
-                elif len(ibi_diffs) - ii == 1:
-                    select = ibi_diffs[-(neighbors - 1):-1]
-                    select_ibi = ibis[-(neighbors - 1):-1]
-
-                else:
-                    select = np.concatenate(
-                        (ibi_diffs[ii - int(neighbors / 2):ii],
-                         ibi_diffs[(ii + 1):(ii + 1 + int(neighbors / 2))]))
-                    select_ibi = np.concatenate(
-                        (ibis[ii - int(neighbors / 2):ii],
-                         ibis[(ii + 1):(ii + 1 + int(neighbors / 2))]))
-
-                # Calculate the quartile deviation
-                QD = self._quartile_deviation(select)
-
-                # Calculate the maximum expected difference (MED)
-                MED = 3.32 * QD
-
-                # Calculate the minimal artifact difference (MAD)
-                MAD = (np.median(select_ibi) - 2.9 * QD) / 3
-
-                # Calculate the criterion beat difference score
-                criterion_beat_diff = (MED + MAD) / 2
-
-                # Find indices of IBIs that fail the CBD check
-                if (ibi_diffs[ii]) > tol * criterion_beat_diff:
-                    bad_neighbors = int(neighbors * 0.25)
-                    end_idx = min(ii + bad_neighbors + 1, len(beats_ix))
-                    artifact_beats.extend(beats_ix[ii + 1:end_idx])
-                    ibi_bad[ii + 1] = 1
-
-            artifact_beats = np.array(artifact_beats).flatten()
+            n_diffs = len(ibi_diffs)
+            n_ibis = len(ibis)
+
+            if n_diffs < neighbors:
+                neighbors = n_ibis
+            half = int(neighbors / 2)
+            ii = np.arange(n_diffs)
+
+            # Set the bounds of the neighbors preceding (`lo`) and following
+            # (`hi`) each IBI difference, following Python slice semantics
+            at_start = ii < half + 1
+            at_end = ~at_start & ((n_diffs - ii) < (half + 1)) & (
+                (n_diffs - ii) > 1)
+            at_last = ~at_start & ((n_diffs - ii) == 1)
+            tail = -(neighbors - 1)
+            lo_start = np.select([at_start, at_end | at_last], [0, tail],
+                                 ii - half)
+            lo_stop = np.where(at_last, -1, ii)
+            hi_start = ii + 1
+            hi_stop = np.select([at_start, at_end, at_last],
+                                [neighbors + 1, n_diffs, ii + 1], ii + 1 + half)
+            hi_stop_ibi = np.where(at_end, n_ibis, hi_stop)
+
+            # Gather the neighbors of all IBI differences at once
+            select = self._gather_slices(
+                ibi_diffs, lo_start, lo_stop, hi_start, hi_stop)
+            select_ibi = self._gather_slices(
+                ibis, lo_start, lo_stop, hi_start, hi_stop_ibi)
+
+            # Calculate the quartile deviation
+            q75 = self._sorted_percentile(select, 0.75)
+            q25 = self._sorted_percentile(select, 0.25)
+            QD = (q75 - q25) * 0.5
+
+            # Calculate the maximum expected difference (MED)
+            MED = 3.32 * QD
+
+            # Calculate the minimal artifact difference (MAD)
+            MAD = (self._sorted_median(select_ibi) - 2.9 * QD) / 3
+
+            # Calculate the criterion beat difference score
+            criterion_beat_diff = (MED + MAD) / 2
+
+            # Find indices of IBIs that fail the CBD check and flag the
+            # beats that follow them
+            failed = np.flatnonzero(ibi_diffs > tol * criterion_beat_diff)
+            bad_neighbors = int(neighbors * 0.25)
+            flagged = failed[:, None] + np.arange(1, bad_neighbors + 1)
+            artifact_beats = beats_ix[flagged[flagged < len(beats_ix)]]
             return artifact_beats
 
+        beats_ix = np.asarray(beats_ix)
         if method == 'hegarty':
             initial_hr = initial_hr if initial_hr is not None else 'auto'
             prev_n = prev_n if prev_n is not None else 6
-            _, artifacts_ix = identify_artifacts_hegarty(
+            _, artifacts = identify_artifacts_hegarty(
                 beats_ix, initial_hr, prev_n)
+            artifacts_ix = beats_ix[artifacts]
         elif method == 'cbd':
             neighbors = neighbors if neighbors is not None else 5
             tol = tol if tol is not None else 1
@@ -496,8 +502,9 @@ class Cardio:
             prev_n = prev_n if prev_n is not None else 6
             neighbors = neighbors if neighbors is not None else 5
             tol = tol if tol is not None else 1
-            _, artifact_hegarty = identify_artifacts_hegarty(
+            _, artifacts = identify_artifacts_hegarty(
                 beats_ix, initial_hr, prev_n)
+            artifact_hegarty = beats_ix[artifacts]
             artifact_cbd = identify_artifacts_cbd(
                 beats_ix, neighbors, tol)
             artifacts_ix = np.union1d(artifact_hegarty, artifact_cbd)
@@ -508,20 +515,22 @@ class Cardio:
         return artifacts_ix
 
     def get_missing(
-        self, data: pd.DataFrame, 
+        self, data: Union[pd.DataFrame, Recording], 
         beats_ix: Union[np.ndarray, list], 
         seg_size: int = 60, 
         min_hr: Union[int, float] = 40,
         ts_col: Optional[str] = None, 
-        show_progress: bool = True
+        show_progress: bool = True,
+        time_axis: Optional[TimeAxis] = None
     ) -> pd.DataFrame:
         """
         Summarize the number and proportion of missing beats per segment.
 
         Parameters
         ----------
-        data : pandas.DataFrame
-            The DataFrame containing the pre-processed ECG or PPG data.
+        data : pandas.DataFrame, Store.Recording
+            The DataFrame or recording containing the pre-processed ECG or
+            PPG data.
         beats_ix : array-like
             An array containing the indices of detected beats.
         seg_size : int
@@ -534,8 +543,14 @@ class Cardio:
             If a string value is given, the output will contain a timestamps
             column.
         show_progress : bool, optional
-            Whether to display a progress by while the function runs; by
-            default, True.
+            Retained for backward compatibility; the missing beats are now
+            computed in a single vectorized pass, so no progress bar is
+            displayed.
+        time_axis : Store.TimeAxis, optional
+            A time axis from which the output timestamps are computed
+            instead of from the `ts_col` column; by default, None. If `data`
+            is a `Store.Recording` and `ts_col` is given, the recording's
+            time axis is used.
 
         Returns
         -------
@@ -543,7 +558,8 @@ class Cardio:
             A DataFrame with detected, expected, and missing numbers of
             beats per segment.
         """
-        seconds = self.get_seconds(data, beats_ix, ts_col, show_progress)
+        seconds = self.get_seconds(data, beats_ix, ts_col, show_progress,
+                                   time_axis = time_axis)
         seconds.index = seconds.index.astype(int)
 
         n_seg = ceil(len(seconds) / seg_size)
@@ -575,7 +591,7 @@ class Cardio:
             n_missing.iloc[-1] = last_n_missing
             perc_missing.iloc[-1] = last_perc_missing
 
-        if ts_col is not None:
+        if ts_col is not None or time_axis is not None:
             timestamps = seconds.groupby(
                 seconds.index // seg_size).first()['Timestamp']
             missing = pd.concat([
@@ -653,677 +669,11 @@ class Cardio:
         arrhythmia measurement: Demonstration using executive function
         assessment. Behavioral Research Methods, 50, 1816–1823.
         '''
-        global MIN_BPM, MAX_BPM
-        MIN_BPM = min_bpm
-        MAX_BPM = max_bpm
-        MAX_COUNT = 10              # maximum number of consecutive corrections
-
-        DEBUGGING = False
-        
-        ibis = np.diff(beats_ix)
-        beats = beats_ix[1:]        # drop the first beat
-
-        short_threshold = 24 / 32
-        long_threshold = 44 / 32
-        extra_threshold = 52 / 32
-
-        global cnt, corrected_ibis, corrected_beats, corrected_flags
-        global prev_ibi, prev_beat, prev_flag, current_ibi, current_beat, current_flag, correction_flags
-        cnt = 0                     # increment when correcting the ibi and decrement when accepting the ibi
-        prev_ibi = 0
-        prev_beat = 0
-        prev_flag = None
-        current_ibi = 0
-        current_beat = 0
-        current_flag = None
-        corrected_ibis = []
-        corrected_beats = []
-        corrected_flags = []
-        correction_flags = [0 for i in range(len(beats))]
-
-        ## DELETE THIS LATER
-        global n_insert
-        n_insert = 0
-
-        class MaxNFifo:
-            '''
-            A class for FIFO with N elements at maximum.
-
-            Parameters/Attributes
-            ---------------------
-            prev_n : int
-                The maximum number of elements in the FIFO.
-            '''
-            def __init__(self, prev_n: int, item: Optional[int] = None):
-                '''
-                Initialize the FIFO object.
-                
-                Parameters
-                ---------------------
-                prev_n : int
-                    The maximum number of elements in the FIFO.
-                item : int, optional
-                    The initial item to add to the FIFO; by default, None.
-                    The item is added twice if it is not None.
-                '''
-                self.prev_n = prev_n
-                if item is not None:
-                    self.queue = [item, item]
-                else:
-                    self.queue = []
-
-            def push(self, item: int):
-                '''
-                Push an item to the FIFO. If the number of elements exceeds the 
-                maximum, remove the first element.
-
-                Parameters
-                ---------------------
-                item : int
-                    The item to add to the FIFO.
-                '''
-                self.queue.append(item)
-                if len(self.queue) > self.prev_n + 1:
-                    self.queue.pop(0)
-
-            def get_queue(self):
-                '''
-                Return the FIFO queue.
-
-                Return
-                ---------------------
-                queue : list
-                '''
-                return self.queue
-            
-            def change_last(self, item: int):
-                '''
-                Change the last item in the FIFO queue.
-
-                Parameters
-                ---------------------
-                item : int
-                    The new item to replace the last item in the queue.
-                '''
-                self.queue[-1] = item
-            
-            def reset(self, item: Optional[int] = None):
-                '''
-                Reset the FIFO queue. 
-                If an item is given, reset the queue with the item. If not, 
-                reset the queue with an empty list.
-
-                Parameters
-                ---------------------
-                item: int, optional
-                    The item to add to the FIFO; by default, None.
-                    The item is added twice if it is not None.
-                '''
-                if item is None:
-                    self.queue = []
-                else:
-                    self.queue = [item, item]
-        
-        # Set the initial IBI to compare against
-        global prev_ibis_fifo, first_ibi, correction_failed
-        if initial_hr == 'auto':
-            successive_diff = np.abs(np.diff(ibis))
-            min_diff_ix = np.convolve(successive_diff, np.ones(hr_estimate_window) / 
-                                      hr_estimate_window, mode = 'valid').argmin()
-            first_ibi = ibis[min_diff_ix:min_diff_ix + hr_estimate_window].mean()
-        else:
-            first_ibi = self.fs * 60 / initial_hr
-        
-        prev_ibis_fifo = MaxNFifo(prev_n, first_ibi)  # FIFO for the previous n+1 IBIs
-        correction_failed = MaxNFifo(prev_n - 1)      # Store whether the correction failed for the last n IBIs
-
-        def estimate_ibi(prev_ibis: np.ndarray):
-            '''
-            Estimate IBI based on the previous IBIs.
-            
-            Parameters
-            ---------------------
-            prev_ibis: array-like
-                A list of prev_n number of previous IBIs.
-            
-            Returns
-            ---------------------
-            estimated_ibi : int
-            '''
-            return np.median(prev_ibis)
-
-        def return_flag(current_ibi: int, prev_ibis: Optional[np.ndarray] = None):
-            '''
-            Return whether the current IBI is correct, short, long, or extra 
-            long based on the previous IBIs.
-                Correct: 26/32 - 44/32 of the estimated IBI
-                Short: < 26/32 of the estimated IBI
-                Long: > 44/32 and < 54/32 of the estimated IBI
-                Extra Long: > 54/32 of the estimated IBI
-            
-            Parameters
-            ---------------------
-            current_ibi: int
-                current IBI value in the number of indices.
-            prev_ibis: array-like, optional
-                A list of prev_n number of previous IBIs.
-            
-            Returns
-            ---------------------
-            flag : str
-                The flag of the current IBI: 'Correct', 'Short', 'Long', or 
-                'Extra Long'.
-            '''
-            # Calculate the estimated IBI
-            estimated_ibi = estimate_ibi(prev_ibis)
-
-            # Set the acceptable/valid range of IBIs
-            low = short_threshold * estimated_ibi
-            high = long_threshold * estimated_ibi
-            extra = extra_threshold * estimated_ibi
-
-            # flag the ibi: correct, short, long, or extra long
-            if low <= current_ibi <= high:
-                flag = 'Correct'
-            elif current_ibi < low:
-                flag = 'Short'
-            elif current_ibi > high and current_ibi < extra:
-                flag = 'Long'
-            else:
-                flag = 'Extra Long'
-            
-            # print('current:', current_ibi, ' prev:', prev_ibis, ' flag:', flag)
-            
-            return flag
-        
-        def acceptance_check(corrected_ibi: int, prev_ibis: np.ndarray):
-            '''
-            Check if the corrected IBI is acceptable (falls within the 
-            27/32 – 42/32 of the estimated IBI).
-
-            Parameters
-            ---------------------
-            corrected_ibi: int
-                The corrected IBI value.
-            prev_ibis: array_like
-                A list of prev_n number of previous IBIs.
-            
-            Returns
-            ---------------------
-            bool
-                True if the corrected IBI is within the acceptable range, False 
-                otherwise.
-            '''
-            # Calculate the estimated IBI
-            estimated_ibi = estimate_ibi(prev_ibis)
-            
-            # Set the acceptable/valid range of IBIs
-            low = short_threshold * estimated_ibi
-            high = long_threshold * estimated_ibi
-
-            # If the corrected value is within the range, return True
-            if corrected_ibi >= low and corrected_ibi <= high:
-            #if corrected_ibi <= high:
-                return True
-            else:
-                return False
-
-        def accept_ibi(n: int, correction_failed_flag: int = 0):
-            '''
-            Accept the current IBI without correction.
-
-            Parameters
-            ---------------------
-            n : int
-                The index of the current IBI.
-            correction_failed_flag : int, optional
-                Flag to indicate whether the correction failed for the 
-                current IBI; by default, 0. If the flag is 1, the correction 
-                failed for the current IBI.
-            '''
-            global prev_ibis_fifo, cnt, correction_failed
-            global corrected_ibis, corrected_beats, corrected_flags
-            global prev_ibi, prev_beat, prev_flag, current_ibi, current_beat, current_flag
-            
-            # Check if the previous IBI is within the limits before accepting the current IBI
-            check_limits(n)
-
-            # Fix the previous IBI
-            corrected_ibis.append(prev_ibi)
-            corrected_beats.append(prev_beat)
-            corrected_flags.append(prev_flag)
-
-            # Add the previous IBI to the queue
-            prev_ibis_fifo.push(prev_ibi)
-
-            # Update the previous IBI to the current IBI
-            prev_ibi = current_ibi
-            prev_beat = current_beat
-            prev_flag = current_flag
-            
-            # Decrement the counter
-            cnt = max(0, cnt-1)
-            if DEBUGGING:
-                print('accepted:', current_ibi, ' flag:', current_flag, ' based on ', prev_ibis_fifo.get_queue()[1:])
-            # If the correction failed for the current IBI, push 1 to the correction_failed FIFO, otherwise push 0
-            if correction_failed_flag == 0:
-                correction_failed.push(0)
-            else:
-                correction_failed.push(1)
-        
-        def add_prev_and_current(n: int):
-            '''
-            Add the previous and current IBIs if the sum is less than 42/32 of the estimated IBI.
-
-            Parameters
-            ---------------------
-            n : int
-                The index of the current IBI.
-            '''
-            global prev_ibis_fifo, cnt
-            global corrected_ibis, corrected_beats, corrected_flags
-            global prev_ibi, prev_beat, prev_flag, current_ibi, current_beat, current_flag, correction_flags
-            
-            # Add the previous and current IBIs
-            corrected_ibi = prev_ibi + current_ibi
-
-            # Check if the corrected IBI is acceptable
-            if acceptance_check(corrected_ibi, prev_ibis_fifo.get_queue()[1:]):
-                # Update the current IBI to the corrected IBI
-                current_ibi = corrected_ibi
-                current_beat = current_beat
-                current_flag = return_flag(current_ibi, prev_ibis_fifo.get_queue()[1:])
-                
-                if n == 1:
-                    # Update the previous IBI to the current IBI
-                    prev_ibi = current_ibi
-                    prev_beat = current_beat
-                    prev_flag = current_flag
-
-                else:
-                    # Pull up the second previous IBI as previous IBI
-                    prev_ibi = corrected_ibis[-1]
-                    prev_beat = corrected_beats[-1]
-                    prev_flag = corrected_flags[-1]
-                    
-                    # Check if the previous IBI is within the limits before accepting the current IBI
-                    check_limits(n)
-                    
-                    # Check_limits function may update the previous IBI pulled, so update the value
-                    corrected_ibis[-1] = prev_ibi
-                    corrected_beats[-1] = prev_beat
-                    corrected_flags[-1] = prev_flag
-
-                    # Update the last IBI value in the queue
-                    prev_ibis_fifo.change_last(prev_ibi)
-
-                    # Update the previous IBI to the current IBI
-                    prev_ibi = current_ibi
-                    prev_beat = current_beat
-                    prev_flag = current_flag
-
-                # Flag that previous and current IBIs are corrected
-                correction_flags[n-1] = 1
-                correction_flags[n] = 1
-
-                # Increment the counter
-                cnt += 1
-
-                if DEBUGGING:
-                    print('added:', current_ibi, ' flag:', current_flag, ' based on ', prev_ibis_fifo.get_queue()[1:])
-            else:
-                if DEBUGGING:
-                    print('acceptance check failed for adding: ', corrected_ibi)
-                # If the corrected IBI is not acceptable, accept the current IBI
-                accept_ibi(n, correction_failed_flag=1)
-        
-        def add_secondprev_and_prev(n: int):
-            '''
-            Add the second previous and previous IBIs if the sum is less than 42/32 of the estimated IBI.
-
-            Parameters
-            ---------------------
-            n : int
-                The index of the current IBI.
-            '''
-            global prev_ibis_fifo, cnt
-            global corrected_ibis, corrected_beats, corrected_flags
-            global prev_ibi, prev_beat, prev_flag, current_ibi, current_beat, current_flag, correction_flags
-            
-            # Add the previous and current IBIs
-            corrected_ibi = corrected_ibis[-1] + prev_ibi
-
-            # Check if the corrected IBI is acceptable
-            # Use IBIs before the second previous IBI
-            if acceptance_check(corrected_ibi, prev_ibis_fifo.get_queue()[:-2]):
-                # Update the current IBI to the corrected IBI
-                
-                # Pull up the second previous IBI as previous IBI
-                prev_ibi = corrected_ibi
-                prev_beat = prev_beat
-                prev_flag = return_flag(prev_ibi, prev_ibis_fifo.get_queue()[:-2])
-                
-                # Check if the previous IBI is within the limits before accepting the current IBI
-                check_limits(n)
-                
-                # Update the value
-                corrected_ibis[-1] = prev_ibi
-                corrected_beats[-1] = prev_beat
-                corrected_flags[-1] = prev_flag
-
-                # Update the last IBI value in the queue
-                prev_ibis_fifo.change_last(prev_ibi)
-
-                # Update the previous IBI to the current IBI
-                prev_ibi = current_ibi
-                prev_beat = current_beat
-                prev_flag = current_flag
-
-                # Flag that previous and current IBIs are corrected
-                correction_flags[n-2] = 1
-                correction_flags[n-1] = 1
-
-                # Increment the counter
-                cnt += 1
-
-                if DEBUGGING:
-                    print('added second prev + prev:', prev_ibi, ' flag:', prev_flag, ' based on ', prev_ibis_fifo.get_queue()[:-2])
-            else:
-                if DEBUGGING:
-                    print('acceptance check failed for adding second prev + prev: ', corrected_ibi)
-                # If the corrected IBI is not acceptable, accept the current IBI
-                accept_ibi(n, correction_failed_flag=1)
-                
-        def insert_interval(n: int):
-            '''
-            Split the (previous IBI + current IBI) into multiple intervals. 
-            The number of splits is determined based on the initial_hr parameter.
-            
-            Parameters
-            ---------------------
-            n : int
-                The index of the current IBI.
-            '''
-            global prev_ibis_fifo, cnt, first_ibi
-            global corrected_ibis, corrected_beats, corrected_flags
-            global prev_ibi, prev_beat, prev_flag, current_ibi, current_beat, current_flag, correction_flags
-
-            ## DELETE THIS LATER
-            global n_insert
-            
-            # Calculate the number of splits
-            n_split = round((prev_ibi + current_ibi) / estimate_ibi(prev_ibis_fifo.get_queue()[1:]), 0).astype(int)
-
-            # Calculate the new IBI
-            ibi = floor((prev_ibi + current_ibi) / n_split)
-
-            # Check if the corrected IBI is acceptable
-            if acceptance_check(ibi, prev_ibis_fifo.get_queue()[1:]):
-                # Fix inserted IBIs other than previous/current IBIs
-                for i in range(n_split - 2):
-                    corrected_ibis.append(ibi)
-                    corrected_flags.append(return_flag(ibi, prev_ibis_fifo.get_queue()[1:]))
-                    if n == 1 and i == 0:
-                        corrected_beats.append(beats_ix[0] + ibi)
-                    else:
-                        corrected_beats.append(corrected_beats[-1] + ibi)
-                    # Add to the queue
-                    prev_ibis_fifo.push(ibi)
-
-                # Update the previous IBI
-                prev_ibi = ibi
-                prev_beat = corrected_beats[-1] + ibi
-                prev_flag = return_flag(ibi, prev_ibis_fifo.get_queue()[:-1])
-
-                # Update the current IBI
-                current_ibi = current_beat - prev_beat
-                current_flag = return_flag(ibi, prev_ibis_fifo.get_queue()[1:])
-
-                # Check if the previous IBI is within the limits
-                check_limits(n)
-
-                # Fix the previous IBI
-                corrected_ibis.append(prev_ibi)
-                corrected_beats.append(prev_beat)
-                corrected_flags.append(prev_flag)
-
-                # Add to the queue
-                prev_ibis_fifo.push(prev_ibi)
-                
-                # Update the previous IBI to the current IBI
-                prev_ibi = current_ibi
-                prev_beat = current_beat
-                prev_flag = current_flag
-
-                # Flag that previous and current IBIs are corrected
-                correction_flags[n-1] = 1
-                correction_flags[n] = 1
-
-                # Increment the counter by n_split - 1 in this case
-                cnt += n_split - 1
-
-                ## DELETE THIS LATER
-                n_insert += n_split - 2
-
-                if DEBUGGING:
-                    print('inserted ',n_split - 2, ' intervals: ', ibi, ' flag:', current_flag, ' based on ', prev_ibis_fifo.get_queue()[1:])
-            else:
-                if DEBUGGING:
-                    print('acceptance check failed for inserting: ', ibi)
-                # If the corrected IBI is not acceptable, accept the current IBI
-                accept_ibi(n, correction_failed_flag=1)
-
-        def average_prev_and_current(n: int):
-            '''
-            Average the previous and current IBIs.
-
-            Parameters
-            ---------------------
-            n : int
-                The index of the current IBI.
-            '''
-            global prev_ibis_fifo, cnt
-            global corrected_ibis, corrected_beats, corrected_flags
-            global prev_ibi, prev_beat, prev_flag, current_ibi, current_beat, current_flag, correction_flags
-            
-            # Average the previous and current IBIs
-            ibi = floor((prev_ibi + current_ibi) / 2)
-            
-            # Check if the corrected IBI is acceptable
-            if acceptance_check(ibi, prev_ibis_fifo.get_queue()[1:]):
-                # Update the previous and current IBI
-                prev_ibi = ibi
-                if n == 1:
-                    prev_beat = beats_ix[0] + ibi
-                else:
-                    prev_beat = corrected_beats[-1] + ibi
-                prev_flag = return_flag(ibi, prev_ibis_fifo.get_queue()[:-1])
-                current_ibi = current_beat - prev_beat
-                current_flag = return_flag(ibi, prev_ibis_fifo.get_queue()[1:])
-
-                # Check if the previous IBI is within the limits
-                check_limits(n)
-
-                # Fix the previous IBI
-                corrected_ibis.append(prev_ibi)
-                corrected_beats.append(prev_beat)
-                corrected_flags.append(prev_flag)
-
-                # Add to the queue
-                prev_ibis_fifo.push(prev_ibi)
-
-                # Update the previous IBI to the current IBI
-                prev_ibi = current_ibi
-                prev_beat = current_beat
-                prev_flag = current_flag
-                
-                # Flag that previous and current IBIs are corrected
-                correction_flags[n-1] = 1
-                correction_flags[n] = 1
-
-                # Increment the counter
-                cnt += 1
-
-                if DEBUGGING:
-                    print('averaged:', ibi, ' flag:', current_flag, ' based on ', prev_ibis_fifo.get_queue()[1:])
-            else:
-                if DEBUGGING:
-                    print('acceptance check failed for averaging: ', ibi)
-                accept_ibi(n, correction_failed_flag=1)
-
-        def check_limits(n: int):
-            '''
-            Check if the previous IBI (n-1) is within the limits.
-            If it is longer the maximum IBI, shorten the previous IBI and lengthen the current IBI.
-            If it is shorter than the minimum IBI, lengthen the previous IBI and shorten the current IBI.
-
-            Parameters
-            ---------------------
-            n : int
-                The index of the current IBI.
-            '''
-            global prev_ibis_fifo, cnt
-            global corrected_ibis, corrected_beats, corrected_flags
-            global prev_ibi, prev_beat, prev_flag, current_ibi, current_beat, current_flag, correction_flags
-            MIN_IBI = floor(self.fs * 60 / MAX_BPM)         # minimum IBI in indices
-            MAX_IBI = floor(self.fs * 60 / MIN_BPM)         # maximum IBI in indices
-
-            # If the previous IBI is shorter than the minimum IBI, lengthen the previous IBI and shorten the current IBI
-            if prev_ibi < MIN_IBI:
-                remainder = MIN_IBI - prev_ibi
-                prev_beat = prev_beat + remainder
-                prev_ibi = MIN_IBI
-                prev_flag = return_flag(prev_ibi, prev_ibis_fifo.get_queue()[:-1])
-                current_ibi = current_ibi - remainder
-                current_flag = return_flag(current_ibi, prev_ibis_fifo.get_queue()[1:])
-
-                # Flag that previous and current IBIs are corrected
-                correction_flags[n-1] = 1
-                correction_flags[n] = 1
-
-                # Increment the counter
-                cnt += 1
-
-                if DEBUGGING:
-                    print('Shorter than the minimum IBI and corrected: ', prev_ibi, ' ', prev_flag, ' | ', current_ibi, ' ', current_flag)
-
-            # If the previous IBI is longer than the maximum IBI, shorten the previous IBI and lengthen the current IBI
-            elif prev_ibi > MAX_IBI:
-                remainder = prev_ibi - MAX_IBI
-                prev_beat = prev_beat - remainder
-                prev_ibi = MAX_IBI
-                prev_flag = return_flag(prev_ibi, prev_ibis_fifo.get_queue()[:-1])
-                current_ibi = current_ibi + remainder
-                current_flag = return_flag(current_ibi, prev_ibis_fifo.get_queue()[1:])
-
-                # Flag that previous and current IBIs are corrected
-                correction_flags[n-1] = 1
-                correction_flags[n] = 1
-
-                # Increment the counter
-                cnt += 1
-
-                if DEBUGGING:
-                    print('Longer than the maximum IBI and corrected: ', prev_ibi, ' ', prev_flag, ' | ', current_ibi, ' ', current_flag)
-            return
-
-        for n in range(len(ibis)):
-            current_ibi = ibis[n]
-            current_beat = beats[n]
-            # If the adaptive threshold is enabled, calculate the thresholds
-                
-            # Accept the first ibi
-            if n == 0:
-                current_flag = return_flag(current_ibi, prev_ibis = prev_ibis_fifo.get_queue())
-                # Update the previous IBI to the current IBI
-                prev_ibi = current_ibi
-                prev_beat = current_beat
-                prev_flag = current_flag
-            
-            # If the counter reaches the maximum count, accept the current IBI
-            elif cnt > MAX_COUNT:
-                current_flag = return_flag(current_ibi, prev_ibis = prev_ibis_fifo.get_queue()[:-1])
-                accept_ibi(n)
-                # decrement by 2 when cnt > MAX_COUNT
-                cnt -= 1
-            
-            else:
-                current_flag = return_flag(current_ibi, prev_ibis = prev_ibis_fifo.get_queue()[:-1])
-                # If the current ibi is correct
-                if DEBUGGING:
-                    print('n:', n)
-                    print('prev:', prev_ibi, ' ', prev_flag, ' | current:', current_ibi, ' ', current_flag)
-                if current_flag == 'Correct':
-                    if prev_flag == 'Correct' or prev_flag == 'Long':
-                        accept_ibi(n)                           # If the previous ibi is correct or long, then accept the current ibi
-                    elif prev_flag == 'Short':
-                        if n == 1:
-                            add_prev_and_current(n) 
-                        else:
-                            if corrected_ibis[-1] > current_ibi:
-                                add_prev_and_current(n)                 # If the previous ibi is short, add previous and current intervals
-                            else:
-                                add_secondprev_and_prev(n)
-                    elif prev_flag == 'Extra Long':
-                        insert_interval(n)                      # If the previous ibi is extra long, split the previous and current intervals
-                # If the current ibi is short
-                elif current_flag == 'Short':
-                    if prev_flag == 'Correct':
-                        accept_ibi(n)                           # If the previous ibi is correct, accept previous
-                    elif prev_flag == 'Short':
-                        add_prev_and_current(n)                 # If the previous ibi is short, add previous and current intervals
-                    elif prev_flag == 'Long' or prev_flag == 'Extra Long':
-                        average_prev_and_current(n)             # If the previous ibi is long or extra long, average the previous and current intervals
-                # If the current ibi is long
-                elif current_flag == 'Long':
-                    if prev_flag == 'Correct' or prev_flag == 'Long':
-                        accept_ibi(n)                           # If the previous ibi is correct or long, accept previous
-                    elif prev_flag == 'Short':
-                        average_prev_and_current(n)             # If the previous ibi is short, average previous and current intervals
-                    elif prev_flag == 'Extra Long':
-                        insert_interval(n)                      # If the previous ibi is extra long, split the previous and current intervals
-                # If the current ibi is extra long
-                elif current_flag == 'Extra Long':
-                    if prev_flag == 'Correct' or prev_flag == 'Long' or prev_flag == 'Extra Long':
-                        insert_interval(n)                      # If the previous ibi is correct, long, or extra long, split the previous and current intervals
-                    elif prev_flag == 'Short':
-                        average_prev_and_current(n)             # If the previous ibi is short, average previous and current intervals
-
-            # If more than 3 corrections are made in the last prev_n IBIs, reset the FIFO
-            if sum(correction_failed.get_queue()) >= 3:
-                prev_ibis_fifo.reset(first_ibi)
-
-        # Add the last beat
-        corrected_ibis.append(current_ibi)
-        corrected_beats.append(current_beat)
-        corrected_flags.append(current_flag)
-
-        correction_flags = np.array(correction_flags).astype(int)
-
-        # Convert the IBIs to milliseconds
-        original_ibis_ms = np.round((np.array(ibis) / self.fs) * 1000, 2)
-        
-        # Add the first beat and create a dataframe
-        original = pd.DataFrame(
-            {'Original IBI (ms)': np.insert(original_ibis_ms, 0, np.nan),
-            'Original IBI (index)': np.insert(ibis.astype(object), 0, np.nan),
-            'Original Beat': np.insert(beats, 0, beats_ix[0]),
-            'Correction': np.insert(correction_flags, 0, 0)}
-        )
-        
-        corrected_ibis_ms = np.round((np.array(corrected_ibis) / self.fs) * 1000, 2)
-
-        corrected_ibis = np.array(corrected_ibis).astype(object)
-        corrected_flags = np.array(corrected_flags).astype(object)
-
-        # Add the first beat and create a dataframe
-        corrected = pd.DataFrame(
-            {'Corrected IBI (ms)': np.insert(corrected_ibis_ms, 0, np.nan),
-            'Corrected IBI (index)': np.insert(corrected_ibis, 0, np.nan), 
-            'Corrected Beat': np.insert(corrected_beats, 0, beats_ix[0]),
-            'Flag': np.insert(corrected_flags, 0, np.nan)}
-        )
-
+        corrections = self._correct_beats(
+            beats_ix, initial_hr, prev_n, min_bpm, max_bpm,
+            hr_estimate_window)
+        original, corrected = _correction_frames(
+            self.fs, *corrections, first_beat = beats_ix[0])
         return original, corrected
     
     def get_corrected(
@@ -1334,8 +684,9 @@ class Cardio:
         prev_n: int = 6, 
         min_bpm: int = 40, 
         max_bpm: int = 200, 
-        hr_estimate_window: int = 6
-    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        hr_estimate_window: int = 6,
+        summary_only: bool = False
+    ) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], pd.DataFrame]:
         """
         Get the corrected interbeat intervals (IBIs) and beat indices.
     
@@ -1356,70 +707,68 @@ class Cardio:
             The maximum possible heart rate in beats per minute (bpm); by default, 200.
         hr_estimate_window : int, optional
             The window size for estimating the heart rate if initial_hr = 'auto'; by default, 6.
+        summary_only : bool, optional
+            Whether to skip building the `original` and `corrected`
+            DataFrames, which are then returned as None; by default, False.
     
         Returns
         -------
         original : pd.DataFrame
             A DataFrame containing the original IBIs, their indices, and any applied corrections.
+            None if `summary_only` is True.
         corrected : pd.DataFrame
             A DataFrame containing the corrected IBIs, their indices, and correction flags.
+            None if `summary_only` is True.
         summary : pd.DataFrame
             A DataFrame summarizing the number and percentage of corrected beats per segment, 
             as well as the count of different types of corrections (Correct, Short, Long, Extra Long).
         """
         # Get the corrected IBIs and beat indices
-        original, corrected = self.correct_interval(
-            beats_ix = beats_ix, 
-            initial_hr = initial_hr, 
-            prev_n = prev_n, 
-            min_bpm = min_bpm, 
-            max_bpm = max_bpm, 
-            hr_estimate_window = hr_estimate_window)
-    
+        beats_ix = np.asarray(beats_ix)
+        corrections = self._correct_beats(
+            beats_ix, initial_hr, prev_n, min_bpm, max_bpm,
+            hr_estimate_window)
+        _, beats, correction_flags, _, corrected_beats, corrected_flags = \
+            corrections
+
         # Get the segment number for each beat
-        for row in original.iterrows():
-            seg = ceil(row[1].loc['Original Beat'] / (seg_size * self.fs))
-            original.loc[row[0], 'Segment'] = seg
-        for row in corrected.iterrows():
-            seg = ceil(row[1].loc['Corrected Beat'] / (seg_size * self.fs))
-            corrected.loc[row[0], 'Segment'] = seg
-        original['Segment'] = original['Segment'].astype(pd.Int64Dtype())
-        corrected['Segment'] = corrected['Segment'].astype(pd.Int64Dtype())
-        
-        # Get the number and percentage of corrected beats in each segment
-        original_seg = original.groupby('Segment')['Correction'].sum().astype(pd.Int64Dtype())
-        original_seg = pd.DataFrame(original_seg.reset_index(name = '# Corrected'))
-        original_seg_nbeats = original.groupby('Segment')['Correction'].count().astype(pd.Int64Dtype())
-        original_seg_nbeats = pd.DataFrame(original_seg_nbeats.reset_index(name = '# Beats'))
-        original_seg = original_seg.merge(original_seg_nbeats, on = 'Segment')
-        original_seg['% Corrected'] = round((original_seg['# Corrected'] / original_seg['# Beats']) * 100, 2)
-        original_seg.drop('# Beats', axis = 1, inplace = True)
-    
-        # Get the number of each flag (Correct/Short/Long/Extra Long) in each segment
-        corrected_seg = corrected.groupby('Segment')['Flag'].value_counts().astype(pd.Int64Dtype())
-        corrected_seg = pd.DataFrame(corrected_seg.reset_index(name = 'Count'))
-        corrected_seg = corrected_seg.pivot(index = 'Segment', columns = 'Flag', values = 'Count').reset_index().fillna(0)
-        corrected_seg.columns.name = None
-        corrected_seg = corrected_seg.rename_axis(None, axis = 1)
-    
-        combined = pd.merge(corrected_seg, original_seg, on = 'Segment')
-    
+        seg_len = seg_size * self.fs
+        original_beats = np.insert(beats, 0, beats_ix[0])
+        corrected_beats = np.insert(corrected_beats, 0, beats_ix[0])
+        original_segments = -(-original_beats // seg_len)
+        corrected_segments = -(-corrected_beats // seg_len)
+
+        combined = self._get_correction_summary(
+            original_segments, np.insert(correction_flags, 0, 0),
+            corrected_segments[1:], corrected_flags)
+        if summary_only:
+            return None, None, combined
+
+        original, corrected = _correction_frames(
+            self.fs, *corrections, first_beat = beats_ix[0])
+        original['Segment'] = pd.array(
+            original_segments, dtype = pd.Int64Dtype())
+        corrected['Segment'] = pd.array(
+            corrected_segments, dtype = pd.Int64Dtype())
         return original, corrected, combined
 
     def get_seconds(
         self, 
-        data: pd.DataFrame, 
+        data: Union[pd.DataFrame, Recording], 
         beats_ix: Union[np.ndarray, list], 
         ts_col: Optional[str] = None, 
-        show_progress: bool = True
-    ) -> pd.DataFrame:
+        show_progress: bool = True,
+        return_arrays: bool = False,
+        time_axis: Optional[TimeAxis] = None
+    ) -> Union[pd.DataFrame, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
         """Get second-by-second HR, IBI, and beat counts from ECG or PPG data
         according to the approach by Graham (1978).
 
         Parameters
         ----------
-        data : pd.DataFrame
-            The DataFrame containing the pre-processed ECG or PPG data.
+        data : pd.DataFrame, Store.Recording
+            The DataFrame or recording containing the pre-processed ECG or
+            PPG data.
         beats_ix : array-like
             An array containing the indices of detected beats.
         ts_col : str, optional
@@ -1427,78 +776,59 @@ class Cardio:
             If a string value is given, the output will contain a timestamps
             column.
         show_progress : bool, optional
-            Whether to display a progress bar while the function runs; by
-            default, True.
+            Retained for backward compatibility; the per-second values are
+            now computed in a single vectorized pass, so no progress bar is
+            displayed.
+        return_arrays : bool, optional
+            Whether to return the per-second values as NumPy arrays instead
+            of a DataFrame; by default, False.
+        time_axis : Store.TimeAxis, optional
+            A time axis from which the output timestamps are computed
+            instead of from the `ts_col` column; by default, None. If `data`
+            is a `Store.Recording` and `ts_col` is given, the recording's
+            time axis is used.
 
         Returns
         -------
         interval_data : pd.DataFrame
-            A DataFrame containing second-by-second HR and IBI values.
+            A DataFrame containing second-by-second HR and IBI values. If
+            `return_arrays` is True, a tuple of NumPy arrays containing the
+            mean HR, mean IBI, and number of beats per second is returned
+            instead.
 
         Notes
         -----
         Rows with `NaN` values in the resulting DataFrame `interval_data`
         denote seconds during which no beats in the data were detected.
 
+        The mean IBI of each second is derived from the beats detected in
+        the previous and current seconds. Only the sorted beat indices are
+        used in the computation, so the signal columns of `data` are never
+        copied.
+
         References
         ----------
         Graham, F. K. (1978). Constraints on measuring heart rate and period
         sequentially through real and cardiac time. Psychophysiology, 15(5),
         492–495.
         """
-
-        df = data.copy()
-        temp_beat = '_temp_beat'
-        df.index = df.index.astype(int)
-        df.loc[beats_ix, temp_beat] = 1
-
-        interval_data = []
-
-        # Iterate over each second
-        s = 1
-        for i in tqdm(range(0, len(df), self.fs), disable = not show_progress):
-
-            # Get data at the current second and evaluation window
-            current_sec = df.iloc[i:(i + self.fs)]
-            if i == 0:
-                # Look at current and next second
-                window = df.iloc[:(i + self.fs)]
-            else:
-                # Look at previous, current, and next second
-                window = df.iloc[(i - self.fs):(min(i + self.fs, len(df)))]
-
-            # Get mean IBI and HR values from the detected beats
-            current_beats = current_sec[current_sec[temp_beat] == 1].index.values
-            window_beats = window[window[temp_beat] == 1].index.values
-            ibis = np.diff(window_beats) / self.fs * 1000
-            if len(ibis) == 0:
-                mean_ibi = np.nan
-                mean_hr = np.nan
-            else:
-                mean_ibi = np.mean(ibis)
-                hrs = 60000 / ibis
-                r_hrs = 1 / hrs
-                mean_hr = 1 / np.mean(r_hrs)
-
-            # Append values for the current second
-            if ts_col is not None:
-                interval_data.append({
-                    'Second': s,
-                    'Timestamp': current_sec.iloc[0][ts_col],
-                    'Mean HR': mean_hr,
-                    'Mean IBI': mean_ibi,
-                    'N Beats': len(current_beats)
-                })
-            else:
-                interval_data.append({
-                    'Second': s,
-                    'Mean HR': mean_hr,
-                    'Mean IBI': mean_ibi,
-                    'N Beats': len(current_beats)
-                })
-
-            s += 1
-        interval_data = pd.DataFrame(interval_data)
+        time_axis = self._resolve_time_axis(data, ts_col, time_axis)
+        data = self._as_frame(data)
+        beats = self._get_beat_positions(data, beats_ix)
+        mean_hr, mean_ibi, n_beats = self._get_second_stats(len(data), beats)
+        if return_arrays:
+            return mean_hr, mean_ibi, n_beats
+
+        interval_data = pd.DataFrame({
+            'Second': np.arange(1, len(n_beats) + 1),
+            'Mean HR': mean_hr,
+            'Mean IBI': mean_ibi,
+            'N Beats': n_beats
+        })
+        if ts_col is not None or time_axis is not None:
+            timestamps = self._get_timestamps(
+                data, ts_col, time_axis, np.arange(0, len(data), self.fs))
+            interval_data.insert(1, 'Timestamp', timestamps)
         return interval_data
 
     def plot_missing(
@@ -1708,13 +1038,15 @@ class Cardio:
         seg_size: int = 60, 
         powerline_freq: Literal[50, 60] = 60,
         signal_type: Literal['ECG', 'PPG'] = 'ECG',
-        method: Literal['banded', 'residual', 'both'] = 'residual',
+        method: Literal['banded', 'residual', 'both', 'all'] = 'residual',
         combined_noise: bool = True,
-        norm: bool = True
+        norm: bool = True,
+        rolling_window: Optional[int] = None,
+        rolling_step: int = 15
     ) -> pd.DataFrame:
         """
-        Compute the signal-to-noise ratio of a cardiac signal by segment using
-        power spectral density (PSD).
+        Compute the signal-to-noise ratio of a cardiac signal by segment or
+        moving window using power spectral density (PSD).
         
         Parameters
         ----------
@@ -1722,7 +1054,7 @@ class Cardio:
             The raw, unfiltered cardiac signal.
         filtered : array-like, optional
             The denoised signal after applying a filter. This array must be 
-            given if `method` is set to 'residual'.
+            given if `method` is set to 'residual', 'both', or 'all'.
         seg_size : int, optional
             The size of the segment in seconds; by default, 60.
         powerline_freq : {50, 60}, optional
@@ -1736,7 +1068,7 @@ class Cardio:
             is set to 'banded'.
             - 'ECG' (default): Uses 0.5–40 Hz as the ECG frequency band.
             - 'PPG': Uses 0.5–8 Hz as the PPG frequency band.
-        method : {'banded', 'residual', 'both'}, optional
+        method : {'banded', 'residual', 'both', 'all'}, optional
             The method used to estimate the noise component for SNR calculation.
             - 'banded': Uses PSD values within predefined frequency bands for 
               noise sources.
@@ -1744,20 +1076,31 @@ class Cardio:
               between the original and filtered signals.
             - 'both': Computes both 'banded' and 'residual' SNR and returns 
               their average.
+            - 'all': Computes both 'banded' and 'residual' SNR from the same
+              PSDs and returns them in separate 'Residual SNR' and
+              'Banded SNR' columns.
             By default, 'residual'.
         combined_noise : bool, optional
             If True, compute a single SNR value using the total power from 
             all noise sources. If False, compute separate SNR values for 
             baseline wander, motion artifacts, powerline interference, and 
-            high-frequency noise. By default, True.
+            high-frequency noise, which replace the 'Banded SNR' column if
+            `method` is 'all'. Must be True if `method` is 'both'; not used
+            if `method` is 'residual'. By default, True.
         norm : bool, optional
             Whether to normalize the SNR values; by default, True. Uses 
             min-max normalization.
+        rolling_window : int, optional
+            The size, in seconds, of the sliding window across which to
+            compute the SNR; by default, None.
+        rolling_step : int, optional
+            The step size, in seconds, of the sliding windows; by default, 15.
     
         Returns
         -------
         SNR : pandas.DataFrame
-            A DataFrame containing the SNR value(s) for each segment.
+            A DataFrame containing the SNR value(s) for each segment or
+            moving window.
     
         Notes
         -----
@@ -1774,37 +1117,54 @@ class Cardio:
           This approach captures all noise components, including those that 
           overlap with the signal band, making it more suitable for real-world 
           conditions where noise characteristics may vary.
+
+        If a value is given in the `rolling_window` parameter, the rolling
+        window approach will override the segmented approach, ignoring any
+        `seg_size` value. Windows begin every `rolling_step` seconds and the
+        last windows may be partial, as in `compute_metrics()`. The
+        periodogram of each Welch frame is computed only once, on a frame
+        grid shared by all windows, and each window's PSD averages the
+        frames that lie entirely within it. Windows shorter than a frame
+        have `NaN` SNR values.
         """
         
         # Check inputs
-        if method not in ('banded', 'residual', 'both'):
-            raise ValueError('method must be \'banded\', \'residual\', or '
-                             '\'both\'.')
-        if method in ('residual', 'both') and filtered is None:
+        if method not in ('banded', 'residual', 'both', 'all'):
+            raise ValueError('method must be \'banded\', \'residual\', '
+                             '\'both\', or \'all\'.')
+        if method == 'both' and not combined_noise:
+            raise ValueError('combined_noise must be True when using '
+                             '\'both\' method; use \'all\' method to get '
+                             'the residual SNR and the SNR of each noise '
+                             'source in separate columns.')
+        if method in ('residual', 'both', 'all') and filtered is None:
             raise ValueError('filtered must be an array containing the '
                              'denoised signal.')
         if method == 'banded' and powerline_freq is None:
             raise ValueError('powerline_freq must be given when using '
                              '\'banded\' method.')
     
-        def get_snr_resid(
-            original: Union[np.ndarray, list], 
-            filtered: Union[np.ndarray, list]
-        ) -> float:
-            """Compute the SNR with the residual approach."""
-            freqs, psd_signal = welch(filtered, fs = self.fs, nperseg = 1024)
-            _, psd_noise = welch(original - filtered, fs = self.fs, nperseg = 1024)
-            snr_db = 10 * (np.log10(np.sum(psd_signal) / np.sum(psd_noise)))
-            return snr_db
-    
-        def get_snr_banded(
-            original: Union[np.ndarray, list], 
-            signal_type: Literal['ECG', 'PPG'], 
-            powerline_freq: Literal[50, 60], 
-            combined_noise: bool
-        ) -> float:
-            """Compute the SNR with the banded approach."""
-            
+        original = np.asarray(original, dtype = float)
+        if filtered is not None:
+            filtered = np.asarray(filtered, dtype = float)
+        if rolling_window is not None:
+            n_sec = ceil(len(original) / self.fs)
+            starts = np.arange(0, n_sec, rolling_step) * self.fs
+            ends = np.minimum(starts + rolling_window * self.fs, len(original))
+            nperseg = min(1024, rolling_window * self.fs)
+        else:
+            seg_len = self.fs * seg_size
+            n_seg = len(original) // seg_len
+            nperseg = min(1024, seg_len)
+        freqs = rfftfreq(nperseg, 1 / self.fs)
+
+        # Get the PSDs and frequencies that each SNR is computed from
+        bands = []
+        if method in ('residual', 'both', 'all'):
+            all_freqs = np.ones(len(freqs), dtype = bool)
+            bands += [('filtered', all_freqs), ('residual', all_freqs)]
+        if method in ('banded', 'both', 'all'):
+
             # Define frequency bands
             pl_lower = powerline_freq - 1
             pl_upper = powerline_freq + 1
@@ -1818,70 +1178,469 @@ class Cardio:
                 hf_cutoff = 8             # HF cutoff
             else:
                 raise ValueError('signal_type must be either \'ECG\' or \'PPG\'.')
-                
-            freqs, psd = welch(original, fs = self.fs, nperseg = 1024)
-    
+
             # Get frequencies belonging to signal and noise sources
-            signal_mask = (freqs >= signal_band[0]) & (freqs <= signal_band[1]) 
-            bw_mask = (freqs < 0.5) 
+            signal_mask = (freqs >= signal_band[0]) & (freqs <= signal_band[1])
+            bw_mask = (freqs < 0.5)
             pl_mask = (freqs >= pl_lower) & (freqs <= pl_upper)
-            motion_mask = (freqs >= motion_band[0]) & (freqs <= motion_band[1]) 
-            hf_mask = (freqs > hf_cutoff) 
-    
-            # Compute power in signal and noise bands
-            signal_power = np.sum(psd[signal_mask])
+            motion_mask = (freqs >= motion_band[0]) & (freqs <= motion_band[1])
+            hf_mask = (freqs > hf_cutoff)
             if combined_noise:
-                combined_noise_mask = bw_mask | pl_mask | motion_mask | hf_mask
-                noise_power = np.sum(psd[combined_noise_mask])
-                snr_db = 10 * np.log10(signal_power / max(noise_power, 1e-6))
+                noise_masks = [bw_mask | pl_mask | motion_mask | hf_mask]
             else:
-                bw_power = np.sum(psd[bw_mask])
-                pl_power = np.sum(psd[pl_mask])
-                motion_power = np.sum(psd[motion_mask])
-                hf_power = np.sum(psd[hf_mask])
-                noise_power = [bw_power, pl_power, motion_power, hf_power]
-                snr_db = [10 * np.log10(signal_power / max(p, 1e-6)) for p in noise_power]
-                
-            return snr_db
-            
-        seg_len = self.fs * seg_size
-        n_seg = len(original) // seg_len
-        snr_values = []
-        
-        for i in range(n_seg):
-            if method == 'residual':
-                seg_orig = original[(i * seg_len):((i + 1) * seg_len)]
-                seg_filt = filtered[(i * seg_len):((i + 1) * seg_len)]
-                snr_db = get_snr_resid(seg_orig, seg_filt)
-            elif method == 'banded':
-                segment = original[(i * seg_len):((i + 1) * seg_len)]
-                snr_db = get_snr_banded(
-                    segment, signal_type, powerline_freq, combined_noise)
-            else:
-                seg_orig = original[(i * seg_len):((i + 1) * seg_len)]
-                seg_filt = filtered[(i * seg_len):((i + 1) * seg_len)]
-                snr_resid = get_snr_resid(seg_orig, seg_filt)
-                segment = original[(i * seg_len):((i + 1) * seg_len)]
-                snr_banded = get_snr_banded(
-                    segment, signal_type, powerline_freq, combined_noise)
-                snr_db = np.mean([snr_resid, snr_banded])   
-            snr_values.append(snr_db)
-        
-        if combined_noise:
-            SNR = pd.DataFrame(snr_values, columns = ['SNR'])
+                noise_masks = [bw_mask, pl_mask, motion_mask, hf_mask]
+            bands += [('original', signal_mask)]
+            bands += [('original', mask) for mask in noise_masks]
+
+        # Compute the power in each band
+        if rolling_window is not None:
+            powers = self._get_rolling_band_powers(
+                original, filtered, starts, ends, nperseg, bands)
         else:
-            SNR = pd.DataFrame(snr_values, columns = [
-                'Baseline Wander', 'Powerline Interference',
-                'Motion Artifacts', 'HF Noise'])
+            _, psd = self._get_segment_psds(
+                original, filtered, seg_len, n_seg,
+                list(dict.fromkeys(name for name, _ in bands)),
+                nperseg = nperseg)
+            powers = np.column_stack(
+                [np.sum(psd[name][:, mask], axis = 1) for name, mask in bands])
+
+        with np.errstate(invalid = 'ignore', divide = 'ignore'):
+            if method in ('residual', 'both', 'all'):
+                snr_resid = 10 * np.log10(powers[:, 0] / powers[:, 1])
+                powers = powers[:, 2:]
+            if method in ('banded', 'both', 'all'):
+                signal_power = powers[:, :1]
+                snr_banded = 10 * np.log10(
+                    signal_power / np.maximum(powers[:, 1:], 1e-6))
+
+        noise_columns = ['Baseline Wander', 'Powerline Interference',
+                         'Motion Artifacts', 'HF Noise']
+        if method == 'residual':
+            SNR = pd.DataFrame(snr_resid[:, None], columns = ['SNR'])
+        elif method == 'both':
+            SNR = pd.DataFrame((snr_resid[:, None] + snr_banded) / 2,
+                               columns = ['SNR'])
+        elif method == 'all':
+            SNR = pd.DataFrame(
+                np.column_stack((snr_resid, snr_banded)),
+                columns = ['Residual SNR'] + (
+                    ['Banded SNR'] if combined_noise else noise_columns))
+        elif combined_noise:
+            SNR = pd.DataFrame(snr_banded, columns = ['SNR'])
+        else:
+            SNR = pd.DataFrame(snr_banded, columns = noise_columns)
         if norm:
             snr_min = SNR.min()
             snr_max = SNR.max()
             new_min = 0.01
             new_max = 1.0
             SNR = (SNR - snr_min) / (snr_max - snr_min) * (new_max - new_min) + new_min
-        SNR.insert(0, 'Segment', np.arange(1, n_seg + 1))
+        if rolling_window is not None:
+            SNR.insert(0, 'Moving Window', np.arange(1, len(SNR) + 1))
+        else:
+            SNR.insert(0, 'Segment', np.arange(1, n_seg + 1))
         return SNR
 
+    def _get_segment_psds(
+        self,
+        original: np.ndarray,
+        filtered: Optional[np.ndarray],
+        seg_len: int,
+        n_seg: int,
+        psds: List[str],
+        nperseg: int = 1024,
+        max_elements: int = 2 ** 16
+    ) -> Tuple[np.ndarray, dict]:
+        """Compute the Welch PSDs of consecutive non-overlapping segments,
+        batched over blocks of segments. `psds` may contain 'original',
+        'filtered', and 'residual'."""
+        nperseg = min(nperseg, seg_len)
+        freqs = rfftfreq(nperseg, 1 / self.fs)
+        psd = {name: np.empty((n_seg, len(freqs))) for name in psds}
+
+        block = max(1, max_elements // seg_len)
+        for start in range(0, n_seg, block):
+            stop = min(start + block, n_seg)
+            samples = slice(start * seg_len, stop * seg_len)
+            for name, x in self._get_psd_signals(
+                    original, filtered, samples, psds):
+                _, psd[name][start:stop] = welch(
+                    x.reshape(-1, seg_len), fs = self.fs, nperseg = nperseg,
+                    axis = -1)
+        return freqs, psd
+
+    def _get_rolling_band_powers(
+        self,
+        original: np.ndarray,
+        filtered: Optional[np.ndarray],
+        starts: np.ndarray,
+        ends: np.ndarray,
+        nperseg: int,
+        bands: List[Tuple[str, np.ndarray]],
+        max_elements: int = 2 ** 16
+    ) -> np.ndarray:
+        """Compute the Welch power of the PSDs of 'original', 'filtered', or
+        'residual' signals within each band (a PSD name and frequency
+        mask) for windows of samples from `starts` to `ends`. Each frame's
+        periodogram is reduced to band powers once, and the band powers of
+        the frames in each window are then summed directly, which, unlike
+        differences of cumulative sums, keeps quiet windows precise after
+        loud ones."""
+        step = nperseg - nperseg // 2
+        n_frames = max((len(original) - nperseg) // step + 1, 0)
+        psds = list(dict.fromkeys(name for name, _ in bands))
+
+        # Get the band powers of all frames in blocks of frames, from the
+        # periodograms that `scipy.signal.welch()` would average; the last
+        # row is left empty so that every window bound is a valid index
+        frame_powers = np.zeros((n_frames + 1, len(bands)))
+        block = max(1, max_elements // step)
+        for start in range(0, n_frames, block):
+            stop = min(start + block, n_frames)
+            samples = slice(start * step, (stop - 1) * step + nperseg)
+            for name, x in self._get_psd_signals(
+                    original, filtered, samples, psds):
+                _, _, frames = spectrogram(
+                    x, fs = self.fs, window = 'hann', nperseg = nperseg,
+                    noverlap = nperseg // 2, detrend = 'constant')
+                for b, (band_name, mask) in enumerate(bands):
+                    if band_name == name:
+                        frame_powers[start:stop, b] = mask @ frames
+
+        # Average the frames lying entirely within each window, summing
+        # frames `first` to `last` (exclusive) of each window in one pass
+        first = np.minimum(-(-starts // step), n_frames)
+        last = np.clip((ends - nperseg) // step + 1, first, n_frames)
+        n_window_frames = (last - first)[:, None]
+        bounds = np.column_stack((first, last)).ravel()
+        sums = np.add.reduceat(frame_powers, bounds, axis = 0)[::2]
+        with np.errstate(invalid = 'ignore', divide = 'ignore'):
+            return np.where(n_window_frames > 0, sums / n_window_frames,
+                            np.nan)
+
+    def _get_psd_signals(
+        self,
+        original: np.ndarray,
+        filtered: Optional[np.ndarray],
+        samples: slice,
+        psds: List[str]
+    ) -> List[Tuple[str, np.ndarray]]:
+        """Get the samples of the signal that each PSD in `psds` is
+        computed from."""
+        signals = {'original': original[samples]}
+        if filtered is not None:
+            signals['filtered'] = filtered[samples]
+            if 'residual' in psds:
+                signals['residual'] = signals['original'] \
+                    - signals['filtered']
+        return [(name, signals[name]) for name in psds]
+
+    def _get_rolling_metrics(
+        self,
+        data: pd.DataFrame,
+        beats_ix: Union[np.ndarray, list],
+        artifacts_ix: Union[np.ndarray, list],
+        ts_col: Optional[str],
+        seg_size: int,
+        rolling_window: int,
+        rolling_step: int,
+        time_axis: Optional[TimeAxis] = None
+    ) -> pd.DataFrame:
+        """Compute the numbers of expected, detected, missing, and
+        artifactual beats in each moving window from per-second counts
+        that are computed only once for the whole recording."""
+        beats = self._get_beat_positions(data, beats_ix)
+        artifacts = self._get_beat_positions(data, artifacts_ix)
+        mean_hr, _, n_beats = self._get_second_stats(len(data), beats)
+        n_sec = len(n_beats)
+        n_artifacts = np.bincount(artifacts // self.fs, minlength = n_sec)
+
+        # Sum beats and artifacts over each window with cumulative sums
+        starts = np.arange(0, n_sec, rolling_step)
+        ends = np.minimum(starts + rolling_window, n_sec)
+        beat_cumsum = np.concatenate(([0], np.cumsum(n_beats)))
+        artifact_cumsum = np.concatenate(([0], np.cumsum(n_artifacts)))
+        n_detected = beat_cumsum[ends] - beat_cumsum[starts]
+        n_artifact = artifact_cumsum[ends] - artifact_cumsum[starts]
+
+        # Get the expected number of beats from a sliding median of HR
+        raw_expected = self._rolling_window_median(
+            mean_hr, starts, rolling_window, seg_size + 1)
+        n_expected = raw_expected * (seg_size / 60)
+        with np.errstate(invalid = 'ignore', divide = 'ignore'):
+            n_missing = np.where(
+                n_expected > n_detected, n_expected - n_detected, 0)
+            perc_missing = (n_missing / n_expected) * 100
+            perc_artifact = (n_artifact / n_detected) * 100
+
+        metrics = pd.DataFrame({'Moving Window': np.arange(1, len(starts) + 1)})
+        if ts_col is not None or time_axis is not None:
+            metrics['Timestamp'] = self._get_timestamps(
+                data, ts_col, time_axis, starts * self.fs)
+        metrics['N Expected'] = pd.Series(n_expected).astype(int)
+        metrics['N Detected'] = n_detected.astype(int)
+        metrics['N Missing'] = pd.Series(n_missing).astype(int)
+        metrics['% Missing'] = np.round(perc_missing, 2)
+        metrics['N Artifact'] = n_artifact.astype(int)
+        metrics['% Artifact'] = np.round(perc_artifact, 2)
+        return metrics
+
+    def _rolling_window_median(
+        self,
+        values: np.ndarray,
+        starts: np.ndarray,
+        window_len: int,
+        median_len: int,
+        max_elements: int = 2 ** 22
+    ) -> np.ndarray:
+        """Compute, for each window of `values` beginning at `starts`, the
+        median of a centered rolling median (of `median_len` values) that is
+        truncated at the window bounds. NaN values are ignored."""
+        left = median_len // 2
+        right = (median_len - 1) // 2
+        n = len(values)
+        padded = np.concatenate((
+            np.full(left, np.nan), values.astype(float),
+            np.full(window_len + right, np.nan)))
+        frames = sliding_window_view(padded, window_len + left + right)
+        offsets = np.arange(window_len)
+
+        medians = np.empty(len(starts))
+        chunk = max(1, max_elements // (window_len * median_len))
+        for c in range(0, len(starts), chunk):
+            s = starts[c:(c + chunk)]
+            block = frames[s].copy()
+
+            # Exclude values lying outside of each window
+            block[:, :left] = np.nan
+            block[:, (left + window_len):] = np.nan
+            outside = offsets[None, :] >= (n - s)[:, None]
+            block[:, left:(left + window_len)][outside] = np.nan
+
+            rolling = sliding_window_view(block, median_len, axis = 1)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', category = RuntimeWarning)
+                rolling_median = np.nanmedian(rolling, axis = 2)
+                rolling_median[outside] = np.nan
+                medians[c:(c + chunk)] = np.nanmedian(rolling_median, axis = 1)
+        return medians
+
+    def _as_frame(
+        self,
+        data: Union[pd.DataFrame, Recording]
+    ) -> pd.DataFrame:
+        """Represent a `Recording` as a DataFrame holding only its sample
+        index, without reading the signal."""
+        if not isinstance(data, Recording):
+            return data
+        return pd.DataFrame(index = pd.RangeIndex(len(data)))
+
+    def _resolve_time_axis(
+        self,
+        data: Union[pd.DataFrame, Recording],
+        ts_col: Optional[str],
+        time_axis: Optional[TimeAxis]
+    ) -> Optional[TimeAxis]:
+        """Get the time axis to compute timestamps from, using the time
+        axis of a `Recording` if timestamps are requested with `ts_col`."""
+        if time_axis is None and ts_col is not None and \
+                isinstance(data, Recording):
+            if data.time_axis is None:
+                raise ValueError('The recording has no start time, so '
+                                 '`ts_col` must be None.')
+            time_axis = data.time_axis
+        return time_axis
+
+    def _get_timestamps(
+        self,
+        data: pd.DataFrame,
+        ts_col: Optional[str],
+        time_axis: Optional[TimeAxis],
+        positions: np.ndarray
+    ) -> pd.Series:
+        """Get the timestamps of the samples at `positions` from the time
+        axis, if given, or else from the `ts_col` column of `data`."""
+        if time_axis is not None:
+            return pd.Series(time_axis.get_timestamps(positions))
+        return data[ts_col].iloc[positions].reset_index(drop = True)
+
+    def _get_beat_positions(
+        self,
+        data: pd.DataFrame,
+        beats_ix: Union[np.ndarray, list]
+    ) -> np.ndarray:
+        """Map beat index labels of `data` to sorted, unique row positions."""
+        beats = np.unique(np.asarray(beats_ix, dtype = np.int64))
+        index = data.index
+        if not isinstance(index, pd.RangeIndex):
+            index = index.astype(int)
+        positions = index.get_indexer(beats)
+        return np.sort(positions[positions >= 0])
+
+    def _get_second_stats(
+        self,
+        n_samples: int,
+        beats: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Compute the mean HR, mean IBI, and number of beats in each second
+        of a recording from its sorted, unique beat positions."""
+        n_sec = ceil(n_samples / self.fs)
+        sec_start = np.arange(n_sec, dtype = np.int64) * self.fs
+        sec_end = np.minimum(sec_start + self.fs, n_samples)
+        win_start = np.maximum(sec_start - self.fs, 0)
+
+        # Locate beats in the current second and its evaluation window
+        # (i.e., the previous and current seconds)
+        cur_lo = np.searchsorted(beats, sec_start, side = 'left')
+        hi = np.searchsorted(beats, sec_end, side = 'left')
+        win_lo = np.searchsorted(beats, win_start, side = 'left')
+        n_beats = hi - cur_lo
+        n_win = hi - win_lo
+
+        # Average the per-beat IBIs of each window; seconds with the same
+        # number of IBIs are gathered into one matrix so that each row is
+        # reduced exactly as `np.mean()` reduces a single window
+        ibis = np.diff(beats) / self.fs * 1000
+        n_ibi = np.maximum(n_win - 1, 0)
+        mean_ibi = np.full(n_sec, np.nan)
+        mean_hr = np.full(n_sec, np.nan)
+        for k in np.unique(n_ibi[n_ibi > 0]):
+            secs = np.flatnonzero(n_ibi == k)
+            window_ibis = ibis[win_lo[secs, None] + np.arange(k)]
+            mean_ibi[secs] = np.mean(window_ibis, axis = 1)
+            r_hrs = 1 / (60000 / window_ibis)
+            mean_hr[secs] = 1 / np.mean(r_hrs, axis = 1)
+        return mean_hr, mean_ibi, n_beats
+
+    def _gather_slices(
+        self,
+        values: np.ndarray,
+        lo_start: np.ndarray,
+        lo_stop: np.ndarray,
+        hi_start: np.ndarray,
+        hi_stop: np.ndarray
+    ) -> np.ndarray:
+        """Gather the concatenation of `values[lo_start:lo_stop]` and
+        `values[hi_start:hi_stop]` for each row into a sorted 2-D array,
+        padded with trailing NaNs. Bounds follow Python slice semantics."""
+        n = len(values)
+
+        def bound(ix):
+            ix = np.where(ix < 0, ix + n, ix)
+            return np.clip(ix, 0, n)
+
+        lo_start, lo_stop = bound(lo_start), bound(lo_stop)
+        hi_start, hi_stop = bound(hi_start), bound(hi_stop)
+        lo_len = np.maximum(lo_stop - lo_start, 0)
+        hi_len = np.maximum(hi_stop - hi_start, 0)
+        width = max(int(np.max(lo_len + hi_len, initial = 0)), 1)
+
+        # Point padding entries to a trailing NaN
+        padded = np.append(np.asarray(values, dtype = float), np.nan)
+        col = np.arange(width)[None, :]
+        ix = np.where(col < lo_len[:, None], lo_start[:, None] + col,
+                      hi_start[:, None] + col - lo_len[:, None])
+        ix = np.where(col < (lo_len + hi_len)[:, None], ix, n)
+        return np.sort(padded[ix], axis = 1)
+
+    def _sorted_percentile(
+        self,
+        values: np.ndarray,
+        q: float
+    ) -> np.ndarray:
+        """Compute a percentile along the rows of a sorted 2-D array padded
+        with trailing NaNs, interpolating as `numpy.percentile` does."""
+        counts = np.sum(~np.isnan(values), axis = 1)
+        virtual = (counts - 1) * q
+        below = np.floor(virtual)
+        gamma = virtual - below
+        below = np.clip(below, 0, None).astype(int)
+        above = np.minimum(below + 1, np.maximum(counts - 1, 0))
+        rows = np.arange(len(values))
+        a = values[rows, below]
+        b = values[rows, above]
+        diff = b - a
+        return np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+
+    def _sorted_median(
+        self,
+        values: np.ndarray
+    ) -> np.ndarray:
+        """Compute the median along the rows of a sorted 2-D array padded
+        with trailing NaNs."""
+        counts = np.sum(~np.isnan(values), axis = 1)
+        rows = np.arange(len(values))
+        upper = values[rows, counts // 2]
+        lower = values[rows, np.maximum(counts // 2 - 1, 0)]
+        return np.where(counts % 2 == 1, upper, (lower + upper) / 2)
+
+    def _correct_beats(
+        self,
+        beats_ix: Union[np.ndarray, list],
+        initial_hr: Union[int, float, Literal['auto']],
+        prev_n: int,
+        min_bpm: int,
+        max_bpm: int,
+        hr_estimate_window: int
+    ) -> Tuple[np.ndarray, np.ndarray, list, list, list, list]:
+        """Run the interval corrector over all beats and return the
+        original IBIs, beats, and correction flags, and the corrected IBIs,
+        beats, and flags (all excluding the first beat)."""
+        ibis = np.diff(beats_ix)
+        beats = beats_ix[1:]        # drop the first beat
+
+        # Set the initial IBI to compare against
+        first_ibi = IntervalCorrector.estimate_first_ibi(
+            ibis, self.fs, initial_hr, hr_estimate_window)
+
+        corrector = IntervalCorrector(
+            self.fs, beats_ix[0], first_ibi, prev_n = prev_n,
+            min_bpm = min_bpm, max_bpm = max_bpm)
+        for ibi, beat in zip(ibis, beats):
+            corrector.update(ibi, beat)
+        corrected_ibis, corrected_beats, corrected_flags = corrector.finalize()
+        return ibis, beats, corrector.correction_flags, corrected_ibis, \
+            corrected_beats, corrected_flags
+
+    def _get_correction_summary(
+        self,
+        original_segments: np.ndarray,
+        correction_flags: Union[np.ndarray, list],
+        corrected_segments: np.ndarray,
+        corrected_flags: list
+    ) -> pd.DataFrame:
+        """Count the corrected beats and the IBI flags in each segment with
+        one `np.bincount()` pass over each."""
+        # Get the number and percentage of corrected beats in each segment
+        segments, seg_ix = np.unique(original_segments, return_inverse = True)
+        n_corrected = np.bincount(
+            seg_ix, weights = correction_flags, minlength = len(segments))
+        n_beats = np.bincount(seg_ix, minlength = len(segments))
+        original_seg = pd.DataFrame({
+            'Segment': pd.array(segments, dtype = pd.Int64Dtype()),
+            '# Corrected': pd.array(
+                n_corrected.astype(int), dtype = pd.Int64Dtype()),
+            '% Corrected': pd.array(np.round(
+                (n_corrected / n_beats) * 100, 2), dtype = pd.Float64Dtype())})
+
+        # Get the number of each flag (Correct/Short/Long/Extra Long) in
+        # each segment
+        flags, flag_ix = np.unique(
+            np.asarray(corrected_flags, dtype = str), return_inverse = True)
+        flag_segments, flag_seg_ix = np.unique(
+            corrected_segments, return_inverse = True)
+        counts = np.bincount(
+            flag_seg_ix * len(flags) + flag_ix,
+            minlength = len(flag_segments) * len(flags))
+        corrected_seg = pd.DataFrame(
+            counts.reshape(len(flag_segments), len(flags)),
+            columns = flags).astype(pd.Int64Dtype())
+        corrected_seg.insert(0, 'Segment', pd.array(
+            flag_segments, dtype = pd.Int64Dtype()))
+
+        combined = pd.merge(corrected_seg, original_seg, on = 'Segment')
+        return combined
+
     def _get_iqr(self, data: Union[np.ndarray, list]) -> float:
         """Compute the interquartile range of a data array."""
         q75, q25 = np.percentile(data, [75, 25])
@@ -1893,4 +1652,725 @@ class Cardio:
         test."""
         iqr = self._get_iqr(data)
         QD = iqr * 0.5
-        return QD
\ No newline at end of file
+        return QD
+# ============================ INTERVAL CORRECTION ===========================
+def _correction_frames(
+    fs: int,
+    ibis: Union[np.ndarray, list],
+    beats: Union[np.ndarray, list],
+    correction_flags: list,
+    corrected_ibis: list,
+    corrected_beats: list,
+    corrected_flags: list,
+    first_beat: Optional[int] = None
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Create the data frames of original and corrected IBIs, beat indices,
+    and flags. If `first_beat` is given, it is added as the first row."""
+    ibis = np.asarray(ibis)
+    correction_flags = np.array(correction_flags).astype(int)
+
+    # Convert the IBIs to milliseconds
+    original_ibis_ms = np.round((ibis / fs) * 1000, 2)
+    corrected_ibis_ms = np.round((np.array(corrected_ibis) / fs) * 1000, 2)
+    original = {
+        'Original IBI (ms)': original_ibis_ms,
+        'Original IBI (index)': ibis.astype(object),
+        'Original Beat': np.asarray(beats, dtype = None if len(beats)
+                                    else int),
+        'Correction': correction_flags}
+    corrected = {
+        'Corrected IBI (ms)': corrected_ibis_ms,
+        'Corrected IBI (index)': np.array(corrected_ibis).astype(object),
+        'Corrected Beat': np.asarray(corrected_beats, dtype = None
+                                     if len(corrected_beats) else int),
+        'Flag': np.array(corrected_flags).astype(object)}
+
+    # Add the first beat
+    if first_beat is not None:
+        first_row = {'Original IBI (ms)': np.nan,
+                     'Original IBI (index)': np.nan,
+                     'Original Beat': first_beat,
+                     'Correction': 0,
+                     'Corrected IBI (ms)': np.nan,
+                     'Corrected IBI (index)': np.nan,
+                     'Corrected Beat': first_beat,
+                     'Flag': np.nan}
+        original = {col: np.insert(values, 0, first_row[col])
+                    for col, values in original.items()}
+        corrected = {col: np.insert(values, 0, first_row[col])
+                     for col, values in corrected.items()}
+    return pd.DataFrame(original), pd.DataFrame(corrected)
+
+class IntervalCorrector:
+    """
+    A self-contained state machine for correcting interbeat intervals
+    (IBIs) based on the approach by Hegarty-Craver et al. (2018).
+
+    All correction state is held on the instance, so separate correctors
+    can safely run concurrently (e.g., in a thread pool).
+
+    Parameters/Attributes
+    ---------------------
+    fs : int
+        The sampling rate of the cardiovascular data.
+    first_beat : int
+        The index of the first detected beat.
+    first_ibi : int, float
+        The IBI, in number of indices, that the first IBIs are validated
+        against.
+    prev_n : int
+        The number of preceding IBIs to validate against; by default, 6.
+    min_bpm : int
+        The minimum possible heart rate in beats per minute (bpm); by
+        default, 40.
+    max_bpm : int
+        The maximum possible heart rate in beats per minute (bpm); by
+        default, 200.
+    """
+
+    __slots__ = ('fs', 'first_beat', 'first_ibi', 'prev_n', 'min_ibi',
+                 'max_ibi', 'n', 'cnt', 'prev_ibi', 'prev_beat', 'prev_flag',
+                 'current_ibi', 'current_beat', 'current_flag',
+                 'corrected_ibis', 'corrected_beats', 'corrected_flags',
+                 'correction_flags', 'prev_ibis', 'correction_failed',
+                 'n_failed')
+
+    MAX_COUNT = 10          # maximum number of consecutive corrections
+    SHORT_THRESHOLD = 24 / 32
+    LONG_THRESHOLD = 44 / 32
+    EXTRA_THRESHOLD = 52 / 32
+
+    def __init__(
+        self,
+        fs: int,
+        first_beat: int,
+        first_ibi: Union[int, float],
+        prev_n: int = 6,
+        min_bpm: int = 40,
+        max_bpm: int = 200
+    ) -> None:
+        """
+        Initialize the IntervalCorrector object.
+
+        Parameters
+        ----------
+        fs : int
+            The sampling rate of the cardiovascular data.
+        first_beat : int
+            The index of the first detected beat.
+        first_ibi : int, float
+            The IBI, in number of indices, that the first IBIs are
+            validated against.
+        prev_n : int, optional
+            The number of preceding IBIs to validate against; by default, 6.
+        min_bpm : int, optional
+            The minimum possible heart rate in beats per minute (bpm); by
+            default, 40.
+        max_bpm : int, optional
+            The maximum possible heart rate in beats per minute (bpm); by
+            default, 200.
+        """
+        self.fs = fs
+        self.first_beat = first_beat
+        self.first_ibi = first_ibi
+        self.prev_n = prev_n
+        self.min_ibi = floor(fs * 60 / max_bpm)     # minimum IBI in indices
+        self.max_ibi = floor(fs * 60 / min_bpm)     # maximum IBI in indices
+
+        self.n = 0              # index of the next IBI
+        self.cnt = 0            # incremented when correcting the IBI and
+                                # decremented when accepting the IBI
+        self.prev_ibi = 0
+        self.prev_beat = 0
+        self.prev_flag = None
+        self.current_ibi = 0
+        self.current_beat = 0
+        self.current_flag = None
+        self.corrected_ibis = []
+        self.corrected_beats = []
+        self.corrected_flags = []
+        self.correction_flags = []
+
+        # Ring buffers of the previous n + 1 IBIs and of whether the
+        # correction failed for the last n IBIs
+        self.prev_ibis = deque([first_ibi, first_ibi])
+        self.correction_failed = deque()
+        self.n_failed = 0
+
+    @staticmethod
+    def estimate_first_ibi(
+        ibis: Union[np.ndarray, list],
+        fs: int,
+        initial_hr: Union[int, float, Literal['auto']] = 'auto',
+        hr_estimate_window: int = 6
+    ) -> Union[int, float]:
+        """
+        Get the initial IBI that the first IBIs are validated against.
+
+        Parameters
+        ----------
+        ibis : array_like
+            An array containing the IBIs, in number of indices.
+        fs : int
+            The sampling rate of the cardiovascular data.
+        initial_hr : int, float, 'auto', optional
+            The heart rate value for the first IBI; by default, 'auto',
+            which uses the mean of the `hr_estimate_window` most stable
+            successive IBIs.
+        hr_estimate_window : int, optional
+            The window size for estimating the heart rate if
+            `initial_hr` is 'auto'; by default, 6.
+
+        Returns
+        -------
+        first_ibi : int, float
+            The initial IBI, in number of indices.
+        """
+        if initial_hr == 'auto':
+            ibis = np.asarray(ibis)
+            successive_diff = np.abs(np.diff(ibis))
+            min_diff_ix = np.convolve(
+                successive_diff, np.ones(hr_estimate_window) /
+                hr_estimate_window, mode = 'valid').argmin()
+            return ibis[min_diff_ix:min_diff_ix + hr_estimate_window].mean()
+        else:
+            return fs * 60 / initial_hr
+
+    def update(
+        self,
+        ibi: int,
+        beat: int
+    ) -> None:
+        """
+        Validate and correct the next IBI.
+
+        Parameters
+        ----------
+        ibi : int
+            The next IBI, in number of indices.
+        beat : int
+            The index of the beat that ends the IBI.
+        """
+        n = self.n
+        self.n += 1
+        self.current_ibi = ibi
+        self.current_beat = beat
+        self.correction_flags.append(0)
+
+        # Accept the first IBI
+        if n == 0:
+            self.current_flag = self._return_flag(ibi, list(self.prev_ibis))
+            self.prev_ibi = ibi
+            self.prev_beat = beat
+            self.prev_flag = self.current_flag
+
+        # If the counter reaches the maximum count, accept the current IBI
+        elif self.cnt > self.MAX_COUNT:
+            self.current_flag = self._return_flag(
+                ibi, list(self.prev_ibis)[:-1])
+            self._accept_ibi(n)
+            self.cnt -= 1
+
+        else:
+            current_flag = self.current_flag = self._return_flag(
+                ibi, list(self.prev_ibis)[:-1])
+            prev_flag = self.prev_flag
+            if current_flag == 'Correct':
+                if prev_flag == 'Correct' or prev_flag == 'Long':
+                    self._accept_ibi(n)
+                elif prev_flag == 'Short':
+                    if n == 1 or self.corrected_ibis[-1] > ibi:
+                        self._add_prev_and_current(n)
+                    else:
+                        self._add_secondprev_and_prev(n)
+                elif prev_flag == 'Extra Long':
+                    self._insert_interval(n)
+            elif current_flag == 'Short':
+                if prev_flag == 'Correct':
+                    self._accept_ibi(n)
+                elif prev_flag == 'Short':
+                    self._add_prev_and_current(n)
+                elif prev_flag == 'Long' or prev_flag == 'Extra Long':
+                    self._average_prev_and_current(n)
+            elif current_flag == 'Long':
+                if prev_flag == 'Correct' or prev_flag == 'Long':
+                    self._accept_ibi(n)
+                elif prev_flag == 'Short':
+                    self._average_prev_and_current(n)
+                elif prev_flag == 'Extra Long':
+                    self._insert_interval(n)
+            elif current_flag == 'Extra Long':
+                if prev_flag == 'Short':
+                    self._average_prev_and_current(n)
+                else:
+                    self._insert_interval(n)
+
+        # If 3 or more corrections failed in the last prev_n IBIs, reset
+        # the queue of previous IBIs
+        if self.n_failed >= 3:
+            self.prev_ibis = deque([self.first_ibi, self.first_ibi])
+
+    def finalize(self) -> Tuple[list, list, list]:
+        """
+        Add the last beat and return the corrected IBIs, beat indices, and
+        flags.
+
+        Returns
+        -------
+        corrected_ibis : list
+            The corrected IBIs, in number of indices.
+        corrected_beats : list
+            The indices of the corrected beats.
+        corrected_flags : list
+            The flag of each corrected IBI: 'Correct', 'Short', 'Long', or
+            'Extra Long'.
+        """
+        self.corrected_ibis.append(self.current_ibi)
+        self.corrected_beats.append(self.current_beat)
+        self.corrected_flags.append(self.current_flag)
+        return self.corrected_ibis, self.corrected_beats, \
+            self.corrected_flags
+
+    # ============================ Queue Helpers =============================
+    def _push_prev_ibi(self, ibi: int) -> None:
+        """Push an IBI to the queue of the previous n + 1 IBIs."""
+        self.prev_ibis.append(ibi)
+        if len(self.prev_ibis) > self.prev_n + 1:
+            self.prev_ibis.popleft()
+
+    def _push_failed(self, failed: int) -> None:
+        """Record whether the correction failed for the current IBI."""
+        self.correction_failed.append(failed)
+        self.n_failed += failed
+        if len(self.correction_failed) > self.prev_n:
+            self.n_failed -= self.correction_failed.popleft()
+
+    # ============================ Validation ================================
+    @staticmethod
+    def _estimate_ibi(prev_ibis: list) -> float:
+        """Estimate the IBI as the median of the previous IBIs."""
+        k = len(prev_ibis)
+        if k == 0:
+            return np.nan
+        prev_ibis = sorted(prev_ibis)
+        mid = k // 2
+        if k % 2 == 1:
+            return prev_ibis[mid]
+        return (prev_ibis[mid - 1] + prev_ibis[mid]) / 2
+
+    def _return_flag(
+        self,
+        ibi: Union[int, float],
+        prev_ibis: list
+    ) -> str:
+        """Flag an IBI as 'Correct' (26/32 – 44/32 of the estimated IBI),
+        'Short', 'Long', or 'Extra Long' (> 52/32 of the estimated IBI)."""
+        estimated_ibi = self._estimate_ibi(prev_ibis)
+        low = self.SHORT_THRESHOLD * estimated_ibi
+        high = self.LONG_THRESHOLD * estimated_ibi
+        extra = self.EXTRA_THRESHOLD * estimated_ibi
+        if low <= ibi <= high:
+            return 'Correct'
+        elif ibi < low:
+            return 'Short'
+        elif ibi > high and ibi < extra:
+            return 'Long'
+        else:
+            return 'Extra Long'
+
+    def _acceptance_check(
+        self,
+        corrected_ibi: Union[int, float],
+        prev_ibis: list
+    ) -> bool:
+        """Check whether a corrected IBI falls within the acceptable range
+        of the estimated IBI."""
+        estimated_ibi = self._estimate_ibi(prev_ibis)
+        low = self.SHORT_THRESHOLD * estimated_ibi
+        high = self.LONG_THRESHOLD * estimated_ibi
+        return corrected_ibi >= low and corrected_ibi <= high
+
+    # ============================ Corrections ===============================
+    def _accept_ibi(
+        self,
+        n: int,
+        correction_failed: int = 0
+    ) -> None:
+        """Accept the current IBI without correction."""
+        # Check if the previous IBI is within the limits
+        self._check_limits(n)
+
+        # Fix the previous IBI and add it to the queue
+        self.corrected_ibis.append(self.prev_ibi)
+        self.corrected_beats.append(self.prev_beat)
+        self.corrected_flags.append(self.prev_flag)
+        self._push_prev_ibi(self.prev_ibi)
+
+        # Update the previous IBI to the current IBI
+        self.prev_ibi = self.current_ibi
+        self.prev_beat = self.current_beat
+        self.prev_flag = self.current_flag
+
+        self.cnt = max(0, self.cnt - 1)
+        self._push_failed(correction_failed)
+
+    def _add_prev_and_current(self, n: int) -> None:
+        """Add the previous and current IBIs if the sum is acceptable."""
+        corrected_ibi = self.prev_ibi + self.current_ibi
+        prev_ibis = list(self.prev_ibis)[1:]
+        if not self._acceptance_check(corrected_ibi, prev_ibis):
+            self._accept_ibi(n, correction_failed = 1)
+            return
+
+        # Update the current IBI to the corrected IBI
+        self.current_ibi = corrected_ibi
+        self.current_flag = self._return_flag(corrected_ibi, prev_ibis)
+        if n > 1:
+            # Pull up the second previous IBI as previous IBI
+            self.prev_ibi = self.corrected_ibis[-1]
+            self.prev_beat = self.corrected_beats[-1]
+            self.prev_flag = self.corrected_flags[-1]
+
+            # The limits check may update the previous IBI pulled
+            self._check_limits(n)
+            self.corrected_ibis[-1] = self.prev_ibi
+            self.corrected_beats[-1] = self.prev_beat
+            self.corrected_flags[-1] = self.prev_flag
+            self.prev_ibis[-1] = self.prev_ibi
+
+        # Update the previous IBI to the current IBI
+        self.prev_ibi = self.current_ibi
+        self.prev_beat = self.current_beat
+        self.prev_flag = self.current_flag
+
+        self.correction_flags[-2] = 1
+        self.correction_flags[-1] = 1
+        self.cnt += 1
+
+    def _add_secondprev_and_prev(self, n: int) -> None:
+        """Add the second previous and previous IBIs if the sum is
+        acceptable."""
+        corrected_ibi = self.corrected_ibis[-1] + self.prev_ibi
+
+        # Use the IBIs before the second previous IBI
+        prev_ibis = list(self.prev_ibis)[:-2]
+        if not self._acceptance_check(corrected_ibi, prev_ibis):
+            self._accept_ibi(n, correction_failed = 1)
+            return
+
+        self.prev_ibi = corrected_ibi
+        self.prev_flag = self._return_flag(corrected_ibi, prev_ibis)
+
+        # Check if the previous IBI is within the limits
+        self._check_limits(n)
+        self.corrected_ibis[-1] = self.prev_ibi
+        self.corrected_beats[-1] = self.prev_beat
+        self.corrected_flags[-1] = self.prev_flag
+        self.prev_ibis[-1] = self.prev_ibi
+
+        # Update the previous IBI to the current IBI
+        self.prev_ibi = self.current_ibi
+        self.prev_beat = self.current_beat
+        self.prev_flag = self.current_flag
+
+        self.correction_flags[-3] = 1
+        self.correction_flags[-2] = 1
+        self.cnt += 1
+
+    def _insert_interval(self, n: int) -> None:
+        """Split the sum of the previous and current IBIs into multiple
+        intervals of the estimated IBI."""
+        total = self.prev_ibi + self.current_ibi
+        prev_ibis = list(self.prev_ibis)[1:]
+        n_split = int(round(total / self._estimate_ibi(prev_ibis)))
+        ibi = floor(total / n_split)
+        if not self._acceptance_check(ibi, prev_ibis):
+            self._accept_ibi(n, correction_failed = 1)
+            return
+
+        # Fix inserted IBIs other than the previous/current IBIs
+        for i in range(n_split - 2):
+            self.corrected_ibis.append(ibi)
+            self.corrected_flags.append(
+                self._return_flag(ibi, list(self.prev_ibis)[1:]))
+            if n == 1 and i == 0:
+                self.corrected_beats.append(self.first_beat + ibi)
+            else:
+                self.corrected_beats.append(self.corrected_beats[-1] + ibi)
+            self._push_prev_ibi(ibi)
+
+        # Update the previous and current IBIs
+        self.prev_ibi = ibi
+        self.prev_beat = self.corrected_beats[-1] + ibi
+        self.prev_flag = self._return_flag(ibi, list(self.prev_ibis)[:-1])
+        self.current_ibi = self.current_beat - self.prev_beat
+        self.current_flag = self._return_flag(ibi, list(self.prev_ibis)[1:])
+        self._fix_prev_ibi(n)
+
+        # Increment the counter by n_split - 1 in this case
+        self.cnt += n_split - 2
+
+    def _average_prev_and_current(self, n: int) -> None:
+        """Average the previous and current IBIs."""
+        ibi = floor((self.prev_ibi + self.current_ibi) / 2)
+        prev_ibis = list(self.prev_ibis)
+        if not self._acceptance_check(ibi, prev_ibis[1:]):
+            self._accept_ibi(n, correction_failed = 1)
+            return
+
+        # Update the previous and current IBIs
+        self.prev_ibi = ibi
+        if n == 1:
+            self.prev_beat = self.first_beat + ibi
+        else:
+            self.prev_beat = self.corrected_beats[-1] + ibi
+        self.prev_flag = self._return_flag(ibi, prev_ibis[:-1])
+        self.current_ibi = self.current_beat - self.prev_beat
+        self.current_flag = self._return_flag(ibi, prev_ibis[1:])
+        self._fix_prev_ibi(n)
+
+    def _fix_prev_ibi(self, n: int) -> None:
+        """Check the limits of a corrected previous IBI, fix it, and make
+        the current IBI the previous IBI."""
+        self._check_limits(n)
+        self.corrected_ibis.append(self.prev_ibi)
+        self.corrected_beats.append(self.prev_beat)
+        self.corrected_flags.append(self.prev_flag)
+        self._push_prev_ibi(self.prev_ibi)
+
+        self.prev_ibi = self.current_ibi
+        self.prev_beat = self.current_beat
+        self.prev_flag = self.current_flag
+
+        self.correction_flags[-2] = 1
+        self.correction_flags[-1] = 1
+        self.cnt += 1
+
+    def _check_limits(self, n: int) -> None:
+        """Lengthen or shorten the previous IBI, and shorten or lengthen
+        the current IBI accordingly, if the previous IBI is outside the
+        minimum and maximum IBIs."""
+        if self.prev_ibi < self.min_ibi:
+            remainder = self.min_ibi - self.prev_ibi
+            self.prev_beat = self.prev_beat + remainder
+            self.prev_ibi = self.min_ibi
+            self.current_ibi = self.current_ibi - remainder
+        elif self.prev_ibi > self.max_ibi:
+            remainder = self.prev_ibi - self.max_ibi
+            self.prev_beat = self.prev_beat - remainder
+            self.prev_ibi = self.max_ibi
+            self.current_ibi = self.current_ibi + remainder
+        else:
+            return
+        prev_ibis = list(self.prev_ibis)
+        self.prev_flag = self._return_flag(self.prev_ibi, prev_ibis[:-1])
+        self.current_flag = self._return_flag(
+            self.current_ibi, prev_ibis[1:])
+        self.correction_flags[-2] = 1
+        self.correction_flags[-1] = 1
+        self.cnt += 1
+
+class OnlineIntervalCorrector:
+    """
+    An online interbeat interval (IBI) corrector that accepts beats as
+    they are detected and emits corrected IBIs with bounded latency, based
+    on the approach by Hegarty-Craver et al. (2018).
+
+    Parameters/Attributes
+    ---------------------
+    fs : int
+        The sampling rate of the cardiovascular data.
+    initial_hr : int, float, 'auto'
+        The heart rate value for the first IBI to be validated against; by
+        default, 'auto', which estimates it from the first `warmup` beats.
+    prev_n : int
+        The number of preceding IBIs to validate against; by default, 6.
+    min_bpm : int
+        The minimum possible heart rate in beats per minute (bpm); by
+        default, 40.
+    max_bpm : int
+        The maximum possible heart rate in beats per minute (bpm); by
+        default, 200.
+    hr_estimate_window : int
+        The window size for estimating the heart rate if `initial_hr` is
+        'auto'; by default, 6.
+    warmup : int
+        The number of beats buffered to estimate the initial IBI if
+        `initial_hr` is 'auto'; by default, 30.
+
+    Notes
+    -----
+    Once the corrector has started, each corrected IBI is emitted after
+    the next beat arrives, and each original IBI with its correction flag
+    is emitted after the next two beats arrive. Concatenating the outputs
+    of all calls to `push()` and `flush()` gives the same data frames as
+    `Cardio.correct_interval()` with a numeric `initial_hr`. With
+    `initial_hr = 'auto'`, the initial IBI is estimated from the first
+    `warmup` beats only, rather than from the whole recording.
+
+    Examples
+    --------
+    >>> from heartview import OnlineIntervalCorrector
+    >>> corrector = OnlineIntervalCorrector(fs = 64, initial_hr = 70)
+    >>> for new_beats in beat_stream:
+    ...     original, corrected = corrector.push(new_beats)
+    >>> original, corrected = corrector.flush()
+    """
+
+    __slots__ = ('fs', 'initial_hr', 'prev_n', 'min_bpm', 'max_bpm',
+                 'hr_estimate_window', 'warmup', '_corrector', '_buffer',
+                 '_last_beat', '_ibis', '_beats', '_first_beat')
+
+    def __init__(
+        self,
+        fs: int,
+        initial_hr: Union[int, float, Literal['auto']] = 'auto',
+        prev_n: int = 6,
+        min_bpm: int = 40,
+        max_bpm: int = 200,
+        hr_estimate_window: int = 6,
+        warmup: int = 30
+    ) -> None:
+        """
+        Initialize the OnlineIntervalCorrector object.
+
+        Parameters
+        ----------
+        fs : int
+            The sampling rate of the cardiovascular data.
+        initial_hr : int, float, 'auto', optional
+            The heart rate value for the first IBI to be validated against;
+            by default, 'auto'.
+        prev_n : int, optional
+            The number of preceding IBIs to validate against; by default, 6.
+        min_bpm : int, optional
+            The minimum possible heart rate in beats per minute (bpm); by
+            default, 40.
+        max_bpm : int, optional
+            The maximum possible heart rate in beats per minute (bpm); by
+            default, 200.
+        hr_estimate_window : int, optional
+            The window size for estimating the heart rate if `initial_hr`
+            is 'auto'; by default, 6.
+        warmup : int, optional
+            The number of beats buffered to estimate the initial IBI if
+            `initial_hr` is 'auto'; by default, 30.
+        """
+        if initial_hr == 'auto' and warmup < hr_estimate_window + 2:
+            raise ValueError('The `warmup` parameter must be at least '
+                             '`hr_estimate_window` + 2 beats.')
+        self.fs = int(fs)
+        self.initial_hr = initial_hr
+        self.prev_n = prev_n
+        self.min_bpm = min_bpm
+        self.max_bpm = max_bpm
+        self.hr_estimate_window = hr_estimate_window
+        self.warmup = warmup
+        self._corrector = None
+        self._buffer = []           # beats buffered before starting
+        self._last_beat = None
+        self._ibis = []             # original IBIs not yet emitted
+        self._beats = []            # original beats not yet emitted
+        self._first_beat = None     # first beat, until it is emitted
+
+    def push(
+        self,
+        beats: Union[int, np.ndarray, list]
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Add one or more newly detected beats and get the IBIs whose
+        correction is final.
+
+        Parameters
+        ----------
+        beats : int, array_like
+            The index of a new beat, or an array containing the indices of
+            new beats, in ascending order.
+
+        Returns
+        -------
+        original : pandas.DataFrame
+            A data frame containing the newly finalized original IBIs
+            (millisecond-based and index-based), beat indices, and
+            correction flags.
+        corrected : pandas.DataFrame
+            A data frame containing the newly finalized corrected IBIs
+            (millisecond-based and index-based), beat indices, and flags.
+        """
+        for beat in np.atleast_1d(np.asarray(beats)):
+            if self._corrector is None:
+                self._buffer.append(beat)
+                if self.initial_hr != 'auto' or \
+                        len(self._buffer) >= self.warmup:
+                    self._start()
+            else:
+                self._update(beat)
+        return self._emit(final = False)
+
+    def flush(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        End the stream and get all remaining IBIs.
+
+        Returns
+        -------
+        original : pandas.DataFrame
+            A data frame containing the remaining original IBIs, beat
+            indices, and correction flags.
+        corrected : pandas.DataFrame
+            A data frame containing the remaining corrected IBIs, beat
+            indices, and flags.
+        """
+        if self._corrector is None:
+            if not self._buffer:
+                return self._emit(final = False)
+            self._start()
+        self._corrector.finalize()
+        return self._emit(final = True)
+
+    def _start(self) -> None:
+        """Estimate the initial IBI and correct the buffered beats."""
+        buffer = np.asarray(self._buffer)
+        first_ibi = IntervalCorrector.estimate_first_ibi(
+            np.diff(buffer), self.fs, self.initial_hr,
+            self.hr_estimate_window)
+        self._corrector = IntervalCorrector(
+            self.fs, buffer[0], first_ibi, prev_n = self.prev_n,
+            min_bpm = self.min_bpm, max_bpm = self.max_bpm)
+        self._first_beat = self._last_beat = buffer[0]
+        self._buffer = []
+        for beat in buffer[1:]:
+            self._update(beat)
+
+    def _update(self, beat: int) -> None:
+        """Correct the IBI ending at a new beat."""
+        ibi = beat - self._last_beat
+        self._last_beat = beat
+        self._ibis.append(ibi)
+        self._beats.append(beat)
+        self._corrector.update(ibi, beat)
+
+    def _emit(self, final: bool) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Remove the finalized IBIs from the corrector and return them."""
+        corrector = self._corrector
+        if corrector is None:
+            return _correction_frames(self.fs, [], [], [], [], [], [])
+
+        # Correction flags may still change for the last two original IBIs
+        # and values may still change for the last corrected IBI
+        n_original = len(self._ibis) if final else max(len(self._ibis) - 2, 0)
+        n_corrected = len(corrector.corrected_ibis) if final \
+            else max(len(corrector.corrected_ibis) - 1, 0)
+        original, corrected = _correction_frames(
+            self.fs, self._ibis[:n_original], self._beats[:n_original],
+            corrector.correction_flags[:n_original],
+            corrector.corrected_ibis[:n_corrected],
+            corrector.corrected_beats[:n_corrected],
+            corrector.corrected_flags[:n_corrected],
+            first_beat = self._first_beat)
+        self._first_beat = None
+        del self._ibis[:n_original], self._beats[:n_original]
+        del corrector.correction_flags[:n_original]
+        del corrector.corrected_ibis[:n_corrected]
+        del corrector.corrected_beats[:n_corrected]
+        del corrector.corrected_flags[:n_corrected]
+        return original, corrected
@@ -0,0 +1,379 @@
+from typing import Iterator, Literal, Optional, Union
+from datetime import datetime
+import json
+import os
+import pandas as pd
+import numpy as np
+
+# =============================== Time Axis ==================================
+class TimeAxis:
+    """
+    A lightweight time axis that derives the timestamps of samples from a
+    start time, the sampling rate, and an optional table of recording
+    gaps, in place of a per-sample timestamp column.
+
+    Parameters/Attributes
+    ---------------------
+    start_time : pandas.Timestamp
+        The timestamp of the first sample.
+    fs : int
+        The sampling rate of the signal.
+    gaps : numpy.ndarray
+        An array of shape `(n_gaps, 2)` in which each row holds the index
+        of the first sample after a gap and the duration, in seconds, of
+        the gap.
+    """
+
+    __slots__ = ('start_time', 'fs', 'gaps')
+
+    def __init__(
+        self,
+        start_time: Union[str, datetime, pd.Timestamp],
+        fs: int,
+        gaps: Optional[Union[np.ndarray, list]] = None
+    ) -> None:
+        """
+        Initialize the TimeAxis object.
+
+        Parameters
+        ----------
+        start_time : str, datetime, pandas.Timestamp
+            The timestamp of the first sample.
+        fs : int
+            The sampling rate of the signal.
+        gaps : array-like, optional
+            An array of shape `(n_gaps, 2)` in which each row holds the
+            index of the first sample after a gap and the duration, in
+            seconds, of the gap; by default, None.
+        """
+        self.start_time = pd.Timestamp(start_time)
+        self.fs = int(fs)
+        gaps = np.asarray(gaps if gaps is not None else [], dtype = float)
+        gaps = gaps.reshape(-1, 2)
+        self.gaps = gaps[np.argsort(gaps[:, 0], kind = 'stable')]
+
+    @classmethod
+    def from_timestamps(
+        cls,
+        timestamps: Union[pd.Series, np.ndarray, list],
+        fs: int,
+        tolerance: float = 0.5
+    ) -> 'TimeAxis':
+        """
+        Create a time axis from a per-sample timestamp column, detecting
+        gaps where successive timestamps are further apart than expected.
+
+        Parameters
+        ----------
+        timestamps : array-like
+            The timestamps of all samples.
+        fs : int
+            The sampling rate of the signal.
+        tolerance : float, optional
+            The fraction of the sampling period by which successive
+            timestamps may exceed it without being considered a gap; by
+            default, 0.5.
+
+        Returns
+        -------
+        time_axis : TimeAxis
+            The time axis of the timestamps.
+        """
+        timestamps = pd.to_datetime(pd.Series(timestamps)).to_numpy(
+            dtype = 'datetime64[ns]')
+        period = 10 ** 9 / fs
+        excess = np.diff(timestamps).astype(np.int64) - period
+        gap_ix = np.flatnonzero(excess > tolerance * period) + 1
+
+        # Measure each gap by how far it shifts the timestamps from the
+        # sample offsets of `get_timestamps()`, so that the rounding of
+        # these offsets does not accumulate into the gaps
+        elapsed = (timestamps[gap_ix] - timestamps[0]).astype(np.int64)
+        shift = elapsed - (gap_ix * 10 ** 9 + int(fs) // 2) // int(fs)
+        durations = np.diff(shift, prepend = 0) / 10 ** 9
+        return cls(timestamps[0], fs, np.column_stack((gap_ix, durations)))
+
+    def get_timestamps(
+        self,
+        positions: Union[np.ndarray, list]
+    ) -> pd.DatetimeIndex:
+        """
+        Get the timestamps of samples.
+
+        Parameters
+        ----------
+        positions : array-like
+            The positions (i.e., integer indices) of the samples.
+
+        Returns
+        -------
+        timestamps : pandas.DatetimeIndex
+            The timestamps of the samples.
+        """
+        positions = np.asarray(positions, dtype = np.int64)
+        offsets = (positions * 10 ** 9 + self.fs // 2) // self.fs
+        if len(self.gaps) > 0:
+            gap_ns = np.concatenate((
+                [0], np.cumsum(np.round(self.gaps[:, 1] * 10 ** 9))))
+            n_before = np.searchsorted(
+                self.gaps[:, 0], positions, side = 'right')
+            offsets = offsets + gap_ns[n_before].astype(np.int64)
+        return self.start_time + pd.to_timedelta(offsets, unit = 'ns')
+
+    def __repr__(self) -> str:
+        return (f'TimeAxis(start_time = {self.start_time}, fs = {self.fs}, '
+                f'n_gaps = {len(self.gaps)})')
+
+# ============================ Recording Store ===============================
+MAGIC = b'HVREC\x00\x01\x00'
+ALIGN = 64
+
+class Recording:
+    """
+    A pre-processed cardiac recording stored in a compact binary file,
+    whose signal and beat index arrays are memory-mapped from disk.
+
+    A `Recording` can be passed in place of a signal array to the
+    `Filters` and `BeatDetectors` methods and in place of a DataFrame of
+    pre-processed data to the `SQA.Cardio` methods. Slicing a `Recording`
+    returns a zero-copy view of its signal.
+
+    Parameters/Attributes
+    ---------------------
+    path : str
+        The path to the recording file.
+    signal : numpy.memmap
+        The memory-mapped float32 signal.
+    fs : int
+        The sampling rate of the signal.
+    start_time : pandas.Timestamp or None
+        The timestamp of the first sample, if any.
+    time_axis : TimeAxis or None
+        The time axis of the signal, if it has a start time.
+    beats_ix : numpy.memmap
+        The memory-mapped indices of detected beats.
+    artifacts_ix : numpy.memmap
+        The memory-mapped indices of artifactual beats.
+
+    See Also
+    --------
+    save_recording :
+        Write a signal, its sampling rate, start time, and beat and
+        artifact indices to a recording file.
+    load_recording :
+        Open a recording file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: Literal['r', 'r+', 'c'] = 'r'
+    ) -> None:
+        """
+        Open a recording file.
+
+        Parameters
+        ----------
+        path : str
+            The path to the recording file.
+        mode : {'r', 'r+', 'c'}, optional
+            The `numpy.memmap` mode in which the arrays are opened: 'r'
+            (read-only), 'r+' (read and write), or 'c' (copy-on-write); by
+            default, 'r'.
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path} is not a heartview recording file.')
+            header_len = int.from_bytes(f.read(4), 'little')
+            header = json.loads(f.read(header_len).decode('utf-8'))
+        self.path = path
+        self.fs = header['fs']
+        start_time = header['start_time']
+        self.start_time = pd.Timestamp(start_time) \
+            if start_time is not None else None
+        self.time_axis = TimeAxis(
+            self.start_time, self.fs, header.get('gaps')) \
+            if start_time is not None else None
+
+        def open_array(name: str) -> np.ndarray:
+            spec = header['arrays'][name]
+            if spec['length'] == 0:
+                return np.empty(0, dtype = spec['dtype'])
+            return np.memmap(path, dtype = spec['dtype'], mode = mode,
+                             offset = spec['offset'],
+                             shape = (spec['length'],))
+
+        self.signal = open_array('signal')
+        self.beats_ix = open_array('beats_ix')
+        self.artifacts_ix = open_array('artifacts_ix')
+
+    def __len__(self) -> int:
+        return len(self.signal)
+
+    def __getitem__(self, key) -> np.ndarray:
+        return self.signal[key]
+
+    def __array__(self, dtype = None, copy = None) -> np.ndarray:
+        if dtype is None or np.dtype(dtype) == self.signal.dtype:
+            return self.signal.view(np.ndarray) if not copy \
+                else np.array(self.signal)
+        return self.signal.astype(dtype)
+
+    def iter_chunks(
+        self,
+        chunk_size: int
+    ) -> Iterator[np.ndarray]:
+        """
+        Iterate over consecutive zero-copy chunks of the signal, e.g., to
+        pass to `Filters.filter_stream()`.
+
+        Parameters
+        ----------
+        chunk_size : int
+            The number of samples in each chunk.
+
+        Yields
+        ------
+        chunk : numpy.memmap
+            The next chunk of the signal.
+        """
+        for start in range(0, len(self.signal), chunk_size):
+            yield self.signal[start:(start + chunk_size)]
+
+    def __repr__(self) -> str:
+        return (f'Recording({self.path!r}, fs = {self.fs}, '
+                f'n_samples = {len(self)}, start_time = {self.start_time}, '
+                f'n_beats = {len(self.beats_ix)}, '
+                f'n_artifacts = {len(self.artifacts_ix)})')
+
+def save_recording(
+    path: str,
+    signal: Union[np.ndarray, list, Recording],
+    fs: int,
+    start_time: Optional[Union[str, datetime, pd.Timestamp]] = None,
+    beats_ix: Optional[Union[np.ndarray, list]] = None,
+    artifacts_ix: Optional[Union[np.ndarray, list]] = None,
+    gaps: Optional[Union[np.ndarray, list]] = None,
+    chunk_size: int = 2 ** 20
+) -> Recording:
+    """
+    Write a pre-processed cardiac signal and its beat and artifact indices
+    to a compact binary recording file.
+
+    Parameters
+    ----------
+    path : str
+        The path to the recording file to create.
+    signal : array-like, Recording
+        The signal, which is stored as float32.
+    fs : int
+        The sampling rate of the signal.
+    start_time : str, datetime, pandas.Timestamp, optional
+        The timestamp of the first sample; by default, None.
+    beats_ix : array-like, optional
+        An array containing the indices of detected beats; by default,
+        None.
+    artifacts_ix : array-like, optional
+        An array containing the indices of artifactual beats; by default,
+        None.
+    gaps : array-like, optional
+        An array of shape `(n_gaps, 2)` in which each row holds the index
+        of the first sample after a recording gap and the duration, in
+        seconds, of the gap; by default, None. See `TimeAxis`.
+    chunk_size : int, optional
+        The number of samples converted and written at a time; by default,
+        2 ** 20.
+
+    Returns
+    -------
+    recording : Recording
+        The recording opened read-only from the new file.
+
+    Notes
+    -----
+    The file begins with an 8-byte magic number and the 4-byte length of
+    a UTF-8 JSON header with the sampling rate, start time, gaps, and the
+    dtype, offset, and length of each array. The float32 signal, int64
+    beat indices, and int64 artifact indices follow at 64-byte aligned
+    offsets, so each can be opened with `numpy.memmap`.
+
+    Examples
+    --------
+    >>> from heartview.Store import save_recording
+    >>> rec = save_recording('P01.hvr', ecg['Filtered'], fs = 1024,
+    ...                      start_time = ecg['Timestamp'].iloc[0],
+    ...                      beats_ix = beats_ix)
+    >>> detector = ECGBeatDetectors(rec.fs)
+    >>> beats_ix = detector.manikandan(rec)
+    """
+    if isinstance(signal, Recording):
+        signal = signal.signal
+    elif not isinstance(signal, np.ndarray):
+        signal = np.asarray(signal)
+    arrays = {
+        'signal': (signal, np.dtype('<f4')),
+        'beats_ix': (np.asarray(beats_ix if beats_ix is not None else [],
+                                dtype = np.int64), np.dtype('<i8')),
+        'artifacts_ix': (np.asarray(artifacts_ix if artifacts_ix is not None
+                                    else [], dtype = np.int64),
+                         np.dtype('<i8'))
+    }
+    if start_time is not None:
+        start_time = pd.Timestamp(start_time).isoformat()
+
+    def align(offset: int) -> int:
+        return -(-offset // ALIGN) * ALIGN
+
+    # Lay out the arrays after a header padded to the alignment
+    header = {'fs': int(fs), 'start_time': start_time, 'arrays': {}}
+    if gaps is not None:
+        header['gaps'] = np.asarray(
+            gaps, dtype = float).reshape(-1, 2).tolist()
+    specs = header['arrays']
+    for name, (values, dtype) in arrays.items():
+        specs[name] = {'dtype': dtype.str, 'offset': 0,
+                       'length': len(values)}
+    header_len = len(json.dumps(header).encode('utf-8')) + 32 * len(arrays)
+    offset = align(len(MAGIC) + 4 + header_len)
+    for name, (values, dtype) in arrays.items():
+        specs[name]['offset'] = offset
+        offset = align(offset + len(values) * dtype.itemsize)
+    header_bytes = json.dumps(header).encode('utf-8')
+    header_bytes += b' ' * (header_len - len(header_bytes))
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(header_len.to_bytes(4, 'little'))
+        f.write(header_bytes)
+        for name, (values, dtype) in arrays.items():
+            f.seek(specs[name]['offset'])
+            for start in range(0, len(values), chunk_size):
+                f.write(np.ascontiguousarray(
+                    values[start:(start + chunk_size)], dtype = dtype))
+        f.truncate(max(offset, f.tell()))
+    return Recording(path)
+
+def load_recording(
+    path: str,
+    mode: Literal['r', 'r+', 'c'] = 'r'
+) -> Recording:
+    """
+    Open a binary recording file without reading its arrays into memory.
+
+    Parameters
+    ----------
+    path : str
+        The path to the recording file.
+    mode : {'r', 'r+', 'c'}, optional
+        The `numpy.memmap` mode in which the arrays are opened: 'r'
+        (read-only), 'r+' (read and write), or 'c' (copy-on-write); by
+        default, 'r'.
+
+    Returns
+    -------
+    recording : Recording
+        The memory-mapped recording.
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f'No recording file found at {path}.')
+    return Recording(path, mode = mode)
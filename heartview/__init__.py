@@ -1,9 +1,15 @@
 from .ECG import Filters as ECGFilters
 from .PPG import Filters as PPGFilters
 from .ECG import BeatDetectors as ECGBeatDetectors
+from .ECG import OnlinePanTompkins
 from .PPG import BeatDetectors as PPGBeatDetectors
+from .PPG import OnlineERMA
 from .SQA import Cardio as cardio_sqa
-from typing import Literal, Union
+from .SQA import OnlineIntervalCorrector
+from .Batch import process_recordings
+from .Store import TimeAxis, load_recording, save_recording
+from ._filtering import clear_filter_cache, filter_cache_info
+from typing import Literal, Optional, Union
 from numpy import ndarray
 
 def filter_ecg(
@@ -12,6 +18,8 @@ def filter_ecg(
     lowcut: float = 1.0, 
     highcut: float = 15.0,
     order: int = 2,
+    axis: int = -1,
+    n_jobs: Optional[int] = None
 ) -> ndarray:
     """
     Remove baseline drift, EMG noise, and powerline interference from an 
@@ -29,6 +37,15 @@ def filter_ecg(
         The upper cutoff frequency of the bandpass filter; by default, 15.0 Hz.
     order : int, optional
         The order of the filter, controlling its sharpness; by default, 2.
+    axis : int, optional
+        The axis of `signal` along which to filter, e.g., -1 for multi-lead
+        ECG data with shape `(n_leads, n_samples)`; by default, -1.
+    n_jobs : int, optional
+        The number of threads across which blocks of leads are filtered; by
+        default, None, which filters the blocks sequentially. If -1, all
+        available CPU cores are used. Each block holds at most 2 ** 20
+        samples unless a single lead is longer (see `max_elements` in
+        `_filtering.filter_channels()`).
 
     Returns
     -------
@@ -39,7 +56,9 @@ def filter_ecg(
         signal = signal, 
         lowcut = lowcut, 
         highcut = highcut, 
-        order = order)
+        order = order,
+        axis = axis,
+        n_jobs = n_jobs)
 
 def filter_ppg(
     signal: Union[ndarray, list], 
@@ -47,7 +66,9 @@ def filter_ppg(
     lowcut: float = 0.5, 
     highcut: float = 10, 
     order: int = 4, 
-    window_len: int = 0.5
+    window_len: int = 0.5,
+    axis: int = -1,
+    n_jobs: Optional[int] = None
 ) -> ndarray:
     """
     Remove baseline drift, EMG noise, and powerline interference from a 
@@ -70,6 +91,16 @@ def filter_ppg(
         produce the desired filtered output; by default, 4.
     window_len : int
         The size of the moving average window, in seconds.
+    axis : int, optional
+        The axis of `signal` along which to filter, e.g., -1 for
+        multi-wavelength PPG data with shape `(n_channels, n_samples)`; by
+        default, -1.
+    n_jobs : int, optional
+        The number of threads across which blocks of channels are filtered;
+        by default, None, which filters the blocks sequentially. If -1, all
+        available CPU cores are used. Each block holds at most 2 ** 20
+        samples unless a single channel is longer (see `max_elements` in
+        `_filtering.filter_channels()`).
 
     Returns
     -------
@@ -81,11 +112,22 @@ def filter_ppg(
         lowcut = lowcut,
         highcut = highcut,
         order = order, 
-        window_len = window_len
+        window_len = window_len,
+        axis = axis,
+        n_jobs = n_jobs
     )
 
 __all__ = ['filter_ecg', 
            'filter_ppg', 
            'ECGBeatDetectors', 
            'PPGBeatDetectors', 
-           'cardio_sqa']
\ No newline at end of file
+           'cardio_sqa',
+           'OnlinePanTompkins',
+           'OnlineERMA',
+           'OnlineIntervalCorrector',
+           'process_recordings',
+           'save_recording',
+           'load_recording',
+           'TimeAxis',
+           'filter_cache_info',
+           'clear_filter_cache']
\ No newline at end of file
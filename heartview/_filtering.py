@@ -0,0 +1,393 @@
+from typing import Callable, Iterable, Iterator, Literal, Optional, Tuple, \
+    Union
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from math import ceil, log
+import os
+from scipy.signal import butter, cheby1, cheby2, ellip, iirnotch, sosfilt, \
+    sosfilt_zi, tf2sos
+import numpy as np
+
+# ============================ Filter Design Cache ===========================
+def design_sos(
+    fs: Union[int, float],
+    ftype: Literal['butter', 'cheby1', 'cheby2', 'ellip', 'notch'],
+    cutoffs: Union[float, Tuple[float, ...]],
+    order: Optional[int] = None,
+    btype: Optional[str] = None,
+    rp: Optional[float] = None,
+    rs: Optional[float] = None,
+    q: Optional[float] = None
+) -> np.ndarray:
+    """
+    Design an IIR filter in second-order sections, reusing coefficients from
+    a bounded LRU cache shared by all filters and beat detectors.
+
+    Parameters
+    ----------
+    fs : int, float
+        The sampling rate of the signal.
+    ftype : {'butter', 'cheby1', 'cheby2', 'ellip', 'notch'}
+        The type of IIR filter to design.
+    cutoffs : float or tuple of float
+        The cutoff frequency, or lower and upper cutoff frequencies, in Hz.
+        For 'notch' filters, this is the frequency to remove.
+    order : int, optional
+        The order of the filter. Not used for 'notch' filters.
+    btype : str, optional
+        The type of filter, e.g., 'high', 'band', or 'bandstop'. Not used
+        for 'notch' filters.
+    rp : float, optional
+        The maximum passband ripple in dB, for 'cheby1' and 'ellip' filters.
+    rs : float, optional
+        The minimum stopband attenuation in dB, for 'cheby2' and 'ellip'
+        filters.
+    q : float, optional
+        The quality factor of 'notch' filters.
+
+    Returns
+    -------
+    sos : array-like
+        An array of second-order filter coefficients. This is a copy of the
+        cached design, so it may be modified freely.
+
+    See Also
+    --------
+    filter_cache_info :
+        Get the hit and miss counts of the filter design cache.
+    """
+    cutoffs = tuple(float(c) for c in np.atleast_1d(cutoffs))
+    sos = _design_sos(float(fs), ftype, cutoffs, order, btype, rp, rs, q)
+    return sos.copy()
+
+@lru_cache(maxsize = 128)
+def _design_sos(
+    fs: float,
+    ftype: str,
+    cutoffs: Tuple[float, ...],
+    order: Optional[int],
+    btype: Optional[str],
+    rp: Optional[float],
+    rs: Optional[float],
+    q: Optional[float]
+) -> np.ndarray:
+    """Design and cache a filter in second-order sections."""
+    nyquist = 0.5 * fs
+    wn = [c / nyquist for c in cutoffs]
+    wn = wn[0] if len(wn) == 1 else wn
+    if ftype == 'butter':
+        sos = butter(order, wn, btype = btype, output = 'sos')
+    elif ftype == 'cheby1':
+        sos = cheby1(order, rp, wn, btype = btype, output = 'sos')
+    elif ftype == 'cheby2':
+        sos = cheby2(order, rs, wn, btype = btype, output = 'sos')
+    elif ftype == 'ellip':
+        sos = ellip(order, rp, rs, wn, btype = btype, output = 'sos')
+    elif ftype == 'notch':
+        sos = tf2sos(*iirnotch(wn, q))
+    else:
+        raise ValueError('The `ftype` parameter must be \'butter\', '
+                         '\'cheby1\', \'cheby2\', \'ellip\', or \'notch\'.')
+    sos.flags.writeable = False
+    return sos
+
+def filter_cache_info():
+    """
+    Get the hit and miss counts, maximum size, and current size of the
+    filter design cache.
+
+    Returns
+    -------
+    info : functools._CacheInfo
+        A named tuple with `hits`, `misses`, `maxsize`, and `currsize`
+        fields.
+    """
+    return _design_sos.cache_info()
+
+def clear_filter_cache() -> None:
+    """Clear the filter design cache and reset its hit and miss counts."""
+    _design_sos.cache_clear()
+
+# ========================== Streaming Filter Engine =========================
+def sos_decay_len(
+    sos: np.ndarray,
+    tol: float = 1e-8
+) -> int:
+    """
+    Estimate the number of samples after which the impulse response of a
+    filter in second-order sections has decayed below a tolerance.
+
+    Parameters
+    ----------
+    sos : array-like
+        An array of second-order filter coefficients with shape
+        `(n_sections, 6)`.
+    tol : float, optional
+        The relative amplitude below which the impulse response is
+        considered to have decayed; by default, 1e-8.
+
+    Returns
+    -------
+    n : int
+        The estimated decay length in samples.
+    """
+    sos = np.asarray(sos)
+    radius = max(np.max(np.abs(np.roots(section[3:])), initial = 0)
+                 for section in sos)
+    if radius <= 0:
+        return 3 * sos.shape[0]
+    # Allow for one repeated pole per section
+    n = ceil(log(tol) / log(radius)) * sos.shape[0]
+    return max(n, 3 * sos.shape[0])
+
+def sosfiltfilt_stream(
+    sos: np.ndarray,
+    chunks: Iterable[Union[np.ndarray, list]],
+    overlap: Optional[int] = None
+) -> Iterator[np.ndarray]:
+    """
+    Apply a zero-phase digital filter in second-order sections to a stream
+    of signal chunks with constant memory.
+
+    Parameters
+    ----------
+    sos : array-like
+        An array of second-order filter coefficients with shape
+        `(n_sections, 6)`.
+    chunks : iterable of array-like
+        An iterable yielding consecutive chunks of the input signal.
+    overlap : int, optional
+        The number of look-ahead samples used to settle the backward pass
+        before its output is emitted; by default, the decay length of the
+        filter's impulse response.
+
+    Yields
+    ------
+    filtered : array-like
+        Consecutive chunks of the filtered signal. The concatenated output
+        has the same length as the concatenated input, although individual
+        chunk sizes may differ from the input chunk sizes.
+
+    Notes
+    -----
+    The forward pass carries its filter state between chunks and is exact.
+    The backward pass uses overlap-and-discard: each output block is
+    filtered together with `overlap` samples of look-ahead, starting from
+    the steady-state response to the last look-ahead sample, and only the
+    settled block is emitted. The signal edges are padded with odd
+    extensions as in `scipy.signal.sosfiltfilt`, so the output matches the
+    offline result within the decay tolerance of the filter.
+    """
+    sos = np.asarray(sos, dtype = float)
+    ntaps = 2 * sos.shape[0] + 1
+    ntaps -= min((sos[:, 2] == 0).sum(), (sos[:, 5] == 0).sum())
+    padlen = 3 * ntaps
+    if overlap is None:
+        overlap = sos_decay_len(sos)
+    overlap = max(int(overlap), 1)
+    zi = sosfilt_zi(sos)
+
+    head = []                 # raw samples collected before the first pass
+    n_head = 0
+    state = None              # forward filter state
+    tail = np.empty(0)        # last raw samples, for the odd end extension
+    pending = np.empty(0)     # forward-filtered samples awaiting emission
+
+    for chunk in chunks:
+        x = np.asarray(chunk, dtype = float).ravel()
+        if x.size == 0:
+            continue
+        if state is None:
+            head.append(x)
+            n_head += x.size
+            if n_head <= padlen:
+                continue
+            x = np.concatenate(head)
+            head = []
+
+            # Pad the start of the signal with an odd extension
+            ext = 2 * x[0] - x[padlen:0:-1]
+            forward, state = sosfilt(
+                sos, np.concatenate((ext, x)), zi = zi * ext[0])
+            forward = forward[padlen:]
+        else:
+            forward, state = sosfilt(sos, x, zi = state)
+        tail = np.concatenate((tail, x))[-(padlen + 1):]
+        pending = np.concatenate((pending, forward))
+
+        # Emit the settled part of the backward pass
+        if len(pending) >= 2 * overlap:
+            backward, _ = sosfilt(
+                sos, pending[::-1], zi = zi * pending[-1])
+            n_emit = len(pending) - overlap
+            yield backward[::-1][:n_emit]
+            pending = pending[n_emit:]
+
+    if state is None:
+        raise ValueError('The length of the input signal must be greater '
+                         f'than {padlen} samples.')
+
+    # Pad the end of the signal with an odd extension
+    ext = 2 * tail[-1] - tail[-2::-1]
+    forward, _ = sosfilt(sos, ext, zi = state)
+    pending = np.concatenate((pending, forward))
+    backward, _ = sosfilt(sos, pending[::-1], zi = zi * pending[-1])
+    yield backward[::-1][:-padlen]
+
+def moving_average_stream(
+    chunks: Iterable[Union[np.ndarray, list]],
+    window_len: int
+) -> Iterator[np.ndarray]:
+    """
+    Smooth a stream of signal chunks with a centered moving average filter,
+    equivalent to `numpy.convolve(signal, kernel, mode = 'same')`.
+
+    Parameters
+    ----------
+    chunks : iterable of array-like
+        An iterable yielding consecutive chunks of the input signal.
+    window_len : int
+        The size of the moving average window, in samples.
+
+    Yields
+    ------
+    filtered : array-like
+        Consecutive chunks of the smoothed signal.
+    """
+    kernel = np.ones(window_len) / window_len
+    lookahead = (window_len - 1) // 2
+
+    # The buffer holds `window_len // 2` samples of history followed by
+    # the samples not yet emitted
+    buffer = np.zeros(window_len // 2)
+    for chunk in chunks:
+        x = np.asarray(chunk, dtype = float).ravel()
+        buffer = np.concatenate((buffer, x))
+        if len(buffer) >= window_len:
+            yield np.convolve(buffer, kernel, mode = 'valid')
+            buffer = buffer[-(window_len - 1):] if window_len > 1 \
+                else buffer[:0]
+    buffer = np.concatenate((buffer, np.zeros(lookahead)))
+    if len(buffer) >= window_len:
+        yield np.convolve(buffer, kernel, mode = 'valid')
+
+# ========================= Multi-Channel Filtering ==========================
+def filter_channels(
+    func: Callable[[np.ndarray, int], np.ndarray],
+    signal: Union[np.ndarray, list],
+    axis: int = -1,
+    n_jobs: Optional[int] = None,
+    max_elements: int = 2 ** 20
+) -> np.ndarray:
+    """
+    Apply a filter along one axis of a single- or multi-channel signal,
+    calling it once per block of channels, optionally across a thread pool.
+
+    Parameters
+    ----------
+    func : callable
+        A function that takes an array and the axis along which to filter
+        it, and returns the filtered array.
+    signal : array-like
+        An array containing the signal, e.g., with shape
+        `(n_channels, n_samples)`.
+    axis : int, optional
+        The axis of `signal` along which to filter; by default, -1.
+    n_jobs : int, optional
+        The number of threads across which blocks of channels are filtered;
+        by default, None, which filters them sequentially. If -1, all
+        available CPU cores are used.
+    max_elements : int, optional
+        The maximum number of samples filtered in one call, unless a single
+        channel is longer; by default, 2 ** 20.
+
+    Returns
+    -------
+    filtered : array-like
+        An array containing the filtered signal, with the same shape as
+        `signal`.
+
+    Notes
+    -----
+    Short channels are filtered together in one call, which avoids the
+    overhead of calling the filter per channel. Long channels are split
+    into blocks because the temporary arrays of a single call over all of
+    them no longer fit in the CPU cache and make it slower than filtering
+    them in blocks. SciPy and NumPy release the GIL in their filtering
+    loops, so threads filter separate blocks in parallel.
+    """
+    signal = np.asarray(signal)
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs is not None and n_jobs < 1:
+        raise ValueError('The `n_jobs` parameter must be a positive '
+                         'integer or -1.')
+    if signal.ndim < 2:
+        return func(signal, axis)
+
+    channels = np.moveaxis(signal, axis, -1)
+    shape = channels.shape
+    n_channels = int(np.prod(shape[:-1]))
+    block_len = max(1, max_elements // max(shape[-1], 1))
+    n_blocks = max(ceil(n_channels / block_len), min(n_jobs or 1, n_channels))
+    if n_blocks <= 1:
+        return func(signal, axis)
+
+    channels = channels.reshape(n_channels, shape[-1])
+    bounds = np.linspace(0, n_channels, n_blocks + 1).astype(int)
+    blocks = [channels[start:end]
+              for start, end in zip(bounds[:-1], bounds[1:])]
+    if n_jobs is None or n_jobs == 1:
+        filtered = [func(block, -1) for block in blocks]
+    else:
+        with ThreadPoolExecutor(max_workers = min(n_jobs, n_blocks)) as \
+                executor:
+            filtered = list(executor.map(
+                lambda block: func(block, -1), blocks))
+    filtered = np.concatenate(filtered).reshape(shape[:-1] + (-1,))
+    return np.moveaxis(filtered, -1, axis)
+
+def moving_average(
+    signal: Union[np.ndarray, list],
+    window_len: int,
+    axis: int = -1
+) -> np.ndarray:
+    """
+    Smooth a single- or multi-channel signal with a centered moving average
+    filter, equivalent to `numpy.convolve(signal, kernel, mode = 'same')`
+    for each channel.
+
+    Multi-channel signals are convolved in one call, so their first and
+    last `window_len // 2` samples may differ from the single-channel
+    result by floating-point rounding.
+
+    Parameters
+    ----------
+    signal : array-like
+        An array containing the signal, e.g., with shape
+        `(n_channels, n_samples)`.
+    window_len : int
+        The size of the moving average window, in samples.
+    axis : int, optional
+        The axis of `signal` along which to filter; by default, -1.
+
+    Returns
+    -------
+    filtered : array-like
+        An array containing the smoothed signal.
+    """
+    kernel = np.ones(window_len) / window_len
+    signal = np.asarray(signal)
+    if signal.ndim < 2:
+        return np.convolve(signal, kernel, mode = 'same')
+
+    # Pad each channel with zeros and convolve all channels in one call,
+    # discarding the outputs whose windows span two channels
+    channels = np.moveaxis(signal, axis, -1)
+    shape = channels.shape
+    padded = np.pad(channels.reshape(-1, shape[-1]),
+                    ((0, 0), (window_len // 2, (window_len - 1) // 2)))
+    filtered = np.convolve(padded.ravel(), kernel, mode = 'valid')
+    filtered = np.concatenate((filtered, np.zeros(window_len - 1)))
+    filtered = filtered.reshape(padded.shape)[:, :shape[-1]]
+    return np.moveaxis(filtered.reshape(shape), -1, axis)
@@ -0,0 +1,44 @@
+import os
+import numpy as np
+import pytest
+from heartview.Batch import process_recordings
+
+
+class _KillWorker:
+    """A signal whose conversion to an array kills the worker process."""
+    def __array__(self, dtype = None, copy = None):
+        os._exit(1)
+
+
+def _ppg_recording(rec_id, fs = 64, duration = 180):
+    t = np.arange(fs * duration) / fs
+    signal = np.sin(2 * np.pi * 1.2 * t) ** 8 \
+        + 0.05 * np.random.default_rng(0).standard_normal(len(t))
+    return {'id': rec_id, 'signal': signal, 'fs': fs, 'signal_type': 'PPG'}
+
+
+def test_process_recordings_reports_dead_workers():
+    recordings = [{'id': 'killed', 'signal': _KillWorker(), 'fs': 64,
+                   'signal_type': 'PPG'}]
+    metrics, errors = process_recordings(
+        recordings, n_jobs = 2, show_progress = False)
+    assert metrics.empty
+    assert errors['killed'].startswith('BrokenProcessPool')
+
+
+@pytest.mark.parametrize('n_jobs', [1, -1])
+def test_process_recordings_n_jobs(n_jobs):
+    recordings = [_ppg_recording('P01'),
+                  {'id': 'P02', 'signal': [], 'fs': 64,
+                   'signal_type': 'EEG'}]
+    metrics, errors = process_recordings(
+        recordings, n_jobs = n_jobs, show_progress = False)
+    assert set(metrics['Recording']) == {'P01'}
+    assert list(errors) == ['P02']
+    assert errors['P02'].startswith('ValueError')
+
+
+@pytest.mark.parametrize('n_jobs', [0, -2])
+def test_process_recordings_rejects_invalid_n_jobs(n_jobs):
+    with pytest.raises(ValueError, match = 'n_jobs'):
+        process_recordings([_ppg_recording('P01')], n_jobs = n_jobs)
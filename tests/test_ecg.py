@@ -0,0 +1,269 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.signal import lfilter
+from heartview import ECG
+from heartview.ECG import BeatDetectors, Filters, OnlinePanTompkins
+
+# Quantized synthetic ECG signals, each with a flat lead-off segment, and
+# the beats found in them by the per-sample loop of `nabian()` in
+# HeartView 2.0.1
+NABIAN_FIXTURE = Path(__file__).parent / 'fixtures' / 'nabian.npz'
+
+
+def _synthetic_ecg(fs, duration, seed = 0, noise = 0.05):
+    """Simulate an ECG signal from Gaussian P-QRS-T waves with irregular
+    beat intervals, baseline wander, and white noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(fs * duration)) / fs
+    beat_times = np.cumsum(rng.uniform(0.6, 1.1, size = int(duration * 2)))
+    beat_times = beat_times[beat_times < duration - 1]
+    waves = [(1.0, 0, 0.012), (-0.15, 0.03, 0.01), (-0.1, -0.03, 0.01),
+             (0.25, 0.25, 0.05)]
+    signal = 0.2 * np.sin(2 * np.pi * 0.2 * t) \
+        + noise * rng.standard_normal(len(t))
+    for bt in beat_times:
+        near = slice(max(int((bt - 0.5) * fs), 0), int((bt + 0.5) * fs))
+        for amplitude, offset, width in waves:
+            signal[near] += amplitude * np.exp(
+                -((t[near] - bt - offset) / width) ** 2)
+    return signal, np.round(beat_times * fs).astype(np.int64)
+
+
+@pytest.mark.parametrize('fs', [250, 256, 500, 1000])
+@pytest.mark.parametrize('powerline_freq', [50, 60])
+def test_powerline_interference_removes_powerline_frequency(
+        fs, powerline_freq):
+    t = np.arange(fs * 20) / fs
+    powerline = np.sin(2 * np.pi * powerline_freq * t)
+    passband = np.sin(2 * np.pi * 10 * t)
+    filtered = Filters(fs, powerline_freq).powerline_interference(
+        powerline + passband)
+
+    # Compare away from the edges, where the filter has settled
+    settled = slice(fs * 2, -fs * 2)
+    residual = filtered[settled] - passband[settled]
+    assert np.max(np.abs(residual)) < 0.01
+
+
+@pytest.mark.parametrize('fs', [128, 250, 500, 1000])
+def test_elliptic_bandpass_filter_is_stable(fs):
+    signal, beats = _synthetic_ecg(fs, 60, seed = fs)
+    detectors = BeatDetectors(fs, preprocessed = False)
+    preprocessed = detectors._elliptic_bandpass_filter(signal)
+    assert np.all(np.isfinite(preprocessed))
+
+    # Every simulated R peak is found within 50 ms
+    detected = detectors.nabian(signal)
+    tolerance = int(0.05 * fs)
+    nearest = np.searchsorted(detected, beats - tolerance)
+    assert np.all(nearest < len(detected))
+    assert np.all(np.abs(detected[nearest] - beats) <= tolerance)
+
+
+@pytest.mark.parametrize('fs', [128, 250, 500, 1000])
+def test_nabian_matches_fixture(fs):
+    with np.load(NABIAN_FIXTURE) as fixture:
+        signal = fixture[f'signal_{fs}'].astype(float)
+        expected = fixture[f'beats_{fs}']
+    beats = BeatDetectors(fs).nabian(signal)
+    np.testing.assert_array_equal(beats, expected)
+
+
+@pytest.mark.parametrize('fs, noise, max_size', [
+    (250, 0.05, 1), (360, 0.3, 50), (500, 0.6, 2000)])
+def test_online_pantompkins_matches_pantompkins(fs, noise, max_size):
+    rng = np.random.default_rng(fs)
+    signal, _ = _synthetic_ecg(fs, 120, seed = fs, noise = noise)
+    filtered = Filters(fs).filter_signal(signal)
+    expected = BeatDetectors(fs).pantompkins(filtered)
+
+    detector = OnlinePanTompkins(fs)
+    bounds = np.cumsum(rng.integers(1, max_size + 1, len(filtered)))
+    chunks = np.split(filtered, bounds[bounds < len(filtered)])
+    beats = np.concatenate([detector.push(chunk) for chunk in chunks])
+    np.testing.assert_array_equal(beats, expected)
+
+
+def _reference_engzee(signal, fs):
+    """Per-sample loop of `engzee()` in HeartView 2.0.1."""
+    diff = np.zeros(len(signal))
+    for i in range(4, len(diff)):
+        diff[i] = signal[i] - signal[i - 4]
+    low_pass = lfilter([1, 4, 6, 4, 1], 1, diff)
+    low_pass[:int(0.2 * fs)] = 0
+    ms200 = int(0.2 * fs)
+    ms1200 = int(1.2 * fs)
+    ms160 = int(0.16 * fs)
+    neg_threshold = int(0.01 * fs)
+    M = 0
+    MM = []
+    M_slope = np.linspace(1.0, 0.6, ms1200 - ms200)
+    QRS = []
+    ecg_beats = []
+    counter = 0
+    thi_list = []
+    thi = False
+    thf = False
+    newM5 = False
+    for i in range(len(low_pass)):
+        if i < 5 * fs:
+            M = 0.6 * np.max(low_pass[:(i + 1)])
+            MM.append(M)
+            if len(MM) > 5:
+                MM.pop(0)
+        elif QRS and i < QRS[-1] + ms200:
+            newM5 = 0.6 * np.max(low_pass[QRS[-1]:i])
+            if newM5 > 1.5 * MM[-1]:
+                newM5 = 1.1 * MM[-1]
+        elif newM5 and QRS and i == QRS[-1] + ms200:
+            MM.append(newM5)
+            if len(MM) > 5:
+                MM.pop(0)
+            M = np.mean(MM)
+        elif QRS and i > QRS[-1] + ms200 and i < QRS[-1] + ms1200:
+            M = np.mean(MM) * M_slope[i - (QRS[-1] + ms200)]
+        elif QRS and i > QRS[-1] + ms1200:
+            M = 0.6 * np.mean(MM)
+
+        if (not QRS or i > QRS[-1] + ms200) and low_pass[i] > M:
+            QRS.append(i)
+            thi_list.append(i)
+            thi = True
+
+        if thi and i < thi_list[-1] + ms160:
+            if low_pass[i] < -M and low_pass[i - 1] > -M:
+                thf = True
+            if thf and low_pass[i] < -M:
+                counter += 1
+            elif low_pass[i] > -M and thf:
+                counter = 0
+                thi = False
+                thf = False
+        elif thi and i > thi_list[-1] + ms160:
+            counter = 0
+            thi = False
+            thf = False
+
+        if counter > neg_threshold:
+            start = thi_list[-1] - int(0.01 * fs)
+            ecg_beats.append(np.argmax(signal[start:i]) + start)
+            counter = 0
+            thi = False
+            thf = False
+    ecg_beats = np.array(ecg_beats[1:], dtype = int)
+    _, unique_ix = np.unique(ecg_beats, return_index = True)
+    return ecg_beats[np.sort(unique_ix)]
+
+
+@pytest.mark.parametrize('jit', [True, False])
+@pytest.mark.parametrize('fs, noise', [(128, 0.05), (250, 0.3), (500, 0.1)])
+def test_engzee_matches_reference(monkeypatch, jit, fs, noise):
+    if jit and ECG._engzee_core_jit is None:
+        pytest.skip('Numba is not installed')
+    if not jit:
+        monkeypatch.setattr(ECG, '_engzee_core_jit', None)
+    signal, _ = _synthetic_ecg(fs, 60, seed = fs, noise = noise)
+    filtered = Filters(fs).filter_signal(signal)
+    expected = _reference_engzee(filtered, fs)
+    beats = BeatDetectors(fs).engzee(filtered)
+    assert len(expected) > 30
+    np.testing.assert_array_equal(beats, expected)
+
+
+def _reference_manikandan_peaks(signal, idx, search_window_half):
+    """Per-beat R peak search of `manikandan()` in HeartView 2.0.1."""
+    peaks = []
+    for n in idx:
+        lows = np.arange(n - search_window_half, n)
+        highs = np.arange(n + 1, (n + search_window_half + 1))
+        if highs[-1] >= len(signal):
+            highs = np.delete(
+                highs, np.arange(
+                    np.where(highs == len(signal))[0][0], len(highs)))
+        ecg_window = np.concatenate((lows, [n], highs))
+        ecg_window_wave = signal[ecg_window]
+        peaks.append(ecg_window[
+            np.where(ecg_window_wave == np.max(ecg_window_wave))[0]].item())
+    return np.array(peaks, dtype = np.int64)
+
+
+@pytest.mark.parametrize('fs', [128, 250, 500])
+def test_manikandan_peaks_match_reference(fs):
+    signal, _ = _synthetic_ecg(fs, 30, seed = fs)
+    signal = Filters(fs).filter_signal(signal)
+    half = round(fs * .12)
+    n = len(signal)
+
+    # Place the largest value near the end of the signal, where the windows
+    # of the first indices wrap around
+    signal[-3] = np.max(signal) + 1
+
+    # Search around every index within a window of either end of the
+    # signal, and around random indices in between
+    rng = np.random.default_rng(fs)
+    idx = np.concatenate((
+        np.arange(0, 2 * half + 2), rng.integers(0, n - 1, 200),
+        np.arange(n - 2 * half - 2, n - 1)))
+    expected = _reference_manikandan_peaks(signal, idx, half)
+    peaks = BeatDetectors(fs)._localize_peaks(signal, idx, half)
+    np.testing.assert_array_equal(peaks, expected)
+
+    assert np.any(expected == -3)
+
+
+def _reference_adapt_thresh(signal, beats_ix, fs, window, step = 0.1):
+    """Sample-window loop of the adaptive threshold of `manikandan()` in
+    HeartView 2.0.1."""
+    window_len = int(fs * window)
+    window_step = int(fs * step)
+    signal_beats = pd.DataFrame({'signal': signal})
+    signal_beats.loc[beats_ix, 'beat'] = 1
+    for n in range(0, len(signal_beats), window_step):
+        w = signal_beats[n:(n + window_len)]
+        if w.beat.sum() >= 2:
+            s = w['signal']
+            beats = w[w.beat == 1].index.values
+            if len(beats) == 2:
+                thresh = (s[beats].min() + s[beats].max()) * 0.5
+            if len(beats) > 2:
+                thresh = (s[beats].median() + s[beats].max()) * 0.5
+            reject = s[beats][s[beats] < thresh].index
+            signal_beats.loc[reject, 'beat'] = np.nan
+    passing_beats = signal_beats[signal_beats.beat == 1].index.values
+    return np.array(passing_beats, dtype = np.int64)
+
+
+@pytest.mark.parametrize('fs, noise, window', [
+    (128, 0.3, 0.44), (250, 0.6, 0.44), (500, 0.6, 1.5)])
+def test_manikandan_adaptive_threshold_matches_reference(fs, noise, window):
+    signal, _ = _synthetic_ecg(fs, 120, seed = fs, noise = noise)
+    signal = Filters(fs).filter_signal(signal)
+    detectors = BeatDetectors(fs)
+    candidates = detectors.manikandan(signal, adaptive_threshold = False)
+    expected = _reference_adapt_thresh(signal, candidates, fs, window)
+    beats = detectors.manikandan(signal, window = window)
+    assert 0 < len(expected) < len(candidates)
+    np.testing.assert_array_equal(beats, expected)
+
+
+@pytest.mark.parametrize('fs', [250, 500])
+def test_online_pantompkins_noise_peaks_stay_bounded(fs):
+    # Five minutes of noise without beats between two minutes of ECG
+    rng = np.random.default_rng(fs)
+    ecg, _ = _synthetic_ecg(fs, 120, seed = fs)
+    noise = 0.05 * rng.standard_normal(300 * fs)
+    signal = np.concatenate((ecg[:(60 * fs)], noise, ecg[(60 * fs):]))
+    filtered = Filters(fs).filter_signal(signal)
+    expected = BeatDetectors(fs).pantompkins(filtered)
+
+    detector = OnlinePanTompkins(fs)
+    beats = []
+    max_noise_peaks = 0
+    for chunk in np.array_split(filtered, len(filtered) // fs):
+        beats.append(detector.push(chunk))
+        max_noise_peaks = max(max_noise_peaks, len(detector._noise_peaks))
+        assert len(detector._noise_values) == len(detector._noise_peaks)
+    np.testing.assert_array_equal(np.concatenate(beats), expected)
+    assert max_noise_peaks < 100
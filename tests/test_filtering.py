@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from scipy.signal import sosfiltfilt
+from heartview import ECG, PPG, clear_filter_cache, filter_cache_info
+from heartview._filtering import (design_sos, filter_channels,
+                                  moving_average_stream, sosfiltfilt_stream)
+
+
+def _signal(fs, duration = 60, seed = 0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(fs * duration) / fs
+    return np.sin(2 * np.pi * 1.2 * t) + 0.5 * np.sin(2 * np.pi * 0.1 * t) \
+        + 0.2 * rng.standard_normal(len(t))
+
+
+def _random_chunks(signal, rng, max_size):
+    """Split a signal into consecutive chunks of random sizes."""
+    start = 0
+    while start < len(signal):
+        size = int(rng.integers(1, max_size + 1))
+        yield signal[start:(start + size)]
+        start += size
+
+
+@pytest.mark.parametrize('module', [ECG, PPG])
+@pytest.mark.parametrize('fs', [64, 250, 500])
+def test_filter_stream_matches_filter_signal(module, fs):
+    rng = np.random.default_rng(fs)
+    signal = _signal(fs, seed = fs)
+    filters = module.Filters(fs)
+    expected = filters.filter_signal(signal)
+    for max_size in (16, fs, 5 * fs):
+        chunks = _random_chunks(signal, rng, max_size)
+        streamed = np.concatenate(list(filters.filter_stream(chunks)))
+        assert len(streamed) == len(expected)
+        np.testing.assert_allclose(streamed, expected, rtol = 0, atol = 1e-9)
+
+
+@pytest.mark.parametrize('fs', [64, 250, 1000])
+def test_sosfiltfilt_stream_matches_sosfiltfilt(fs):
+    rng = np.random.default_rng(fs)
+    signal = _signal(fs, seed = fs)
+    sos = design_sos(fs, 'butter', (0.5, 8), 4, btype = 'band')
+    expected = sosfiltfilt(sos, signal)
+    streamed = np.concatenate(list(
+        sosfiltfilt_stream(sos, _random_chunks(signal, rng, 3 * fs))))
+    assert len(streamed) == len(expected)
+    np.testing.assert_allclose(streamed, expected, rtol = 0, atol = 1e-9)
+
+
+@pytest.mark.parametrize('window_len', [1, 2, 7, 32])
+def test_moving_average_stream_matches_convolve(window_len):
+    rng = np.random.default_rng(window_len)
+    signal = _signal(64, seed = window_len)
+    kernel = np.ones(window_len) / window_len
+    expected = np.convolve(signal, kernel, mode = 'same')
+    streamed = np.concatenate(list(
+        moving_average_stream(_random_chunks(signal, rng, 100), window_len)))
+    assert len(streamed) == len(expected)
+    np.testing.assert_allclose(streamed, expected, rtol = 0, atol = 1e-12)
+
+
+@pytest.mark.parametrize('n_jobs', [None, 2, -1])
+def test_filter_channels_blocks_at_max_elements(n_jobs):
+    signal = np.random.default_rng(0).standard_normal((10, 1000, 3))
+    sos = design_sos(250, 'butter', (0.5, 8), 4, btype = 'band')
+    block_sizes = []
+
+    def func(block, axis):
+        block_sizes.append(block.size)
+        return sosfiltfilt(sos, block, axis = axis)
+
+    filtered = filter_channels(func, signal, axis = 1, n_jobs = n_jobs,
+                               max_elements = 4000)
+    assert max(block_sizes) <= 4000
+    assert sum(block_sizes) == signal.size
+    np.testing.assert_allclose(
+        filtered, sosfiltfilt(sos, signal, axis = 1), rtol = 0, atol = 1e-12)
+
+
+def test_filter_channels_rejects_invalid_n_jobs():
+    with pytest.raises(ValueError, match = 'n_jobs'):
+        filter_channels(lambda x, axis: x, np.zeros((2, 10)), n_jobs = 0)
+
+
+@pytest.mark.parametrize('module', [ECG, PPG])
+def test_repeated_filters_reuse_cached_designs(module):
+    signal = _signal(250)
+    clear_filter_cache()
+    expected = module.Filters(250).filter_signal(signal)
+    first = filter_cache_info()
+    assert first.misses > 0
+    assert first.currsize == first.misses
+
+    # A second instance designs no new filters and filters identically
+    filtered = module.Filters(250).filter_signal(signal)
+    second = filter_cache_info()
+    assert second.misses == first.misses
+    assert second.hits >= first.hits + first.misses
+    assert second.currsize == first.currsize
+    np.testing.assert_array_equal(filtered, expected)
+
+
+def test_clear_filter_cache_resets_counters():
+    design_sos(250, 'butter', (0.5, 8), 4, btype = 'band')
+    design_sos(250, 'butter', (0.5, 8), 4, btype = 'band')
+    assert filter_cache_info().hits > 0
+    clear_filter_cache()
+    info = filter_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (0, 0, 0)
+    assert info.maxsize == 128
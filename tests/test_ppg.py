@@ -0,0 +1,131 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.signal import find_peaks
+from heartview.PPG import BeatDetectors, Filters, OnlineERMA
+
+SAMPLE_PPG = Path(__file__).parents[1] / 'data' / 'sample_ppg.csv'
+
+
+@pytest.fixture(scope = 'module')
+def filtered_ppg():
+    ppg = pd.read_csv(SAMPLE_PPG, nrows = 64 * 600)
+    return Filters(64).filter_signal(ppg['BVP'].to_numpy())
+
+
+@pytest.mark.parametrize('max_size, refractory', [
+    (1, 0.3), (64, 0.3), (5000, 0.5)])
+def test_online_erma_matches_erma(filtered_ppg, max_size, refractory):
+    fs = 64
+    rng = np.random.default_rng(max_size)
+    expected = BeatDetectors(fs).erma(filtered_ppg, refractory = refractory)
+
+    detector = OnlineERMA(
+        fs, refractory = refractory,
+        mean_squared = np.mean(np.maximum(filtered_ppg, 0) ** 2))
+    bounds = np.cumsum(rng.integers(1, max_size + 1, len(filtered_ppg)))
+    chunks = np.split(filtered_ppg, bounds[bounds < len(filtered_ppg)])
+    beats = np.concatenate(
+        [detector.push(chunk) for chunk in chunks] + [detector.flush()])
+    assert len(expected) > 0
+    np.testing.assert_array_equal(beats, expected)
+
+
+def _reference_adaptive_threshold(signal, rmean, ma_perc):
+    """Per-group loop of `adaptive_threshold()` in HeartView 2.0.1, given
+    the moving average of the signal."""
+    mn = np.mean(rmean / 100) * ma_perc
+    ma = rmean + mn
+    peaksx = np.where((signal > ma))[0]
+    peaksy = signal[peaksx]
+    peakedges = np.concatenate((np.array([0]),
+                                (np.where(np.diff(peaksx) > 1)[0]),
+                                np.array([len(peaksx)])))
+    ppg_beats = []
+    for i in range(0, len(peakedges) - 1):
+        y_values = peaksy[peakedges[i]:peakedges[i + 1]].tolist()
+        if len(y_values) > 0:
+            ppg_beats.append(
+                peaksx[peakedges[i] + y_values.index(max(y_values))])
+    return np.array(ppg_beats, dtype = np.int64)
+
+
+@pytest.mark.parametrize('noise', [0, 5])
+def test_adaptive_threshold_matches_reference(filtered_ppg, noise):
+    fs = 64
+    rng = np.random.default_rng(23)
+    signal = filtered_ppg + noise * rng.standard_normal(len(filtered_ppg))
+    detectors = BeatDetectors(fs)
+    rmean = detectors._moving_average(signal)
+    ma_percs = [-50, 0, 10, 20, 35.5, 100, 1e6]
+    for ma_perc in ma_percs:
+        np.testing.assert_array_equal(
+            detectors.adaptive_threshold(signal, ma_perc = ma_perc),
+            _reference_adaptive_threshold(signal, rmean, ma_perc))
+
+    # Each percentage of a sequence gives the beats of a separate call
+    beats = detectors.adaptive_threshold(signal, ma_perc = ma_percs)
+    assert list(beats) == ma_percs
+    for ma_perc in ma_percs:
+        np.testing.assert_array_equal(
+            beats[ma_perc],
+            detectors.adaptive_threshold(signal, ma_perc = ma_perc))
+    assert len(beats[20]) > 0
+
+
+def _reference_erma(signal, fs, W1 = 0.111, W2 = 0.667, offset = 0.02,
+                    refractory = 0.3):
+    """Per-wave loop of `erma()` in HeartView 2.0.1 for a preprocessed
+    signal, which also returns the bounds of the waves."""
+    signal_copy = np.copy(signal)
+    squared = np.maximum(signal_copy, 0) ** 2
+    filt = Filters(fs)
+    ma_peak = filt.moving_average(squared, int(np.rint(W1 * fs)))
+    ma_beat = filt.moving_average(squared, int(np.rint(W2 * fs)))
+    thr1 = ma_beat + offset * np.mean(squared)
+    waves = ma_peak > thr1
+    beg_waves = np.where(np.logical_and(~waves[:-1], waves[1:]))[0]
+    end_waves = np.where(np.logical_and(waves[:-1], ~waves[1:]))[0]
+    end_waves = end_waves[end_waves > beg_waves[0]]
+    min_len = int(np.rint(W1 * fs))
+    min_delay = int(np.rint(refractory * fs))
+    ppg_beats = [0]
+    for beg, end in zip(beg_waves, end_waves):
+        if end - beg >= min_len:
+            data = signal_copy[beg:end]
+            local_max, props = find_peaks(data, prominence = (None, None))
+            if local_max.size > 0:
+                peak = beg + local_max[np.argmax(props['prominences'])]
+                if peak - ppg_beats[-1] > min_delay:
+                    ppg_beats.append(peak)
+    ppg_beats.pop(0)
+    return np.array(ppg_beats, dtype = np.int64), beg_waves, end_waves
+
+
+@pytest.mark.parametrize('noise, refractory', [
+    (0, 0.3), (0, 0.6), (10, 0.3), (30, 0.2)])
+def test_erma_matches_reference(filtered_ppg, noise, refractory):
+    fs = 64
+    rng = np.random.default_rng(24)
+    signal = filtered_ppg + noise * rng.standard_normal(len(filtered_ppg))
+    detectors = BeatDetectors(fs)
+    expected, _, _ = _reference_erma(signal, fs, refractory = refractory)
+    beats = detectors.erma(signal, refractory = refractory)
+    assert len(expected) > 0
+    np.testing.assert_array_equal(beats, expected)
+
+
+def test_erma_matches_reference_at_signal_end(filtered_ppg):
+    # Cut the signal at every sample of its last two seconds, so that its
+    # last wave ends just before the end of the signal or remains open
+    fs = 64
+    detectors = BeatDetectors(fs)
+    ends_at_edge = open_at_end = False
+    for n in range(len(filtered_ppg) - 2 * fs, len(filtered_ppg) + 1):
+        signal = filtered_ppg[:n]
+        expected, beg_waves, end_waves = _reference_erma(signal, fs)
+        np.testing.assert_array_equal(detectors.erma(signal), expected)
+        ends_at_edge |= end_waves[-1] == n - 2
+        open_at_end |= beg_waves[-1] > end_waves[-1]
+    assert ends_at_edge and open_at_end
@@ -0,0 +1,460 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.signal import welch
+from heartview.SQA import Cardio, IntervalCorrector, OnlineIntervalCorrector, \
+    _correction_frames
+from heartview.Store import TimeAxis
+
+
+def _reference_seconds(n_samples, beats, fs):
+    """Per-second loop of the original `Cardio.get_seconds()`."""
+    beat = np.zeros(n_samples, dtype = bool)
+    beat[beats] = True
+    rows = []
+    for i in range(0, n_samples, fs):
+        n_beats = beat[i:(i + fs)].sum()
+        if i == 0:
+            window = np.flatnonzero(beat[:(i + fs)])
+        else:
+            window = np.flatnonzero(beat[(i - fs):min(i + fs, n_samples)])
+        ibis = np.diff(window) / fs * 1000
+        if len(ibis) == 0:
+            mean_ibi = np.nan
+            mean_hr = np.nan
+        else:
+            mean_ibi = np.mean(ibis)
+            mean_hr = 1 / np.mean(1 / (60000 / ibis))
+        rows.append((i // fs + 1, mean_hr, mean_ibi, n_beats))
+    return pd.DataFrame(
+        rows, columns = ['Second', 'Mean HR', 'Mean IBI', 'N Beats'])
+
+
+@pytest.mark.parametrize('fs, density', [(64, 70), (250, 60), (500, 400)])
+def test_get_seconds_matches_reference(fs, density):
+    rng = np.random.default_rng(fs)
+    n_samples = fs * 600 + fs // 3
+    n_beats = density * n_samples // (60 * fs)
+    beats = np.unique(rng.integers(0, n_samples, n_beats))
+    data = pd.DataFrame({'Signal': np.zeros(n_samples)})
+
+    seconds = Cardio(fs).get_seconds(data, beats)
+    expected = _reference_seconds(n_samples, beats, fs)
+    for col in expected.columns:
+        np.testing.assert_array_equal(
+            seconds[col].to_numpy(dtype = float),
+            expected[col].to_numpy(dtype = float))
+
+
+def _reference_hegarty(beats_ix, fs, initial_hr = 'auto', prev_n = 6):
+    """List-based screen of the original Hegarty-Craver et al. (2018)
+    artifact identification, returning the valid and artifactual beats."""
+    ibis = (np.diff(beats_ix) / fs) * 1000
+    beats = beats_ix[1:]
+    artifact_beats = []
+    valid_beats = [beats_ix[0]]
+    if initial_hr == 'auto':
+        successive_diff = np.abs(np.diff(ibis))
+        min_diff_ix = np.convolve(
+            successive_diff, np.ones(6) / 6, mode = 'valid').argmin()
+        first_ibi = ibis[min_diff_ix:min_diff_ix + 6].mean()
+    else:
+        first_ibi = 60000 / initial_hr
+    for n in range(len(ibis)):
+        if n < prev_n:
+            if n == 0:
+                ibi_estimate = first_ibi
+            else:
+                ibi_estimate = np.median(np.insert(ibis[:n], 0, first_ibi))
+        else:
+            ibi_estimate = np.median(ibis[n - prev_n:n])
+        if (26 / 32) * ibi_estimate <= ibis[n] <= (44 / 32) * ibi_estimate:
+            valid_beats.append(beats[n])
+        else:
+            artifact_beats.append(beats[n])
+    return np.array(valid_beats), np.array(artifact_beats)
+
+
+def _beats_with_artifacts(fs, n_beats, seed):
+    """Simulate beat indices with missed and extra beats."""
+    rng = np.random.default_rng(seed)
+    ibis = rng.normal(0.8, 0.05, n_beats) * fs
+    ibis[rng.choice(n_beats, n_beats // 20, replace = False)] *= 2
+    ibis[rng.choice(n_beats, n_beats // 20, replace = False)] *= 0.4
+    beats = np.cumsum(np.round(ibis).astype(np.int64))
+    return np.unique(beats)
+
+
+@pytest.mark.parametrize('initial_hr, prev_n', [
+    ('auto', 6), (None, None), (75, 6), ('auto', 3), (60, 10)])
+def test_hegarty_masks_match_reference(initial_hr, prev_n):
+    fs = 250
+    beats = _beats_with_artifacts(fs, 2000, seed = prev_n or 0)
+    artifacts = Cardio(fs).identify_artifacts(
+        beats, 'hegarty', initial_hr = initial_hr, prev_n = prev_n)
+    valid = np.setdiff1d(beats, artifacts)
+    expected_valid, expected_artifacts = _reference_hegarty(
+        beats, fs, initial_hr or 'auto', prev_n or 6)
+    assert len(expected_artifacts) > 0
+    np.testing.assert_array_equal(artifacts, expected_artifacts)
+    np.testing.assert_array_equal(valid, expected_valid)
+
+
+def _reference_cbd(beats_ix, fs, neighbors = 5, tol = 1):
+    """Per-IBI loop of the criterion beat difference test in HeartView
+    2.0.1."""
+    ibis = ((np.ediff1d(beats_ix)) / fs) * 1000
+    ibi_diffs = np.abs(np.ediff1d(ibis))
+    artifact_beats = []
+    if len(ibi_diffs) < neighbors:
+        neighbors = len(ibis)
+    for ii in range(len(ibi_diffs)):
+        if ii < int(neighbors / 2) + 1:
+            select = np.concatenate(
+                (ibi_diffs[:ii], ibi_diffs[(ii + 1):(neighbors + 1)]))
+            select_ibi = np.concatenate(
+                (ibis[:ii], ibis[(ii + 1):(neighbors + 1)]))
+        elif (len(ibi_diffs) - ii) < (int(neighbors / 2) + 1) and (
+                len(ibi_diffs) - ii) > 1:
+            select = np.concatenate(
+                (ibi_diffs[-(neighbors - 1):ii], ibi_diffs[ii + 1:]))
+            select_ibi = np.concatenate(
+                (ibis[-(neighbors - 1):ii], ibis[ii + 1:]))
+        elif len(ibi_diffs) - ii == 1:
+            select = ibi_diffs[-(neighbors - 1):-1]
+            select_ibi = ibis[-(neighbors - 1):-1]
+        else:
+            select = np.concatenate(
+                (ibi_diffs[ii - int(neighbors / 2):ii],
+                 ibi_diffs[(ii + 1):(ii + 1 + int(neighbors / 2))]))
+            select_ibi = np.concatenate(
+                (ibis[ii - int(neighbors / 2):ii],
+                 ibis[(ii + 1):(ii + 1 + int(neighbors / 2))]))
+        q75, q25 = np.percentile(select, [75, 25])
+        QD = (q75 - q25) * 0.5
+        MED = 3.32 * QD
+        MAD = (np.median(select_ibi) - 2.9 * QD) / 3
+        criterion_beat_diff = (MED + MAD) / 2
+        if (ibi_diffs[ii]) > tol * criterion_beat_diff:
+            bad_neighbors = int(neighbors * 0.25)
+            end_idx = min(ii + bad_neighbors + 1, len(beats_ix))
+            artifact_beats.extend(beats_ix[ii + 1:end_idx])
+    return np.array(artifact_beats, dtype = np.int64)
+
+
+@pytest.mark.parametrize('neighbors, tol', [
+    (5, 1), (6, 1), (4, 1.5), (8, 1), (12, 0.5)])
+def test_cbd_artifacts_match_reference(neighbors, tol):
+    fs = 250
+    beats = _beats_with_artifacts(fs, 2000, seed = neighbors)
+    artifacts = Cardio(fs).identify_artifacts(
+        beats, 'cbd', neighbors = neighbors, tol = tol)
+    expected = _reference_cbd(beats, fs, neighbors, tol)
+    assert len(expected) > 0
+    np.testing.assert_array_equal(artifacts, expected)
+
+
+@pytest.mark.parametrize('neighbors', [3, 5, 8])
+@pytest.mark.parametrize('n_beats', [4, 5, 6, 7, 9, 12, 20])
+@pytest.mark.parametrize('last_ibi', [1, 2, 0.4])
+def test_cbd_artifacts_match_reference_at_edges(neighbors, n_beats, last_ibi):
+    # Short recordings, some with fewer IBIs than `neighbors`, whose last
+    # IBI is normal, long (a missed beat), or short (an extra beat)
+    fs = 250
+    rng = np.random.default_rng(n_beats * neighbors)
+    ibis = rng.normal(0.8, 0.02, n_beats - 1) * fs
+    ibis[-1] *= last_ibi
+    beats = np.cumsum(np.round(ibis).astype(np.int64))
+    beats = np.concatenate(([0], beats))
+    artifacts = Cardio(fs).identify_artifacts(
+        beats, 'cbd', neighbors = neighbors)
+    expected = _reference_cbd(beats, fs, neighbors)
+    np.testing.assert_array_equal(artifacts, expected)
+
+    # An abnormal last IBI flags the beat opening it (and, with enough
+    # neighbors, the last beat) once the recording is long enough
+    if last_ibi != 1 and n_beats >= 9 and neighbors >= 4:
+        assert beats[-2] in expected
+
+
+@pytest.mark.parametrize('seg_size, initial_hr', [
+    (60, 'auto'), (30, 75), (180, 'auto')])
+def test_get_corrected_summary_only_matches_full_summary(seg_size, initial_hr):
+    fs = 250
+    beats = _beats_with_artifacts(fs, 1500, seed = seg_size)
+    sqa = Cardio(fs)
+    original, corrected, summary = sqa.get_corrected(
+        beats, seg_size, initial_hr = initial_hr)
+    no_original, no_corrected, summary_only = sqa.get_corrected(
+        beats, seg_size, initial_hr = initial_hr, summary_only = True)
+    assert original is not None and corrected is not None
+    assert no_original is None and no_corrected is None
+    pd.testing.assert_frame_equal(summary_only, summary)
+
+
+def _random_chunks(values, rng, max_size):
+    """Split an array into consecutive chunks of random sizes."""
+    bounds = np.cumsum(rng.integers(1, max_size + 1, len(values)))
+    return np.split(values, bounds[bounds < len(values)])
+
+
+def test_interleaved_interval_correctors_match_correct_interval():
+    fs = 64
+    rng = np.random.default_rng(13)
+    sqa = Cardio(fs)
+    sequences = [_beats_with_artifacts(fs, 500, seed) for seed in range(4)]
+    correctors = [
+        IntervalCorrector(fs, beats[0], IntervalCorrector.estimate_first_ibi(
+            np.diff(beats), fs), prev_n = 3 + i)
+        for i, beats in enumerate(sequences)]
+
+    # Feed the correctors in turn, a random-size chunk of IBIs at a time
+    pending = [_random_chunks(np.column_stack((np.diff(beats), beats[1:])),
+                              rng, 20)
+               for beats in sequences]
+    while any(pending):
+        for corrector, chunks in zip(correctors, pending):
+            if chunks:
+                for ibi, beat in chunks.pop(0):
+                    corrector.update(ibi, beat)
+
+    for i, (beats, corrector) in enumerate(zip(sequences, correctors)):
+        original, corrected = _correction_frames(
+            fs, np.diff(beats), beats[1:], corrector.correction_flags,
+            *corrector.finalize(), first_beat = beats[0])
+        expected_original, expected_corrected = sqa.correct_interval(
+            beats, prev_n = 3 + i)
+        pd.testing.assert_frame_equal(original, expected_original)
+        pd.testing.assert_frame_equal(corrected, expected_corrected)
+
+
+@pytest.mark.parametrize('initial_hr, prev_n, max_size', [
+    (75, 6, 1), (60, 3, 7), (90, 10, 40)])
+def test_online_interval_corrector_matches_correct_interval(
+        initial_hr, prev_n, max_size):
+    fs = 64
+    rng = np.random.default_rng(max_size)
+    beats = _beats_with_artifacts(fs, 1000, seed = max_size)
+    corrector = OnlineIntervalCorrector(
+        fs, initial_hr = initial_hr, prev_n = prev_n)
+    outputs = [corrector.push(chunk)
+               for chunk in _random_chunks(beats, rng, max_size)]
+    outputs.append(corrector.flush())
+    original = pd.concat([o for o, _ in outputs], ignore_index = True)
+    corrected = pd.concat([c for _, c in outputs], ignore_index = True)
+
+    expected_original, expected_corrected = Cardio(fs).correct_interval(
+        beats, initial_hr = initial_hr, prev_n = prev_n)
+    pd.testing.assert_frame_equal(original, expected_original)
+    pd.testing.assert_frame_equal(corrected, expected_corrected)
+
+
+def _noisy_signal(fs, duration, seed):
+    """Simulate a clean pulse train and a copy of it with baseline wander,
+    powerline interference, and white noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(fs * duration)) / fs
+    filtered = np.sin(2 * np.pi * 1.2 * t) ** 15
+    original = filtered + 0.3 * np.sin(2 * np.pi * 0.2 * t) \
+        + 0.1 * np.sin(2 * np.pi * 60 * t) + 0.2 * rng.standard_normal(len(t))
+    return original, filtered
+
+
+@pytest.mark.parametrize('combined_noise', [True, False])
+@pytest.mark.parametrize('rolling_window', [None, 20])
+def test_compute_snr_all_returns_each_method(combined_noise, rolling_window):
+    fs = 250
+    original, filtered = _noisy_signal(fs, 300, seed = 16)
+    sqa = Cardio(fs)
+    kwargs = dict(seg_size = 30, norm = False, rolling_window = rolling_window)
+
+    snr = sqa.compute_snr(original, filtered, method = 'all',
+                          combined_noise = combined_noise, **kwargs)
+    residual = sqa.compute_snr(original, filtered, method = 'residual',
+                               **kwargs)
+    banded = sqa.compute_snr(original, method = 'banded',
+                             combined_noise = combined_noise, **kwargs)
+    banded_cols = ['Banded SNR'] if combined_noise \
+        else list(banded.columns[1:])
+    assert list(snr.columns) == \
+        [residual.columns[0], 'Residual SNR'] + banded_cols
+    np.testing.assert_array_equal(snr.iloc[:, 0], residual.iloc[:, 0])
+    np.testing.assert_allclose(snr['Residual SNR'], residual['SNR'])
+    np.testing.assert_allclose(snr[banded_cols], banded.iloc[:, 1:])
+
+    if combined_noise:
+        both = sqa.compute_snr(original, filtered, method = 'both', **kwargs)
+        np.testing.assert_allclose(
+            both['SNR'], (snr['Residual SNR'] + snr['Banded SNR']) / 2)
+
+
+def test_compute_snr_both_requires_combined_noise():
+    with pytest.raises(ValueError, match = 'combined_noise'):
+        Cardio(64).compute_snr(np.zeros(64 * 120), np.zeros(64 * 120),
+                               method = 'both', combined_noise = False)
+
+
+def _reference_rolling_metrics(sqa, data, beats, artifacts, seg_size, min_hr,
+                               rolling_window, rolling_step):
+    """Moving-window loop of the original `Cardio.compute_metrics()`."""
+    seconds = sqa.get_seconds(data, beats)
+    per_second = sqa.get_artifacts(data, beats, artifacts, seg_size = 1)
+    rows = []
+    for s, n in enumerate(range(0, len(seconds), rolling_step), start = 1):
+        window_missing = seconds.iloc[n:(n + rolling_window)]
+        raw_expected = window_missing['Mean HR'].rolling(
+            window = seg_size + 1, min_periods = 1, center = True).median()
+        n_expected = raw_expected.median() * (seg_size / 60)
+        n_detected = window_missing['N Beats'].sum()
+        n_missing = (n_expected - n_detected) \
+            if n_expected > n_detected else 0
+        perc_missing = (n_missing / n_expected) * 100
+        n_artifact = per_second['N Artifact'].iloc[
+            n:(n + rolling_window)].sum()
+        perc_artifact = (n_artifact / n_detected) * 100
+        rows.append({
+            'Moving Window': s,
+            'N Expected': int(n_expected),
+            'N Detected': int(n_detected),
+            'N Missing': int(n_missing),
+            '% Missing': round(perc_missing, 2),
+            'N Artifact': int(n_artifact),
+            '% Artifact': round(perc_artifact, 2)})
+    metrics = pd.DataFrame(rows)
+
+    # Handle the last partial rolling window
+    last_seg_len = len(seconds) % rolling_window
+    if last_seg_len > 0:
+        last_detected = metrics['N Detected'].iloc[-1]
+        last_expected = min_hr / metrics['N Expected'].iloc[:-1].median() \
+            * last_seg_len
+        if last_expected > last_detected:
+            last_n_missing = last_expected - last_detected
+            last_perc_missing = (last_n_missing / last_expected) * 100
+        else:
+            last_perc_missing = 0
+            last_n_missing = 0
+        last_row = metrics.index[-1]
+        metrics.loc[last_row, 'N Expected'] = int(round(last_expected))
+        metrics.loc[last_row, 'N Missing'] = int(round(last_n_missing))
+        metrics.loc[last_row, '% Missing'] = round(last_perc_missing, 2)
+    metrics['Invalid'] = metrics['N Detected'].apply(
+        lambda x: 1 if x < int(min_hr * (seg_size / 60)) or x > 220
+        else np.nan)
+    return metrics
+
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')
+@pytest.mark.parametrize('rolling_window, rolling_step, extra_seconds', [
+    (60, 15, 0), (60, 15, 17), (30, 10, 0), (45, 20, 7), (20, 20, 3)])
+def test_rolling_metrics_match_reference(rolling_window, rolling_step,
+                                         extra_seconds):
+    fs = 64
+    beats = _beats_with_artifacts(fs, 700, seed = rolling_window)
+    # Leave a stretch without beats so that some seconds have no mean HR
+    beats = beats[(beats < 203 * fs) | (beats > 215 * fs)]
+    n_samples = (int(np.ceil(beats[-1] / fs)) // 60 * 60 + extra_seconds) * fs
+    beats = beats[beats < n_samples]
+    artifacts = beats[::9]
+    data = pd.DataFrame({'Signal': np.zeros(n_samples)})
+    sqa = Cardio(fs)
+
+    metrics = sqa.compute_metrics(
+        data, beats, artifacts, seg_size = 60, min_hr = 40,
+        rolling_window = rolling_window, rolling_step = rolling_step,
+        show_progress = False)
+    expected = _reference_rolling_metrics(
+        sqa, data, beats, artifacts, 60, 40, rolling_window, rolling_step)
+    pd.testing.assert_frame_equal(metrics, expected, check_dtype = False,
+                                  check_exact = True)
+
+
+def _welch_snr(original, filtered, fs, nperseg):
+    """Compute the residual SNR and the SNR against baseline wander of an
+    ECG signal from its Welch PSDs."""
+    freqs, psd_signal = welch(filtered, fs, nperseg = nperseg)
+    _, psd_noise = welch(original - filtered, fs, nperseg = nperseg)
+    _, psd = welch(original, fs, nperseg = nperseg)
+    signal_power = psd[(freqs >= 0.5) & (freqs <= 40)].sum()
+    bw_power = max(psd[freqs < 0.5].sum(), 1e-6)
+    return 10 * np.log10(psd_signal.sum() / psd_noise.sum()), \
+        10 * np.log10(signal_power / bw_power)
+
+
+@pytest.mark.parametrize('fs, seg_size', [(250, 60), (64, 10), (100, 30)])
+def test_compute_snr_segments_match_welch(fs, seg_size):
+    original, filtered = _noisy_signal(fs, 185, seed = fs)
+    sqa = Cardio(fs)
+    snr = sqa.compute_snr(original, filtered, method = 'all',
+                          seg_size = seg_size, combined_noise = False,
+                          norm = False)
+
+    # Welch PSDs of each segment
+    seg_len = fs * seg_size
+    n_seg = len(original) // seg_len
+    assert len(snr) == n_seg
+    for seg in range(n_seg):
+        samples = slice(seg * seg_len, (seg + 1) * seg_len)
+        expected = _welch_snr(original[samples], filtered[samples], fs,
+                              min(1024, seg_len))
+        np.testing.assert_allclose(
+            snr[['Residual SNR', 'Baseline Wander']].iloc[seg], expected)
+
+
+@pytest.mark.parametrize('fs, rolling_window, rolling_step', [
+    (128, 8, 4), (128, 20, 8), (256, 10, 2), (64, 30, 16)])
+def test_compute_snr_rolling_windows_match_welch(fs, rolling_window,
+                                                 rolling_step):
+    original, filtered = _noisy_signal(fs, 300, seed = fs)
+
+    # Start with a loud stretch, after which the windows are quiet
+    original[:(10 * fs)] *= 1e6
+    sqa = Cardio(fs)
+    snr = sqa.compute_snr(original, filtered, method = 'all',
+                          combined_noise = False, norm = False,
+                          rolling_window = rolling_window,
+                          rolling_step = rolling_step)
+
+    # Welch PSDs of each window, whose frames line up with those of the
+    # whole signal when windows start on a multiple of the frame step
+    nperseg = min(1024, rolling_window * fs)
+    assert (rolling_step * fs) % (nperseg // 2) == 0
+    starts = np.arange(0, len(original) // fs, rolling_step) * fs
+    assert len(snr) == len(starts)
+    for w, start in enumerate(starts):
+        samples = slice(start, start + rolling_window * fs)
+        if len(original[samples]) < nperseg:
+            assert snr.iloc[w, 1:].isna().all()
+            continue
+        expected = _welch_snr(original[samples], filtered[samples], fs,
+                              nperseg)
+        np.testing.assert_allclose(
+            snr[['Residual SNR', 'Baseline Wander']].iloc[w], expected,
+            rtol = 1e-9, atol = 1e-9)
+
+
+@pytest.mark.parametrize('timestamps', [False, True])
+@pytest.mark.parametrize('rolling_window', [None, 30])
+def test_compute_metrics_from_beats_matches_compute_metrics(timestamps,
+                                                            rolling_window):
+    fs = 64
+    beats = _beats_with_artifacts(fs, 400, seed = 20)
+    n_samples = beats[-1] + 17
+    artifacts = Cardio(fs).identify_artifacts(beats, 'hegarty')
+    data = pd.DataFrame({'Signal': np.zeros(n_samples)})
+    kwargs = dict(seg_size = 60, min_hr = 40,
+                  rolling_window = rolling_window, rolling_step = 10)
+    time_axis = None
+    ts_col = None
+    if timestamps:
+        time_axis = TimeAxis('2021-11-15 22:59:26', fs)
+        data['Timestamp'] = time_axis.get_timestamps(np.arange(n_samples))
+        ts_col = 'Timestamp'
+
+    sqa = Cardio(fs)
+    expected = sqa.compute_metrics(data, beats, artifacts, ts_col = ts_col,
+                                   show_progress = False, **kwargs)
+    metrics = sqa.compute_metrics_from_beats(
+        n_samples, beats, artifacts, time_axis = time_axis, **kwargs)
+    assert ('Timestamp' in expected) == timestamps
+    pd.testing.assert_frame_equal(metrics, expected)
@@ -0,0 +1,211 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from heartview import ECG, PPG
+from heartview.SQA import Cardio
+from heartview.Store import ALIGN, TimeAxis, load_recording, save_recording
+
+NABIAN_FIXTURE = Path(__file__).parent / 'fixtures' / 'nabian.npz'
+SAMPLE_PPG = Path(__file__).parents[1] / 'data' / 'sample_ppg.csv'
+
+
+def _timestamps_with_gaps(fs, n_samples, gaps, start = '2021-11-15 22:59:26'):
+    """Get the timestamps of samples after recording gaps, given as rows of
+    the index of the first sample after a gap and its duration in
+    seconds."""
+    offsets = np.round(np.arange(n_samples) * 10 ** 9 / fs)
+    for ix, duration in gaps:
+        offsets[ix:] += round(duration * 10 ** 9)
+    return pd.Timestamp(start) + pd.to_timedelta(offsets, unit = 'ns')
+
+
+@pytest.fixture(scope = 'module')
+def ecg():
+    with np.load(NABIAN_FIXTURE) as fixture:
+        return fixture['signal_250'].astype(float)
+
+
+@pytest.fixture(scope = 'module')
+def ppg():
+    return pd.read_csv(SAMPLE_PPG, nrows = 64 * 300)
+
+
+def test_save_recording_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    signal = rng.standard_normal(1001)
+    beats = np.sort(rng.choice(1001, 40, replace = False))
+    gaps = [[500, 2.5], [100, 0.25]]
+    rec = save_recording(tmp_path / 'rec.hvr', signal, 250,
+                         start_time = '2021-11-15 22:59:26.5',
+                         beats_ix = beats, artifacts_ix = beats[::5],
+                         gaps = gaps)
+
+    rec = load_recording(tmp_path / 'rec.hvr')
+    assert rec.fs == 250
+    assert rec.start_time == pd.Timestamp('2021-11-15 22:59:26.5')
+    assert rec.time_axis.start_time == rec.start_time
+    np.testing.assert_array_equal(rec.time_axis.gaps,
+                                  [[100, 0.25], [500, 2.5]])
+    assert len(rec) == 1001
+    assert rec.signal.dtype == np.float32
+    assert rec.beats_ix.dtype == rec.artifacts_ix.dtype == np.int64
+    np.testing.assert_array_equal(rec.signal, signal.astype(np.float32))
+    np.testing.assert_array_equal(rec.beats_ix, beats)
+    np.testing.assert_array_equal(rec.artifacts_ix, beats[::5])
+
+    # Every array starts at an aligned offset of the file
+    for values in (rec.signal, rec.beats_ix, rec.artifacts_ix):
+        assert values.offset % ALIGN == 0
+
+
+def test_save_recording_without_beats_or_start_time(tmp_path):
+    signal = np.arange(100, dtype = float)
+    save_recording(tmp_path / 'rec.hvr', signal, 64, beats_ix = [])
+    rec = load_recording(tmp_path / 'rec.hvr')
+    assert rec.start_time is None and rec.time_axis is None
+    assert rec.beats_ix.shape == rec.artifacts_ix.shape == (0,)
+    assert rec.beats_ix.dtype == np.int64
+    np.testing.assert_array_equal(rec.signal, signal)
+    np.testing.assert_array_equal(rec[10:20], signal[10:20])
+
+
+def test_load_recording_modes(tmp_path):
+    path = tmp_path / 'rec.hvr'
+    save_recording(path, np.zeros(100), 64, beats_ix = [10, 50])
+
+    rec = load_recording(path)
+    assert not rec.signal.flags.writeable
+    with pytest.raises(ValueError):
+        rec.signal[0] = 1
+
+    # Copy-on-write changes are not written to the file
+    rec = load_recording(path, mode = 'c')
+    rec.signal[0] = 1
+    rec.beats_ix[0] = 20
+    assert load_recording(path).signal[0] == 0
+    assert load_recording(path).beats_ix[0] == 10
+
+    rec = load_recording(path, mode = 'r+')
+    rec.signal[0] = 2
+    rec.beats_ix[0] = 30
+    rec.signal.flush()
+    rec.beats_ix.flush()
+    del rec
+    rec = load_recording(path)
+    assert rec.signal[0] == 2
+    np.testing.assert_array_equal(rec.beats_ix, [30, 50])
+
+    with pytest.raises(FileNotFoundError):
+        load_recording(tmp_path / 'missing.hvr')
+    (tmp_path / 'bad.hvr').write_bytes(b'not a recording')
+    with pytest.raises(ValueError, match = 'not a heartview recording'):
+        load_recording(tmp_path / 'bad.hvr')
+
+
+def test_recording_matches_array_in_ecg_methods(tmp_path, ecg):
+    rec = save_recording(tmp_path / 'ecg.hvr', ecg, 250)
+    array = ecg.astype(np.float32)
+
+    filters = ECG.Filters(250)
+    expected = filters.filter_signal(array)
+    np.testing.assert_array_equal(filters.filter_signal(rec), expected)
+
+    # Streamed chunks are filtered in double precision
+    streamed = np.concatenate(list(filters.filter_stream(
+        rec.iter_chunks(1000))))
+    np.testing.assert_allclose(
+        streamed, filters.filter_signal(array.astype(float)),
+        rtol = 0, atol = 1e-9)
+
+    detectors = ECG.BeatDetectors(250, preprocessed = False)
+    for method in ('manikandan', 'nabian', 'pantompkins', 'engzee'):
+        np.testing.assert_array_equal(
+            getattr(detectors, method)(rec),
+            getattr(detectors, method)(array))
+
+
+def test_recording_matches_array_in_ppg_methods(tmp_path, ppg):
+    signal = ppg['BVP'].to_numpy()
+    rec = save_recording(tmp_path / 'ppg.hvr', signal, 64)
+    array = signal.astype(np.float32)
+
+    filters = PPG.Filters(64)
+    expected = filters.filter_signal(array)
+    np.testing.assert_array_equal(filters.filter_signal(rec), expected)
+
+    # Streamed chunks are filtered in double precision
+    streamed = np.concatenate(list(filters.filter_stream(
+        rec.iter_chunks(1000))))
+    np.testing.assert_allclose(
+        streamed, filters.filter_signal(array.astype(float)),
+        rtol = 0, atol = 1e-9)
+
+    detectors = PPG.BeatDetectors(64, preprocessed = False)
+    for method in ('adaptive_threshold', 'erma'):
+        np.testing.assert_array_equal(
+            getattr(detectors, method)(rec),
+            getattr(detectors, method)(array))
+
+
+@pytest.mark.parametrize('rolling_window', [None, 30])
+def test_recording_matches_frame_in_compute_metrics(tmp_path, ppg,
+                                                    rolling_window):
+    signal = ppg['BVP'].to_numpy()
+    beats = PPG.BeatDetectors(64, preprocessed = False).erma(signal)
+    artifacts = Cardio(64).identify_artifacts(beats, 'hegarty')
+    rec = save_recording(tmp_path / 'ppg.hvr', signal, 64, beats_ix = beats,
+                         artifacts_ix = artifacts)
+
+    sqa = Cardio(64)
+    kwargs = dict(seg_size = 60, rolling_window = rolling_window,
+                  show_progress = False)
+    metrics = sqa.compute_metrics(
+        rec, rec.beats_ix, rec.artifacts_ix, **kwargs)
+    expected = sqa.compute_metrics(
+        pd.DataFrame({'BVP': signal}), beats, artifacts, **kwargs)
+    pd.testing.assert_frame_equal(metrics, expected)
+
+
+@pytest.mark.parametrize('fs', [64, 250, 300, 1000])
+def test_time_axis_from_timestamps_with_gaps(fs):
+    gaps = [(3 * fs, 2.5), (10 * fs + 7, 0.75), (10 * fs + 8, 60)]
+    timestamps = _timestamps_with_gaps(fs, 20 * fs, gaps)
+    time_axis = TimeAxis.from_timestamps(timestamps, fs)
+    np.testing.assert_array_equal(time_axis.gaps[:, 0], [g for g, _ in gaps])
+    np.testing.assert_allclose(time_axis.gaps[:, 1], [d for _, d in gaps])
+
+    # Every timestamp is recovered, also from unordered positions
+    positions = np.arange(len(timestamps))
+    assert time_axis.get_timestamps(positions).equals(timestamps)
+    shuffled = np.random.default_rng(fs).permutation(positions)
+    assert time_axis.get_timestamps(shuffled).equals(timestamps[shuffled])
+
+    # Timestamps without gaps
+    no_gaps = TimeAxis.from_timestamps(timestamps[:(3 * fs)], fs)
+    assert len(no_gaps.gaps) == 0
+    assert no_gaps.get_timestamps(positions[:(3 * fs)]).equals(
+        timestamps[:(3 * fs)])
+
+
+@pytest.mark.parametrize('rolling_window', [None, 30])
+def test_compute_metrics_time_axis_matches_ts_col(ppg, rolling_window):
+    fs = 64
+    signal = ppg['BVP'].to_numpy()
+    gaps = [(70 * fs, 4.5), (130 * fs + 11, 0.3)]
+    data = pd.DataFrame({
+        'Timestamp': _timestamps_with_gaps(fs, len(signal), gaps),
+        'BVP': signal})
+    beats = PPG.BeatDetectors(fs, preprocessed = False).erma(signal)
+    artifacts = Cardio(fs).identify_artifacts(beats, 'hegarty')
+    time_axis = TimeAxis.from_timestamps(data['Timestamp'], fs)
+
+    sqa = Cardio(fs)
+    kwargs = dict(seg_size = 60, rolling_window = rolling_window,
+                  show_progress = False)
+    expected = sqa.compute_metrics(
+        data, beats, artifacts, ts_col = 'Timestamp', **kwargs)
+    metrics = sqa.compute_metrics(
+        data, beats, artifacts, time_axis = time_axis, **kwargs)
+    assert 'Timestamp' in expected
+    pd.testing.assert_frame_equal(metrics, expected)